@@ -0,0 +1,98 @@
+"""
+Benchmark de la selección adaptativa de preguntas (Elo con índice por cubetas)
+
+1. Latencia: con un banco de 1.000.000 de preguntas, elegir y sacar la pregunta
+   más cercana a la dificultad objetivo con BucketedQuestionIndex frente a un
+   recorrido completo buscando la más cercana
+2. Calidad: estudiantes simulados con habilidad real conocida responden según el
+   modelo Elo; se mide la tasa de acierto obtenida (objetivo: TARGET_SUCCESS) y
+   la correlación entre la habilidad estimada y la real
+
+Uso:
+    python -m benchmarks.bench_adaptive_selection [preguntas]
+"""
+from time import perf_counter
+import random
+import statistics
+import sys
+from src.services.adaptive_selection import (AdaptiveSelector, BucketedQuestionIndex, TARGET_SUCCESS,
+                                             expected_success, target_difficulty)
+
+BANK_SIZE = 1_000_000
+PICKS = 10_000
+STUDENTS = 300
+SIM_BANK = 3_000
+ANSWERS_PER_STUDENT = 60
+
+
+def latency(bank_size: int):
+    rng = random.Random(1)
+    ratings = [rng.gauss(1000, 250) for _ in range(bank_size)]
+
+    start = perf_counter()
+    index = BucketedQuestionIndex(seed=1)
+    for item_id, rating in enumerate(ratings):
+        index.add(item_id, rating)
+    build = perf_counter() - start
+
+    targets = [rng.gauss(900, 300) for _ in range(PICKS)]
+    times = []
+    for target in targets:
+        start = perf_counter()
+        item_id = index.pick(target)
+        index.remove(item_id)
+        times.append(perf_counter() - start)
+    times.sort()
+
+    start = perf_counter()
+    target = targets[0]
+    min(range(bank_size), key=lambda i: abs(ratings[i] - target))
+    scan = perf_counter() - start
+
+    print(f"Banco: {bank_size:,} preguntas (índice construido en {build:.2f} s)")
+    print(f"{'Elegir y sacar una pregunta':<32} {'media':>10} {'p99':>10} {'máximo':>10}")
+    print(f"{'Índice por cubetas':<32} {statistics.mean(times) * 1e6:>7.1f} µs "
+          f"{times[int(len(times) * 0.99)] * 1e6:>7.1f} µs {times[-1] * 1e6:>7.1f} µs")
+    print(f"{'Recorrido completo':<32} {scan * 1000:>7.0f} ms")
+    assert times[int(len(times) * 0.99)] < 0.001
+
+
+def simulation():
+    rng = random.Random(2)
+    selector = AdaptiveSelector()
+    true_difficulty = [rng.gauss(1000, 250) for _ in range(SIM_BANK)]
+    questions = [{'question': f'Pregunta {i}', 'image': '', 'correct': 'A'} for i in range(SIM_BANK)]
+
+    abilities, estimates, hits, answers = [], [], 0, 0
+    for student in range(STUDENTS):
+        user_id = f'estudiante_{student}'
+        ability = rng.gauss(1000, 250)
+        selector.ensure_user(user_id)
+        index = selector.build_index(questions)
+        for _ in range(ANSWERS_PER_STUDENT):
+            position = selector.pick(index, user_id)
+            correct = rng.random() < expected_success(ability, true_difficulty[position])
+            selector.record_answer(user_id, questions[position], correct)
+            # La primera mitad de los estudiantes solo calibra las preguntas
+            if student >= STUDENTS // 2:
+                hits += correct
+                answers += 1
+        abilities.append(ability)
+        estimates.append(selector.user_rating(user_id))
+
+    half = STUDENTS // 2
+    correlation = statistics.correlation(abilities[half:], estimates[half:])
+    print(f"\nSimulación: {STUDENTS} estudiantes x {ANSWERS_PER_STUDENT} respuestas, banco de {SIM_BANK:,}")
+    print(f"Tasa de acierto: {hits / answers:.0%} (objetivo {TARGET_SUCCESS:.0%}, "
+          f"dificultad objetivo = habilidad {target_difficulty(0):+.0f})")
+    print(f"Correlación habilidad estimada / real: {correlation:.2f}")
+    assert abs(hits / answers - TARGET_SUCCESS) < 0.1 and correlation > 0.7
+
+
+def main():
+    latency(int(sys.argv[1]) if len(sys.argv) > 1 else BANK_SIZE)
+    simulation()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark del índice de recursos
+
+- Resolución: la ruta de la imagen de una pregunta. Antes se probaba con
+  Path.exists() en cada carpeta candidata (una llamada stat por intento); ahora
+  es una búsqueda en el índice, sin tocar el disco
+- Inicio: armar el índice recorriendo resources/ (lee la cabecera de cada
+  imagen) frente a cargar el manifiesto generado
+
+Uso:
+    python -m benchmarks.bench_asset_index
+"""
+from pathlib import Path
+from time import perf_counter
+import tempfile
+from src.services.asset_index import AssetIndex
+from src.utils.constants import IMAGE_PATH, RESOURCE_PATH
+
+LOOKUPS = 20_000
+FOLDERS = ('images/countries', 'images/capitals')
+
+
+def old_image_path(image_name: str) -> str:
+    """Lo que hacía ExamWindow.get_image_path"""
+    for path in (IMAGE_PATH / 'countries' / image_name, IMAGE_PATH / 'capitals' / image_name):
+        if path.exists():
+            return str(path)
+    return image_name
+
+
+def main():
+    start = perf_counter()
+    index = AssetIndex.scan(RESOURCE_PATH)
+    scan_ms = (perf_counter() - start) * 1000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = Path(tmp) / 'assets.json'
+        index.save_manifest(manifest)
+        start = perf_counter()
+        loaded = AssetIndex.load_manifest(manifest, RESOURCE_PATH)
+        manifest_ms = (perf_counter() - start) * 1000
+    assert loaded.assets() == index.assets()
+    print(f"Inicio con {len(index)} recursos: recorrido {scan_ms:.1f} ms, manifiesto {manifest_ms:.1f} ms")
+
+    names = [asset.name.rpartition('/')[2] for asset in index.assets() if asset.name.startswith('images/countries/')]
+    # Imágenes que no existen: antes eran las más caras (fallaban todos los intentos)
+    names += ['no-existe.png']
+    queries = [names[i % len(names)] for i in range(LOOKUPS)]
+
+    start = perf_counter()
+    for name in queries:
+        old_image_path(name)
+    old_us = (perf_counter() - start) * 1e6 / LOOKUPS
+
+    index.path('no-existe.png', FOLDERS)  # El aviso se imprime una sola vez
+    start = perf_counter()
+    for name in queries:
+        index.path(name, FOLDERS)
+    new_us = (perf_counter() - start) * 1e6 / LOOKUPS
+    print(f"Resolver la imagen de una pregunta: antes {old_us:.2f} µs (stat por carpeta), "
+          f"índice {new_us:.2f} µs")
+
+    for name in names[:-1]:
+        assert index.path(name, FOLDERS) == old_image_path(name)
+    assert new_us < old_us
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+"""
+Benchmark del banco de exámenes compilado
+
+Con un banco sintético (textos con acentos y opciones repetidas entre preguntas)
+compara:
+- Tamaño del archivo compilado frente al JSON
+- Abrir el banco y listar las cabeceras: json.load frente a mmap del compilado
+- Latencia de decodificar una pregunta al azar del banco compilado
+
+Además verifica que el compilado reproduce exactamente el JSON, que
+ExamCatalog prefiere el compilado cuando es más nuevo (y vuelve al JSON si el
+compilado está truncado) y que la validación rechaza preguntas sin 'correct'
+o con 'correct' fuera de las opciones.
+
+Uso:
+    python -m benchmarks.bench_exam_bank_compiled [exámenes por categoría]
+"""
+from pathlib import Path
+from time import perf_counter
+import copy
+import json
+import os
+import random
+import sys
+import tempfile
+from src.services.exam_bank_compiler import CompiledExamBank, compile_file, validate_bank
+from src.services.exam_catalog import ExamCatalog
+
+CATEGORIES = ('paises', 'capitales', 'flora', 'fauna')
+EXAMS_PER_CATEGORY = 500
+QUESTIONS_PER_EXAM = 20
+CAPITALS = ('Bogotá', 'Asunción', 'Brasilia', 'Panamá', 'Lima', 'Quito', 'Santiago', 'Montevideo')
+SAMPLES = 20_000
+
+
+def build_bank(exams_per_category: int) -> dict:
+    return {category: [{
+        'id': f'{category}_{e}',
+        'title': f'Examen {e} de {category}',
+        'difficulty': ('Fácil', 'Media', 'Difícil')[e % 3],
+        'xp': 100 + e % 50,
+        'icon': 'america-preview.png',
+        'questions': [{
+            'question': f'¿Cuál es la capital de la región número {q}?',
+            'image': f'imagen-{q}.png',
+            'options': [CAPITALS[(e + q + o) % len(CAPITALS)] for o in range(4)],
+            'correct': CAPITALS[(e + q + 1) % len(CAPITALS)],
+            'explanation': f'La respuesta correcta es {CAPITALS[(e + q + 1) % len(CAPITALS)]}.'
+        } for q in range(QUESTIONS_PER_EXAM)]
+    } for e in range(exams_per_category)] for category in CATEGORIES}
+
+
+def list_headers_json(path: Path) -> int:
+    with open(path, 'r', encoding='utf-8') as f:
+        bank = json.load(f)
+    return sum(len(exams) for exams in bank.values())
+
+
+def list_headers_compiled(path: Path) -> int:
+    bank = CompiledExamBank(path)
+    count = sum(1 for _, first, n in bank.categories() for i in range(n) if bank.exam_header(first + i))
+    bank.close()
+    return count
+
+
+def best_of(function, repeat: int = 3) -> float:
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        function()
+        times.append(perf_counter() - start)
+    return min(times)
+
+
+def main():
+    exams_per_category = int(sys.argv[1]) if len(sys.argv) > 1 else EXAMS_PER_CATEGORY
+    bank = build_bank(exams_per_category)
+    with tempfile.TemporaryDirectory() as tmp:
+        source, target = Path(tmp) / 'exams.json', Path(tmp) / 'exams.ggb'
+        with open(source, 'w', encoding='utf-8') as f:
+            json.dump(bank, f, ensure_ascii=False, indent=4)
+
+        start = perf_counter()
+        assert compile_file(source, target) == []
+        compile_time = perf_counter() - start
+
+        json_size, compiled_size = source.stat().st_size, target.stat().st_size
+        exams = len(CATEGORIES) * exams_per_category
+        print(f"Banco: {exams:,} exámenes, {exams * QUESTIONS_PER_EXAM:,} preguntas")
+        print(f"Compilación (validación incluida): {compile_time * 1000:.0f} ms")
+        print(f"Tamaño: JSON {json_size / 2 ** 20:.1f} MB, compilado {compiled_size / 2 ** 20:.1f} MB "
+              f"({compiled_size / json_size:.0%})\n")
+
+        json_time = best_of(lambda: list_headers_json(source))
+        compiled_time = best_of(lambda: list_headers_compiled(target))
+        print(f"{'Abrir y listar cabeceras':<34} {'tiempo':>10}")
+        print(f"{'json.load':<34} {json_time * 1000:>7.1f} ms")
+        print(f"{'mmap del compilado':<34} {compiled_time * 1000:>7.1f} ms")
+
+        compiled = CompiledExamBank(target)
+        indices = [random.randrange(compiled.question_count) for _ in range(SAMPLES)]
+        start = perf_counter()
+        for i in indices:
+            compiled.question(i)
+        latency = (perf_counter() - start) / SAMPLES
+        print(f"{'Decodificar una pregunta al azar':<34} {latency * 1e6:>7.1f} µs")
+
+        # El compilado reproduce el JSON examen por examen
+        for category, first, count in compiled.categories():
+            for i in range(count):
+                expected = bank[category][i]
+                assert compiled.exam(first + i) == expected, expected['id']
+        compiled.close()
+        print("\nContenido idéntico al JSON: OK")
+
+        # ExamCatalog usa el compilado (más nuevo que el JSON) sin parsear el JSON
+        catalog = ExamCatalog(source, lazy=False)
+        assert catalog.get_exam('flora_7') == {**bank['flora'][7], 'category': 'flora'}
+        assert catalog.get_summaries('fauna')[-1].question_count == QUESTIONS_PER_EXAM
+        print("ExamCatalog con el banco compilado: OK")
+
+        # Un compilado truncado (más nuevo que el JSON) no se usa: se lee el JSON
+        data = target.read_bytes()
+        target.write_bytes(data[:len(data) // 2])
+        stat = source.stat()
+        os.utime(target, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        catalog = ExamCatalog(source, lazy=False)
+        assert catalog.get_exam('flora_7') == {**bank['flora'][7], 'category': 'flora'}
+        assert len(catalog.get_summaries('fauna')) == exams_per_category
+        target.write_bytes(data)
+        print("Banco compilado truncado: se usa el JSON: OK")
+
+        # La validación detecta preguntas inválidas con su ubicación
+        broken = copy.deepcopy(bank)
+        del broken['paises'][3]['questions'][5]['correct']
+        broken['flora'][0]['questions'][1]['correct'] = 'Caracas'
+        errors = validate_bank(broken)
+        assert len(errors) == 2, errors
+        assert errors[0].startswith('paises[3].questions[5]') and errors[1].startswith('flora[0].questions[1]')
+        with open(source, 'w', encoding='utf-8') as f:
+            json.dump(broken, f, ensure_ascii=False)
+        assert compile_file(source, Path(tmp) / 'broken.ggb') == errors
+        assert not (Path(tmp) / 'broken.ggb').exists()
+        print("Validación de preguntas inválidas: OK")
+        for error in errors:
+            print(f"    {error}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark de carga diferida de un banco de exámenes grande
+
+Genera un banco sintético de ~100 MB (textos con acentos, para verificar los
+offsets en UTF-8) y compara:
+- Carga completa: json.load del archivo (lo que hacía ExamsPage antes)
+- Carga diferida: ExamCatalog(lazy=True), que lee solo las cabeceras en flujo
+- Apertura de un examen: materializar las preguntas de un examen con get_exam
+
+La memoria se mide con tracemalloc en una pasada aparte de la de tiempo.
+
+Uso:
+    python -m benchmarks.bench_exam_bank_stream [MB]
+"""
+from pathlib import Path
+from time import perf_counter
+import json
+import sys
+import tempfile
+import tracemalloc
+from src.services.exam_catalog import ExamCatalog
+
+CATEGORIES = ('paises', 'capitales', 'flora', 'fauna')
+QUESTIONS_PER_EXAM = 100
+TARGET_MB = 100
+
+
+def build_bank(path: Path, target_mb: int) -> int:
+    """Escribe el banco categoría por categoría; retorna el número de exámenes"""
+    question_bytes = 260
+    exams_per_category = max(1, target_mb * 2 ** 20 // (question_bytes * QUESTIONS_PER_EXAM * len(CATEGORIES)))
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{\n')
+        for c, category in enumerate(CATEGORIES):
+            exams = [{
+                'id': f'{category}_{e}',
+                'title': f'Examen {e} de {category} — Países y capitales de América',
+                'difficulty': ('Fácil', 'Media', 'Difícil')[e % 3],
+                'xp': 100 + e % 50,
+                'icon': 'america-preview.png',
+                'questions': [{
+                    'question': f'¿Cuál es la capital de la región número {q}?',
+                    'image': f'imagen-{q}.png',
+                    'options': ['Bogotá', 'Asunción', 'Brasilia', 'Panamá'],
+                    'correct': 'Asunción',
+                    'explanation': 'Asunción es la capital de Paraguay, a orillas del río Paraguay.'
+                } for q in range(QUESTIONS_PER_EXAM)]
+            } for e in range(exams_per_category)]
+            f.write(f'    {json.dumps(category)}: ')
+            json.dump(exams, f, ensure_ascii=False)
+            f.write(',\n' if c < len(CATEGORIES) - 1 else '\n')
+        f.write('}\n')
+    return exams_per_category * len(CATEGORIES)
+
+
+def measure(function):
+    """Tiempo (s) y memoria máxima (MB) de una función, en pasadas separadas"""
+    start = perf_counter()
+    result = function()
+    elapsed = perf_counter() - start
+    del result
+    tracemalloc.start()
+    result = function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2 ** 20, result
+
+
+def load_full(path: Path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    target_mb = int(sys.argv[1]) if len(sys.argv) > 1 else TARGET_MB
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'exams.json'
+        exams = build_bank(path, target_mb)
+        print(f"Banco: {path.stat().st_size / 2 ** 20:.1f} MB, {exams:,} exámenes, "
+              f"{exams * QUESTIONS_PER_EXAM:,} preguntas\n")
+
+        full_time, full_peak, _ = measure(lambda: load_full(path))
+
+        def load_catalog(lazy: bool):
+            catalog = ExamCatalog(path, lazy=lazy)
+            catalog.get_summaries('paises')
+            return catalog
+
+        eager_time, eager_peak, eager = measure(lambda: load_catalog(False))
+        lazy_time, lazy_peak, lazy = measure(lambda: load_catalog(True))
+
+        last_id = lazy.get_summaries('fauna')[-1].id
+        open_time, open_peak, exam = measure(lambda: lazy.get_exam(last_id))
+
+        print(f"{'':<32} {'tiempo':>10} {'memoria máx.':>14}")
+        print(f"{'json.load completo':<32} {full_time * 1000:>7.0f} ms {full_peak:>11.1f} MB")
+        print(f"{'ExamCatalog completo':<32} {eager_time * 1000:>7.0f} ms {eager_peak:>11.1f} MB")
+        print(f"{'ExamCatalog diferido (cabeceras)':<32} {lazy_time * 1000:>7.0f} ms {lazy_peak:>11.1f} MB")
+        print(f"{'Abrir un examen (diferido)':<32} {open_time * 1000:>7.1f} ms {open_peak:>11.1f} MB")
+
+        # Mismos resúmenes y mismo examen en ambos modos
+        for category in CATEGORIES:
+            assert eager.get_summaries(category) == lazy.get_summaries(category)
+        assert exam == eager.get_exam(last_id)
+        assert len(exam['questions']) == QUESTIONS_PER_EXAM
+        print("\nCabeceras y preguntas idénticas a la carga completa: OK")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark del catálogo de exámenes
+
+Compara el costo de cambiar de categoría en ExamsPage.load_exams:
+- Antes: abrir y parsear exams.json completo en cada clic para devolver una categoría
+- Ahora: ExamCatalog, que parsea una vez y devuelve resúmenes desde los índices
+
+Usa un banco sintético (4 categorías x 250 exámenes x 20 preguntas) y verifica
+que, una vez cargado, cambiar de categoría no abre el archivo y que un cambio en
+el archivo (mtime/tamaño) sí provoca un nuevo parseo.
+
+Uso:
+    python -m benchmarks.bench_exam_catalog
+"""
+from pathlib import Path
+from time import perf_counter
+from unittest import mock
+import builtins
+import json
+import os
+import tempfile
+from src.services.exam_catalog import ExamCatalog
+
+CATEGORIES = ('paises', 'capitales', 'flora', 'fauna')
+EXAMS_PER_CATEGORY = 250
+QUESTIONS_PER_EXAM = 20
+SWITCHES = 200
+
+
+def build_bank(path: Path):
+    bank = {}
+    for category in CATEGORIES:
+        bank[category] = [{
+            'id': f'{category}_{e}',
+            'title': f'Examen {e} de {category}',
+            'difficulty': ('Fácil', 'Media', 'Difícil')[e % 3],
+            'xp': 100 + e,
+            'icon': 'america-preview.png',
+            'questions': [{
+                'question': f'Pregunta {q}',
+                'image': f'imagen-{q}.png',
+                'options': [f'Opción {o}' for o in range(4)],
+                'correct': 'Opción 0',
+                'explanation': 'Explicación de la respuesta correcta'
+            } for q in range(QUESTIONS_PER_EXAM)]
+        } for e in range(EXAMS_PER_CATEGORY)]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(bank, f, ensure_ascii=False, indent=4)
+
+
+def legacy_get_exams_by_category(path: Path, category: str) -> list:
+    with open(path, 'r', encoding='utf-8') as file:
+        return json.load(file).get(category, [])
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'exams.json'
+        build_bank(path)
+        print(f"Banco: {path.stat().st_size / 2 ** 20:.1f} MB, "
+              f"{len(CATEGORIES) * EXAMS_PER_CATEGORY} exámenes\n")
+
+        start = perf_counter()
+        for i in range(SWITCHES // 10):
+            legacy_get_exams_by_category(path, CATEGORIES[i % len(CATEGORIES)])
+        legacy = (perf_counter() - start) / (SWITCHES // 10)
+
+        catalog = ExamCatalog(path)
+        start = perf_counter()
+        catalog.get_summaries('paises')
+        cold = perf_counter() - start
+
+        opened = []
+        real_open = builtins.open
+
+        def counting_open(file, *args, **kwargs):
+            opened.append(file)
+            return real_open(file, *args, **kwargs)
+
+        with mock.patch('builtins.open', counting_open):
+            start = perf_counter()
+            for i in range(SWITCHES):
+                catalog.get_summaries(CATEGORIES[i % len(CATEGORIES)])
+            warm = (perf_counter() - start) / SWITCHES
+
+        print(f"{'Cambio de categoría':<34} {'tiempo':>12}")
+        print(f"{'json.load por clic (anterior)':<34} {legacy * 1000:>9.2f} ms")
+        print(f"{'ExamCatalog, primera carga':<34} {cold * 1000:>9.2f} ms")
+        print(f"{'ExamCatalog, en memoria':<34} {warm * 1e6:>9.2f} µs")
+        print(f"\nArchivos abiertos en {SWITCHES} cambios de categoría: {len(opened)}")
+        assert not opened and catalog.load_count == 1
+
+        exam = catalog.get_exam('flora_3')
+        assert len(exam['questions']) == QUESTIONS_PER_EXAM and exam['category'] == 'flora'
+
+        # Un cambio en el archivo invalida el catálogo
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('\n')
+        os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 1_000_000))
+        catalog.invalidate()
+        catalog.get_summaries('flora')
+        assert catalog.load_count == 2
+        print("Recarga al cambiar mtime/tamaño: OK")
+
+
+if __name__ == '__main__':
+    main()
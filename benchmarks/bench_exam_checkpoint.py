@@ -0,0 +1,160 @@
+"""
+Benchmark de los checkpoints de exámenes sin terminar
+
+- Latencia de escritura de una respuesta en el checkpoint (un registro anexado
+  con una sola llamada write), con y sin fsync
+- Frente a lo que costaba guardar el estado de un examen a medias: leer y
+  reescribir el archivo de progreso completo (lo que hacía closeEvent)
+- Costo de ExamSession.answer() con checkpoint frente a sin checkpoint
+- Leer las sesiones sin terminar y continuar una
+- Listar las sesiones sin terminar (lo que hace cada cambio de categoría): leer
+  cada checkpoint completo frente a los resúmenes de la cabecera, en caché
+
+Verifica que la escritura de una respuesta quede por debajo de 1 ms (p99).
+
+Uso:
+    python -m benchmarks.bench_exam_checkpoint
+"""
+from datetime import datetime
+from pathlib import Path
+from time import perf_counter
+import statistics
+import tempfile
+from src.services.exam_checkpoint import ExamCheckpointStore
+from src.services.exam_session import ExamSession
+from src.services.level_system import ImprovedLevelSystem, JsonProgressPersistence
+from src.services.question_generator import QuestionGenerator
+
+ANSWERS = 5_000
+FSYNC_ANSWERS = 200
+REWRITES = 500
+QUESTIONS_PER_EXAM = 20
+# Exámenes terminados antes de medir (el progreso crece con la XP diaria)
+HISTORY_EXAMS = 60
+LIMIT_MS = 1.0
+# Sesiones sin terminar al listar, con exámenes grandes
+LISTED_SESSIONS = 50
+LISTED_QUESTIONS = 200
+
+
+def percentiles(times: list) -> str:
+    times = sorted(times)
+    return (f"mediana {statistics.median(times) * 1000:6.1f} µs  "
+            f"p99 {times[int(len(times) * 0.99)] * 1000:7.1f} µs  máx {times[-1] * 1000:7.1f} µs")
+
+
+def time_appends(store: ExamCheckpointStore, exam: dict, answers: int) -> list:
+    """Anexa `answers` respuestas (checkpoints de un examen cada QUESTIONS_PER_EXAM)"""
+    times = []
+    checkpoint = None
+    for n in range(answers):
+        if n % QUESTIONS_PER_EXAM == 0:
+            if checkpoint is not None:
+                checkpoint.discard()
+            checkpoint = store.create('bench', exam)
+        index = n % QUESTIONS_PER_EXAM
+        start = perf_counter()
+        checkpoint.append_answer(index, exam['questions'][index]['options'][n % 4])
+        times.append((perf_counter() - start) * 1000)
+    checkpoint.discard()
+    return times
+
+
+def main():
+    exam = QuestionGenerator(seed=3).build_exam(QUESTIONS_PER_EXAM)
+    level_system = ImprovedLevelSystem()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        store = ExamCheckpointStore(tmp / 'checkpoints')
+        appends = time_appends(store, exam, ANSWERS)
+        fsync_appends = time_appends(ExamCheckpointStore(tmp / 'checkpoints_fsync', fsync=True), exam, FSYNC_ANSWERS)
+
+        # Progreso con historial, como el de un usuario que ya hizo varios exámenes
+        persistence = JsonProgressPersistence(tmp / 'progress')
+        session = ExamSession(exam, level_system, persistence, seed=1)
+        for day in range(HISTORY_EXAMS):
+            while True:
+                session.answer(session.question['correct'])
+                if session.next() is None:
+                    break
+            session.finish(datetime(2026, 1, 1 + day % 28, 12))
+            session.reset()
+        progress_bytes = persistence.get_save_path('current_user').stat().st_size
+        rewrites = []
+        for _ in range(REWRITES):
+            start = perf_counter()
+            progress = persistence.load_progress('current_user')
+            progress['last_session'] = str(datetime.now())
+            persistence.save_progress('current_user', progress)
+            rewrites.append((perf_counter() - start) * 1000)
+
+        print(f"Guardar una respuesta ({ANSWERS:,} respuestas de {QUESTIONS_PER_EXAM} preguntas por examen):")
+        print(f"  checkpoint          {percentiles(appends)}")
+        print(f"  checkpoint + fsync  {percentiles(fsync_appends)}")
+        print(f"  reescribir progreso {percentiles(rewrites)}  ({progress_bytes:,} bytes)")
+
+        # answer() completo, con y sin checkpoint
+        timings = {}
+        for name, checkpoint_store in (('sin checkpoint', None), ('con checkpoint', store)):
+            session = ExamSession(exam, level_system, persistence, seed=2, checkpoint_store=checkpoint_store)
+            times = []
+            for n in range(ANSWERS):
+                question = session.question
+                start = perf_counter()
+                session.answer(question['correct'] if n % 3 else '')
+                times.append((perf_counter() - start) * 1000)
+                if session.next() is None:
+                    session.reset()
+            session.reset()
+            timings[name] = times
+        print("ExamSession.answer():")
+        for name, times in timings.items():
+            print(f"  {name:<19} {percentiles(times)}")
+
+        # Sesión dejada a medias: leerla y continuarla
+        session = ExamSession(exam, level_system, persistence, seed=4, checkpoint_store=store)
+        for _ in range(QUESTIONS_PER_EXAM // 2):
+            session.answer(session.question['correct'])
+            session.next()
+        session.abandon()
+        start = perf_counter()
+        saved = store.unfinished('current_user')[0]
+        resumed = ExamSession(saved.exam_data, level_system, persistence, seed=5, checkpoint_store=store)
+        resumed.restore(saved)
+        resume_ms = (perf_counter() - start) * 1000
+        print(f"Continuar una sesión de {len(saved.answers)} respuestas: {resume_ms:.2f} ms")
+        assert resumed.position == len(saved.answers) == QUESTIONS_PER_EXAM // 2
+        assert resumed.score.correct_answers == QUESTIONS_PER_EXAM // 2
+        resumed.reset()
+        assert not store.unfinished('current_user')
+
+        # Listar sesiones sin terminar
+        listing = ExamCheckpointStore(tmp / 'listing')
+        big_exam = QuestionGenerator(seed=6).build_exam(LISTED_QUESTIONS)
+        for n in range(LISTED_SESSIONS):
+            checkpoint = listing.create('bench', big_exam, datetime(2026, 1, 1, 0, 0, n))
+            for index in range(n % 10 + 1):
+                checkpoint.append_answer(index, big_exam['questions'][index]['correct'])
+            checkpoint.close()
+        start = perf_counter()
+        full = listing.unfinished('bench')
+        full_ms = (perf_counter() - start) * 1000
+        start = perf_counter()
+        summaries = listing.summaries('bench')
+        first_ms = (perf_counter() - start) * 1000
+        start = perf_counter()
+        cached = listing.summaries('bench')
+        cached_ms = (perf_counter() - start) * 1000
+        assert [(s.session_id, s.answered) for s in summaries] == [(f.session_id, len(f.answers)) for f in full]
+        assert cached == summaries
+        print(f"Listar {LISTED_SESSIONS} sesiones de {LISTED_QUESTIONS} preguntas: checkpoints completos "
+              f"{full_ms:.1f} ms, resúmenes {first_ms:.1f} ms, en caché {cached_ms:.2f} ms")
+
+    assert cached_ms < full_ms
+    assert sorted(appends)[int(len(appends) * 0.99)] < LIMIT_MS
+    assert statistics.median(appends) < statistics.median(rewrites)
+
+
+if __name__ == '__main__':
+    main()
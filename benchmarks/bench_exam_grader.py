@@ -0,0 +1,60 @@
+"""
+Benchmark de ExamGrader
+
+Genera 100k hojas de respuesta sintéticas para un examen de 20 preguntas y
+mide el rendimiento de la corrección completa (lectura CSV, corrección y
+escritura CSV) en hojas por segundo.
+
+Uso:
+    python -m benchmarks.bench_exam_grader
+"""
+from time import perf_counter
+import io
+import random
+from src.services.exam_grader import ExamGrader, read_csv_sheets, write_csv_results
+from src.services.level_system import ImprovedLevelSystem
+
+SHEETS = 100_000
+QUESTIONS = 20
+
+
+def synthetic_exam() -> dict:
+    questions = []
+    for i in range(QUESTIONS):
+        options = [f"Opción {i}-{j}" for j in range(4)]
+        questions.append({
+            'question': f"Pregunta {i}",
+            'image': '',
+            'options': options,
+            'correct': options[i % 4],
+            'explanation': ''
+        })
+    return {'id': 'bench', 'title': 'Benchmark', 'xp': 150, 'questions': questions}
+
+
+def synthetic_csv(exam: dict) -> str:
+    rng = random.Random(42)
+    lines = ['student_id,' + ','.join(f"p{i + 1}" for i in range(QUESTIONS))]
+    for student in range(SHEETS):
+        answers = [rng.choice(q['options']) for q in exam['questions']]
+        lines.append(f"alumno_{student}," + ','.join(answers))
+    return '\n'.join(lines) + '\n'
+
+
+def main():
+    exam = synthetic_exam()
+    data = synthetic_csv(exam)
+    print(f"Entrada: {SHEETS:,} hojas, {len(data) / 1e6:.1f} MB")
+
+    for difficulty in ImprovedLevelSystem.DIFFICULTIES:
+        grader = ExamGrader(exam, ImprovedLevelSystem(difficulty))
+        output = io.StringIO()
+        start = perf_counter()
+        count = write_csv_results(grader.grade(read_csv_sheets(io.StringIO(data))), output)
+        elapsed = perf_counter() - start
+        print(f"[{difficulty}] {count:,} hojas en {elapsed:.2f} s "
+              f"({count / elapsed:,.0f} hojas/s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark de ExamSession (flujo de examen sin interfaz gráfica)
+
+Simula usuarios respondiendo exámenes de QUESTIONS_PER_EXAM preguntas
+generadas con QuestionGenerator: answer() -> next() por cada pregunta y
+finish() al terminar (recompensas, niveles, XP diaria y guardado del intento)
+y reset() para el siguiente intento. No importa Qt.
+
+- Motor puro: sin repaso espaciado ni selección adaptativa; 1.000.000 de respuestas
+- Completo: con repaso espaciado y selección adaptativa en memoria (el estado
+  de repaso se guarda en disco en cada finish, como en la aplicación)
+
+Uso:
+    python -m benchmarks.bench_exam_session
+"""
+from datetime import datetime
+from time import perf_counter
+import random
+import sys
+import tempfile
+from typing import Any, Dict
+from src.services.adaptive_selection import AdaptiveSelector
+from src.services.exam_session import ExamSession
+from src.services.level_system import AbstractProgressPersistence, ImprovedLevelSystem
+from src.services.question_generator import QuestionGenerator
+from src.services.spaced_repetition import ReviewStateStore
+
+ANSWERS = 1_000_000
+FULL_ANSWERS = 50_000
+QUESTIONS_PER_EXAM = 20
+SUCCESS_RATE = 0.7
+
+
+class MemoryProgressPersistence(AbstractProgressPersistence):
+    """Progreso en memoria (para medir la sesión y no el disco)"""
+
+    def __init__(self):
+        self.progress: Dict[str, Dict[str, Any]] = {}
+        self.attempts = 0
+
+    def save_progress(self, user_id: str, progress_data: Dict[str, Any]) -> bool:
+        self.progress[user_id] = progress_data
+        return True
+
+    def load_progress(self, user_id: str) -> Dict[str, Any]:
+        return self.progress.get(user_id, {})
+
+    def record_attempt(self, user_id: str, attempt: Dict[str, Any], progress_data: Dict[str, Any]) -> bool:
+        self.attempts += 1
+        return self.save_progress(user_id, progress_data)
+
+
+def run(session: ExamSession, answers: int, seed: int = 1) -> int:
+    """Responde `answers` preguntas (al azar, con SUCCESS_RATE de aciertos); devuelve los aciertos"""
+    rng = random.Random(seed).random
+    now = datetime(2026, 1, 1)
+    correct = 0
+    for _ in range(answers):
+        question = session.question
+        result = session.answer(question['correct'] if rng() < SUCCESS_RATE else '')
+        correct += result.is_correct
+        if session.next() is None:
+            session.finish(now)
+            session.reset()
+    return correct
+
+
+def main():
+    exam = QuestionGenerator(seed=3).build_exam(QUESTIONS_PER_EXAM)
+    level_system = ImprovedLevelSystem()
+
+    persistence = MemoryProgressPersistence()
+    session = ExamSession(exam, level_system, persistence, seed=5)
+    start = perf_counter()
+    correct = run(session, ANSWERS)
+    elapsed = perf_counter() - start
+    progress = persistence.load_progress('current_user')
+    print(f"Motor puro: {ANSWERS:,} respuestas y {persistence.attempts:,} exámenes en {elapsed:.2f} s "
+          f"({ANSWERS / elapsed:,.0f} respuestas/s)")
+    print(f"  Aciertos {correct / ANSWERS:.1%}, XP total {progress['total_xp']:,}, nivel {progress['level']}")
+    assert persistence.attempts == ANSWERS // QUESTIONS_PER_EXAM
+    assert progress['exams_completed'] == persistence.attempts
+    assert abs(correct / ANSWERS - SUCCESS_RATE) < 0.01
+
+    with tempfile.TemporaryDirectory() as tmp:
+        persistence = MemoryProgressPersistence()
+        session = ExamSession(exam, level_system, persistence, review_store=ReviewStateStore(tmp),
+                              adaptive_selector=AdaptiveSelector(), seed=5)
+        start = perf_counter()
+        run(session, FULL_ANSWERS)
+        elapsed = perf_counter() - start
+    print(f"Completo: {FULL_ANSWERS:,} respuestas en {elapsed:.2f} s ({FULL_ANSWERS / elapsed:,.0f} respuestas/s)")
+
+    assert 'PyQt6' not in sys.modules
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""
+Benchmark del cambio de imagen al pasar de pregunta en ExamWindow
+
+Compara el trabajo en el hilo de la interfaz por cada cambio de pregunta:
+- Antes: QPixmap(ruta) decodifica la imagen completa y luego se escala con
+  SmoothTransformation, todo en el hilo de la interfaz
+- Ahora: ImagePrefetcher ya la decodificó escalada (QImageReader.setScaledSize)
+  en otro hilo mientras el usuario respondía; queda QPixmap.fromImage + setPixmap
+
+Se mide con las imágenes reales de resources/images/countries y con imágenes
+grandes sintéticas (fotos de 3000x2000). También se mide el caso sin precarga
+(decodificación escalada en el momento) como referencia. Presupuesto de un
+cuadro a 60 Hz: 16,7 ms.
+
+Uso:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_image_prefetch
+"""
+from pathlib import Path
+from time import perf_counter, sleep
+import statistics
+import sys
+import tempfile
+from PyQt6.QtCore import QSize, Qt
+from PyQt6.QtGui import QColor, QImage, QLinearGradient, QPainter, QPixmap
+from PyQt6.QtWidgets import QApplication, QLabel
+from src.services.image_prefetch import ImagePrefetcher, decode_scaled
+from src.utils.constants import IMAGE_PATH
+
+BOX = QSize(300, 300)
+FRAME_MS = 1000 / 60
+SYNTHETIC_COUNT = 12
+
+
+def old_switch(label: QLabel, path: str):
+    pixmap = QPixmap(path)
+    if not pixmap.isNull():
+        label.setPixmap(pixmap.scaled(BOX.width(), BOX.height(), Qt.AspectRatioMode.KeepAspectRatio,
+                                      Qt.TransformationMode.SmoothTransformation))
+
+
+def new_switch(label: QLabel, prefetcher: ImagePrefetcher, path: str):
+    image = prefetcher.take(path, BOX)
+    if not image.isNull():
+        label.setPixmap(QPixmap.fromImage(image))
+
+
+def build_synthetic(directory: Path) -> list:
+    """Imágenes grandes con degradado (PNG y JPEG) para no depender del repositorio"""
+    paths = []
+    for i in range(SYNTHETIC_COUNT):
+        image = QImage(3000, 2000, QImage.Format.Format_RGB32)
+        painter = QPainter(image)
+        gradient = QLinearGradient(0, 0, 3000, 2000)
+        gradient.setColorAt(0, QColor.fromHsv(i * 30 % 360, 200, 220))
+        gradient.setColorAt(1, QColor.fromHsv((i * 30 + 120) % 360, 180, 90))
+        painter.fillRect(image.rect(), gradient)
+        painter.end()
+        path = directory / f'foto-{i}.{"jpg" if i % 2 else "png"}'
+        image.save(str(path))
+        paths.append(str(path))
+    return paths
+
+
+def measure(paths: list, label: QLabel) -> dict:
+    old = []
+    for path in paths:
+        start = perf_counter()
+        old_switch(label, path)
+        old.append((perf_counter() - start) * 1000)
+
+    # Sin precarga: la decodificación escalada ocurre al mostrar la pregunta
+    cold = []
+    for path in paths:
+        start = perf_counter()
+        image = decode_scaled(path, BOX)
+        label.setPixmap(QPixmap.fromImage(image))
+        cold.append((perf_counter() - start) * 1000)
+
+    # Con precarga: se pide la siguiente mientras el usuario "responde" la actual
+    prefetcher = ImagePrefetcher()
+    prefetcher.prefetch(paths[0], BOX)
+    prefetcher.take(paths[0], BOX)
+    prefetched = []
+    for i, path in enumerate(paths):
+        for upcoming in paths[i + 1:i + 4]:
+            prefetcher.prefetch(upcoming, BOX)
+        start = perf_counter()
+        new_switch(label, prefetcher, path)
+        prefetched.append((perf_counter() - start) * 1000)
+        # Tiempo que el usuario pasa leyendo la pregunta
+        sleep(0.15)
+    prefetcher.shutdown()
+    return {'antes': old, 'sin precarga': cold, 'precargada': prefetched}
+
+
+def report(title: str, results: dict):
+    print(f"\n{title}")
+    for name, times in results.items():
+        times = sorted(times)
+        p95 = times[min(len(times) - 1, int(len(times) * 0.95))]
+        over = sum(t > FRAME_MS for t in times)
+        print(f"  {name:<13} media {statistics.mean(times):7.2f} ms  p95 {p95:7.2f} ms  "
+              f"máx {times[-1]:7.2f} ms  cuadros > 16,7 ms: {over}/{len(times)}")
+
+
+def main():
+    app = QApplication.instance() or QApplication(sys.argv)
+    label = QLabel()
+    label.resize(400, 400)
+
+    real = sorted(str(path) for path in (IMAGE_PATH / 'countries').glob('*.png'))[:40]
+    real_results = measure(real, label)
+    report(f"Imágenes de países ({len(real)})", real_results)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        synthetic = build_synthetic(Path(tmp))
+        synthetic_results = measure(synthetic, label)
+        report(f"Imágenes grandes de 3000x2000 ({len(synthetic)})", synthetic_results)
+
+    for results in (real_results, synthetic_results):
+        assert statistics.median(results['precargada']) < statistics.median(results['antes'])
+        assert statistics.median(results['precargada']) < FRAME_MS
+    app.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Benchmark de get_level_progress_batch
+
+Calcula el progreso de nivel de 100k estudiantes sintéticos por dificultad,
+verifica que coincida con get_level_progress y compara el tiempo de la
+versión vectorizada contra el bucle en Python.
+
+Uso:
+    python -m benchmarks.bench_level_batch
+"""
+from time import perf_counter
+import numpy as np
+from src.services.level_system import ImprovedLevelSystem
+
+STUDENTS = 100_000
+
+
+def main():
+    rng = np.random.default_rng(42)
+
+    for difficulty in ImprovedLevelSystem.DIFFICULTIES:
+        system = ImprovedLevelSystem(difficulty)
+        thresholds, _ = system.difficulty.level_curve.arrays
+
+        # XP repartida entre los primeros niveles, donde están los estudiantes reales
+        total_xp = rng.integers(0, thresholds[min(40, system.max_level - 1)], size=STUDENTS)
+
+        start = perf_counter()
+        batch = system.get_level_progress_batch(total_xp)
+        batch_time = perf_counter() - start
+
+        start = perf_counter()
+        scalar = [system.get_level_progress(int(xp)) for xp in total_xp]
+        scalar_time = perf_counter() - start
+
+        assert all(batch[i] == progress for i, progress in enumerate(scalar))
+
+        # Extremos: umbrales exactos y la XP int64 máxima (umbrales saturados en int64)
+        limit = int(np.iinfo(np.int64).max)
+        edges = [limit, limit - 1] + [min(value, limit) for value in system.difficulty.level_curve.thresholds]
+        edge_batch = system.get_level_progress_batch(edges)
+        assert all(edge_batch[i] == system.get_level_progress(xp) for i, xp in enumerate(edges))
+
+        print(f"[{difficulty}] {STUDENTS:,} estudiantes: "
+              f"vectorizado {batch_time * 1e3:.1f} ms | "
+              f"escalar {scalar_time * 1e3:.1f} ms | "
+              f"x{scalar_time / batch_time:.0f}")
+
+
+if __name__ == '__main__':
+    main()
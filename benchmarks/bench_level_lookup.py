@@ -0,0 +1,54 @@
+"""
+Benchmark de get_level_progress
+
+Mide el costo de buscar el nivel para una XP total ubicada en distintos
+niveles (desde el 1 hasta max_level) en las tres dificultades, comparando
+el recorrido nivel a nivel original con la tabla de umbrales precalculada.
+
+Uso:
+    python -m benchmarks.bench_level_lookup
+"""
+from timeit import timeit
+from src.services.level_system import ImprovedLevelSystem, LevelProgress
+
+REPEAT = 2000
+
+
+def legacy_level_progress(system: ImprovedLevelSystem, total_xp: int) -> LevelProgress:
+    """Recorrido original nivel a nivel (referencia)"""
+    current_level = 1
+    accumulated_xp = 0
+    xp_for_next = system.calculate_xp_for_level(2)
+    while accumulated_xp + xp_for_next <= total_xp and current_level < system.max_level:
+        accumulated_xp += xp_for_next
+        current_level += 1
+        xp_for_next = system.calculate_xp_for_level(current_level + 1)
+    xp_in_current_level = total_xp - accumulated_xp
+    return LevelProgress(
+        level=current_level,
+        current_xp=xp_in_current_level,
+        xp_for_next=xp_for_next,
+        total_xp=total_xp,
+        progress_percentage=(xp_in_current_level / xp_for_next * 100) if xp_for_next > 0 else 100
+    )
+
+
+def main():
+    for difficulty in ImprovedLevelSystem.DIFFICULTIES:
+        system = ImprovedLevelSystem(difficulty)
+        thresholds = system.difficulty.level_curve.thresholds
+        print(f"\n[{difficulty}] max_level={system.max_level}")
+        print(f"{'nivel':>6} {'original (µs)':>14} {'tabla (µs)':>12}")
+
+        levels = sorted({1, 2, 5, 10, 25, 50, system.max_level // 2, system.max_level})
+        for level in levels:
+            total_xp = thresholds[level - 1]
+            assert system.get_level_progress(total_xp) == legacy_level_progress(system, total_xp)
+
+            legacy = timeit(lambda: legacy_level_progress(system, total_xp), number=REPEAT) / REPEAT
+            table = timeit(lambda: system.get_level_progress(total_xp), number=REPEAT) / REPEAT
+            print(f"{level:>6} {legacy * 1e6:>14.2f} {table * 1e6:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,30 @@
+"""
+Benchmark de LevelCurveSimulator
+
+Mide el tiempo de simular 50k estudiantes durante un año en las tres
+dificultades, con un proceso y con todos los núcleos disponibles.
+
+Uso:
+    python -m benchmarks.bench_level_simulator
+"""
+from time import perf_counter
+import os
+from src.services.level_simulator import LevelCurveSimulator, SimulationConfig
+
+STUDENTS = 50_000
+DAYS = 365
+
+
+def main():
+    cores = os.cpu_count() or 1
+    for workers in sorted({1, cores}):
+        config = SimulationConfig(students=STUDENTS, days=DAYS, workers=workers)
+        start = perf_counter()
+        LevelCurveSimulator(config).run()
+        elapsed = perf_counter() - start
+        print(f"{STUDENTS:,} estudiantes x {DAYS} días x 3 dificultades, "
+              f"{workers} proceso(s): {elapsed:.1f} s")
+
+
+if __name__ == '__main__':
+    main()
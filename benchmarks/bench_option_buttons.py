@@ -0,0 +1,153 @@
+"""
+Benchmark de los botones de opciones de ExamWindow al pasar de pregunta
+
+Compara el costo por pregunta (mostrar opciones, responder y pintar el
+feedback, incluido el procesamiento de eventos: borrado diferido, layout y
+pintado):
+- Antes: se borraban los botones con deleteLater() y se creaban nuevos, cada
+  uno con su hoja de estilos en línea; el feedback asignaba otras dos hojas
+- Ahora: botones reutilizados; el estilo se asigna una sola vez al contenedor
+  y el feedback solo cambia la propiedad dinámica 'feedback'
+
+Verifica además que pasar de pregunta no crea widgets.
+
+Uso:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_option_buttons
+"""
+from pathlib import Path
+from time import perf_counter
+import statistics
+import sys
+import tempfile
+from PyQt6.QtCore import QCoreApplication, QEvent
+from PyQt6.QtWidgets import QApplication, QPushButton, QVBoxLayout, QWidget
+from src.services.adaptive_selection import AdaptiveSelector
+from src.services.exam_checkpoint import ExamCheckpointStore
+from src.services.level_system import JsonProgressPersistence
+from src.services.question_generator import QuestionGenerator
+from src.services.spaced_repetition import ReviewStateStore
+from src.ui.exam_window import ExamWindow
+
+QUESTIONS = 300
+
+OLD_BUTTON_STYLE = """
+                                QPushButton {
+                                    background-color: white;
+                                    border: 2px solid #3498db;
+                                    color: #3498db;
+                                    border-radius: 25px;
+                                    padding: 15px;
+                                    font-size: 16px;
+                                    font-weight: bold;
+                                    margin: 5px;
+                                }
+                                QPushButton:hover {
+                                    background-color: #3498db;
+                                    color: white;
+                                }
+                                QPushButton:disabled {
+                                    background-color: white;
+                                    border: 2px solid #bdc3c7;
+                                    color: #bdc3c7;
+                                }
+                            """
+OLD_FEEDBACK_STYLE = """
+                    QPushButton {{
+                        background-color: {0};
+                        color: white;
+                        border: 2px solid {0};
+                        border-radius: 25px;
+                        padding: 15px;
+                        font-size: 16px;
+                        font-weight: bold;
+                        margin: 5px;
+                    }}
+                """
+
+
+def old_question(layout: QVBoxLayout, question: dict, is_correct: bool):
+    """Lo que hacían show_question y show_feedback con los botones"""
+    while layout.count():
+        child = layout.takeAt(0)
+        if child.widget():
+            child.widget().deleteLater()
+    for option in question['options']:
+        button = QPushButton(option)
+        button.setMinimumHeight(50)
+        button.setMinimumWidth(15)
+        button.clicked.connect(lambda checked, opt=option: None)
+        button.setStyleSheet(OLD_BUTTON_STYLE)
+        layout.addWidget(button)
+    QApplication.processEvents()
+    for i in range(layout.count()):
+        layout.itemAt(i).widget().setEnabled(False)
+    for i in range(layout.count()):
+        button = layout.itemAt(i).widget()
+        if button.text() == question['correct']:
+            button.setStyleSheet(OLD_FEEDBACK_STYLE.format('#2ecc71'))
+        elif not is_correct:
+            button.setStyleSheet(OLD_FEEDBACK_STYLE.format('#e74c3c'))
+    QApplication.processEvents()
+    QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+
+
+def new_question(window: ExamWindow, question: dict, is_correct: bool):
+    """Lo mismo con los botones reutilizados de ExamWindow"""
+    window._show_options(question['options'])
+    QApplication.processEvents()
+    for button in window.option_buttons:
+        button.setEnabled(False)
+    window._mark_options(question['correct'], is_correct)
+    QApplication.processEvents()
+    QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+
+
+def report(name: str, times: list):
+    times = sorted(times)
+    print(f"  {name:<8} mediana {statistics.median(times):6.2f} ms  "
+          f"p95 {times[int(len(times) * 0.95)]:6.2f} ms  media {statistics.mean(times):6.2f} ms")
+
+
+def main():
+    app = QApplication.instance() or QApplication(sys.argv)
+    questions = list(QuestionGenerator(seed=7).questions(QUESTIONS))
+
+    host = QWidget()
+    host.resize(600, 500)
+    layout = QVBoxLayout(host)
+    host.show()
+    old = []
+    for i, question in enumerate(questions):
+        start = perf_counter()
+        old_question(layout, question, i % 3 != 0)
+        old.append((perf_counter() - start) * 1000)
+    host.close()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        window = ExamWindow({'id': 'bench', 'title': 'Benchmark', 'difficulty': 'Media', 'xp': 100,
+                             'questions': questions[:1]},
+                            progress_persistence=JsonProgressPersistence(Path(tmp)),
+                            review_store=ReviewStateStore(tmp), adaptive_selector=AdaptiveSelector(),
+                            checkpoint_store=ExamCheckpointStore(tmp))
+        window.show()
+        QApplication.processEvents()
+        widgets_before = len(window.findChildren(QWidget))
+        new = []
+        for i, question in enumerate(questions):
+            start = perf_counter()
+            new_question(window, question, i % 3 != 0)
+            new.append((perf_counter() - start) * 1000)
+        widgets_after = len(window.findChildren(QWidget))
+        window.close()
+
+    print(f"Costo por pregunta ({QUESTIONS} preguntas, 4 opciones):")
+    report('antes', old)
+    report('ahora', new)
+    print(f"Widgets de la ventana antes y después: {widgets_before} -> {widgets_after}")
+    assert widgets_after == widgets_before
+    assert statistics.median(new) < statistics.median(old)
+    app.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark de la caché de pixmaps compartida
+
+Mide tres situaciones de la interfaz:
+- Reconstrucción: los íconos de exámenes y categorías se vuelven a crear cada
+  vez que se cambia de categoría. Antes: QPixmap(ruta) + scaled() por ícono;
+  ahora: PixmapCache (solo la primera vez se lee del disco). QPixmap(ruta) ya
+  guarda el archivo decodificado en QPixmapCache; lo que se repetía es el escalado
+- Cambio de tamaño: al arrastrar el borde de la ventana llegan decenas de
+  resizeEvent. Antes se reescalaba el pixmap ya reducido en cada evento; ahora
+  se espera RESIZE_DEBOUNCE_MS y se escala una vez desde el archivo
+- Calidad: tras achicar y volver a agrandar la ventana, diferencia media por
+  canal contra la imagen escalada directamente desde el archivo
+
+Uso:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_pixmap_cache
+"""
+from time import perf_counter
+import statistics
+import sys
+import numpy as np
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QImage, QPixmap
+from PyQt6.QtWidgets import QApplication
+from src.services.pixmap_cache import RESIZE_DEBOUNCE_MS, PixmapCache
+from src.utils.constants import ICON_PATH, IMAGE_PATH
+
+REBUILDS = 20
+# Anchos de ventana durante un arrastre de 600 a 360 px y de vuelta
+RESIZE_WIDTHS = list(range(600, 359, -8)) + list(range(360, 601, 8))
+
+
+def old_icon(path: str, size: int) -> QPixmap:
+    pixmap = QPixmap(path)
+    if not pixmap.isNull():
+        pixmap = pixmap.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio)
+    return pixmap
+
+
+def to_array(pixmap: QPixmap) -> np.ndarray:
+    image = pixmap.toImage().convertToFormat(QImage.Format.Format_RGB32)
+    data = image.constBits().asarray(image.sizeInBytes())
+    return np.frombuffer(data, dtype=np.uint8).reshape(image.height(), image.bytesPerLine())[:, :image.width() * 4]
+
+
+def rebuild_times(build) -> list:
+    times = []
+    for _ in range(REBUILDS):
+        start = perf_counter()
+        build()
+        times.append((perf_counter() - start) * 1000)
+    return times
+
+
+def bench_rebuilds(icons: list):
+    # La caché va primero: no usa QPixmap(ruta), así que no calienta la de Qt
+    cache = PixmapCache()
+    new = rebuild_times(lambda: [cache.pixmap(path, 100, 100) for path in icons])
+    old = rebuild_times(lambda: [old_icon(path, 100) for path in icons])
+    print(f"Reconstrucción de {len(icons)} íconos (primera / siguientes, media):")
+    print(f"  antes      {old[0]:6.2f} ms / {statistics.mean(old[1:]):6.3f} ms")
+    print(f"  con caché  {new[0]:6.2f} ms / {statistics.mean(new[1:]):6.3f} ms "
+          f"(aciertos {cache.hits}, fallos {cache.misses}, {cache.bytes_used / 1024:.0f} KB)")
+    assert cache.misses == len(icons)
+    assert statistics.mean(new[1:]) < statistics.mean(old[1:])
+
+
+def bench_resize(path: str):
+    # Antes: cada evento reescala el pixmap que se está mostrando
+    start = perf_counter()
+    pixmap = QPixmap(path).scaled(300, 300, Qt.AspectRatioMode.KeepAspectRatio,
+                                  Qt.TransformationMode.SmoothTransformation)
+    for width in RESIZE_WIDTHS:
+        side = int(min(width * 0.6, 300))
+        pixmap = pixmap.scaled(side, side, Qt.AspectRatioMode.KeepAspectRatio,
+                               Qt.TransformationMode.SmoothTransformation)
+    old_ms = (perf_counter() - start) * 1000
+
+    # Ahora: los eventos solo reinician el temporizador; al final se escala una vez
+    cache = PixmapCache()
+    start = perf_counter()
+    cache.pixmap(path, 300, 300)
+    side = int(min(RESIZE_WIDTHS[-1] * 0.6, 300))
+    fresh = cache.pixmap(path, side, side)
+    new_ms = (perf_counter() - start) * 1000
+    print(f"Arrastre con {len(RESIZE_WIDTHS)} resizeEvent: antes {old_ms:.1f} ms en el hilo de la interfaz, "
+          f"ahora {new_ms:.1f} ms tras {RESIZE_DEBOUNCE_MS} ms sin eventos")
+
+    old, new = to_array(pixmap).astype(int), to_array(fresh).astype(int)
+    height, width = min(old.shape[0], new.shape[0]), min(old.shape[1], new.shape[1])
+    error = np.abs(old[:height, :width] - new[:height, :width]).mean()
+    print(f"Diferencia media por canal tras el arrastre (antes vs desde el archivo): {error:.1f} / 255")
+    assert new_ms < old_ms
+    assert error > 1.0
+
+
+def main():
+    app = QApplication.instance() or QApplication(sys.argv)
+    icons = sorted(str(path) for path in ICON_PATH.glob('*-preview.png'))
+    # Calienta ambos caminos con una imagen que no se mide (la primera decodificación
+    # escalada del proceso cuesta el doble) y sin pasar por QPixmapCache
+    warmup = str(IMAGE_PATH / 'countries' / 'francia.png')
+    PixmapCache().pixmap(warmup, 100, 100)
+    QPixmap.fromImage(QImage(warmup)).scaled(100, 100, Qt.AspectRatioMode.KeepAspectRatio)
+    bench_rebuilds(icons)
+    bench_resize(str(IMAGE_PATH / 'countries' / 'suiza.png'))
+    app.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark de persistencias de progreso: JSON vs SQLite
+
+Mide la latencia media de save_progress y load_progress con 1, 100 y 10k
+usuarios guardados. Cada usuario tiene un documento realista con 60 días de
+XP diaria.
+
+Uso:
+    python -m benchmarks.bench_progress_backends
+"""
+from datetime import date, timedelta
+from pathlib import Path
+from time import perf_counter
+import json
+import random
+import tempfile
+from src.services.level_system import JsonProgressPersistence
+from src.services.sqlite_progress import SqliteProgressPersistence
+
+USER_COUNTS = (1, 100, 10_000)
+OPERATIONS = 200
+
+
+def sample_progress(rng: random.Random) -> dict:
+    progress = {
+        'difficulty': rng.choice(['easy', 'normal', 'hard']),
+        'total_xp': rng.randrange(50_000),
+        'level': rng.randrange(1, 30),
+        'exams_completed': rng.randrange(300),
+        'average_accuracy': rng.random() * 100,
+        'last_accuracy': rng.random() * 100,
+        'last_exam_score': 2,
+        'last_exam_total': 2,
+        'last_exam_xp': 120,
+        'last_exam_date': '2024-11-20 10:00:00.000000',
+    }
+    start = date(2024, 9, 1)
+    for day in range(60):
+        progress[f'daily_xp_{start + timedelta(days=day)}'] = rng.randrange(500)
+    return progress
+
+
+def measure(persistence, users: int, rng: random.Random):
+    user_ids = [f'alumno_{rng.randrange(users)}' for _ in range(OPERATIONS)]
+    documents = [sample_progress(rng) for _ in range(OPERATIONS)]
+
+    start = perf_counter()
+    for user_id, document in zip(user_ids, documents):
+        persistence.save_progress(user_id, document)
+    save = (perf_counter() - start) / OPERATIONS
+
+    start = perf_counter()
+    for user_id in user_ids:
+        persistence.load_progress(user_id)
+    load = (perf_counter() - start) / OPERATIONS
+    return save, load
+
+
+def main():
+    rng = random.Random(42)
+    print(f"{'usuarios':>9} {'backend':>8} {'save (ms)':>10} {'load (ms)':>10}")
+    for users in USER_COUNTS:
+        with tempfile.TemporaryDirectory() as tmp:
+            json_dir = Path(tmp) / 'json'
+            json_backend = JsonProgressPersistence(json_dir)
+            sqlite_backend = SqliteProgressPersistence(Path(tmp) / 'progress.db')
+
+            # Poblar ambos backends con los usuarios iniciales
+            for i in range(users):
+                document = sample_progress(rng)
+                with open(json_backend.get_save_path(f'alumno_{i}'), 'w') as f:
+                    json.dump(document, f, indent=4)
+                sqlite_backend.save_progress(f'alumno_{i}', document)
+
+            for name, backend in (('json', json_backend), ('sqlite', sqlite_backend)):
+                save, load = measure(backend, users, rng)
+                print(f"{users:>9,} {name:>8} {save * 1e3:>10.3f} {load * 1e3:>10.3f}")
+            sqlite_backend.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark de formatos de progreso
+
+Compara el JSON con indentación actual contra el formato binario de
+progress_codec (sin compresión, zlib y zstd si está instalado) en tiempo de
+codificación/decodificación y bytes en disco, para un historial pequeño y
+uno grande.
+
+Uso:
+    python -m benchmarks.bench_progress_format
+"""
+from datetime import date, timedelta
+from timeit import timeit
+import io
+import json
+from src.services import progress_codec
+from src.services.daily_xp import DailyXpSeries
+from src.services.progress_codec import decode_progress, encode_progress
+
+
+def sample_progress(days: int, legacy_keys: int) -> dict:
+    progress = {
+        'total_xp': 48_250, 'level': 17, 'difficulty': 'normal', 'exams_completed': 312,
+        'average_accuracy': 81.734, 'last_accuracy': 100.0, 'last_exam_score': 2,
+        'last_exam_total': 2, 'last_exam_xp': 180, 'last_exam_date': '2024-11-20 10:00:00.000000',
+        'last_session': '2024-11-20 10:05:00.000000',
+    }
+    series = DailyXpSeries()
+    start = date(2024, 1, 1)
+    for day in range(days):
+        series.add(start + timedelta(days=day), (day * 37) % 400)
+    progress['daily_xp'] = series.to_dict()
+    # Documentos antiguos que aún no migran sus claves daily_xp_YYYY-MM-DD
+    for day in range(legacy_keys):
+        progress[f'daily_xp_{start - timedelta(days=day + 1)}'] = (day * 11) % 300
+    return progress
+
+
+def json_encode(progress: dict) -> bytes:
+    buffer = io.StringIO()
+    json.dump(progress, buffer, indent=4)
+    return buffer.getvalue().encode('utf-8')
+
+
+def main():
+    compressions = [None, 'zlib'] + (['zstd'] if progress_codec.zstandard else [])
+    cases = {
+        'pequeño (7 días)': sample_progress(7, 0),
+        'grande (serie de 400 días)': sample_progress(400, 0),
+        'grande (400 días + 2000 claves antiguas)': sample_progress(400, 2000),
+    }
+    for name, progress in cases.items():
+        print(f"\nHistorial {name}")
+        print(f"{'formato':>14} {'bytes':>9} {'encode (µs)':>12} {'decode (µs)':>12}")
+        number = 200
+
+        raw = json_encode(progress)
+        encode = timeit(lambda: json_encode(progress), number=number) / number
+        decode = timeit(lambda: decode_progress(raw), number=number) / number
+        print(f"{'json indent=4':>14} {len(raw):>9,} {encode * 1e6:>12.1f} {decode * 1e6:>12.1f}")
+
+        for compression in compressions:
+            raw = encode_progress(progress, compression)
+            assert decode_progress(raw) == progress
+            encode = timeit(lambda: encode_progress(progress, compression), number=number) / number
+            decode = timeit(lambda: decode_progress(raw), number=number) / number
+            label = f"binario+{compression}" if compression else 'binario'
+            print(f"{label:>14} {len(raw):>9,} {encode * 1e6:>12.1f} {decode * 1e6:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
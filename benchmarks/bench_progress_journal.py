@@ -0,0 +1,61 @@
+"""
+Benchmark de JournaledProgressPersistence
+
+Registra 100k intentos de examen y mide la latencia media del guardado a
+medida que crece el historial, comparada con reescribir el JSON completo.
+La consistencia ante cortes se prueba en tests/test_progress_journal.py.
+
+Uso:
+    python -m benchmarks.bench_progress_journal
+"""
+from pathlib import Path
+from time import perf_counter
+import tempfile
+from src.services.level_system import JsonProgressPersistence
+from src.services.progress_journal import JournaledProgressPersistence
+
+ATTEMPTS = 100_000
+CHECKPOINTS = (1_000, 10_000, 100_000)
+WINDOW = 500
+
+
+def attempt_for(i: int) -> dict:
+    return {'exam_id': 'paises_america', 'title': 'Países de América', 'date': f'2024-01-01 {i}',
+            'correct_answers': i % 3, 'total_questions': 2, 'xp_earned': 120, 'difficulty': 'normal'}
+
+
+def progress_for(i: int) -> dict:
+    return {'difficulty': 'normal', 'total_xp': i * 120, 'level': 1 + i // 100,
+            'exams_completed': i, 'last_exam_date': f'2024-01-01 {i}'}
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        # Sin fsync para que el llenado de 100k intentos sea rápido; el costo de fsync es constante
+        journal = JournaledProgressPersistence(Path(tmp) / 'journal', fsync=False)
+        full_json = JsonProgressPersistence(Path(tmp) / 'json')
+        history = []
+
+        print(f"{'intentos':>9} {'bitácora (µs)':>14} {'JSON + historial (µs)':>22}")
+        start = perf_counter()
+        for i in range(1, ATTEMPTS + 1):
+            if i % WINDOW == 1:
+                start = perf_counter()
+            journal.record_attempt('alumno', attempt_for(i), progress_for(i))
+            history.append(attempt_for(i))
+            if i in CHECKPOINTS:
+                journal_time = (perf_counter() - start) / WINDOW
+                # Referencia: guardar el historial completo dentro del documento JSON
+                start_json = perf_counter()
+                full_json.save_progress('alumno', {**progress_for(i), 'attempts': history})
+                json_time = perf_counter() - start_json
+                print(f"{i:>9,} {journal_time * 1e6:>14.1f} {json_time * 1e6:>22.1f}")
+
+        start = perf_counter()
+        reopened = JournaledProgressPersistence(Path(tmp) / 'journal')
+        assert reopened.load_progress('alumno') == progress_for(ATTEMPTS)
+        print(f"Inicio con snapshot + cola: {(perf_counter() - start) * 1e3:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
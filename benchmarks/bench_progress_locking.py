@@ -0,0 +1,107 @@
+"""
+Prueba de estrés de guardados concurrentes entre procesos
+
+Varios procesos simulan ventanas de GeoGrapy abiertas a la vez sobre el mismo
+usuario: cada uno carga el progreso, rinde exámenes (suma XP, exámenes y XP
+diaria) y guarda. Algunos recargan antes de cada examen y otros conservan su
+copia en memoria (como la capa write-behind).
+
+Sin bloqueo se pierden actualizaciones; con bloqueo y fusión los contadores
+finales deben ser exactos. Se informa el tiempo de espera del bloqueo.
+
+Uso:
+    python -m benchmarks.bench_progress_locking
+"""
+from datetime import date
+from multiprocessing import Pool
+from pathlib import Path
+from time import perf_counter, sleep
+import random
+import tempfile
+from src.services.daily_xp import DailyXpSeries, PROGRESS_KEY as DAILY_XP_KEY
+from src.services.level_system import ImprovedLevelSystem, JsonProgressPersistence
+
+PROCESSES = 6
+EXAMS_PER_PROCESS = 100
+XP_PER_EXAM = 120
+USER = 'current_user'
+
+
+def run_worker(args) -> dict:
+    save_dir, worker, locking, file_format = args
+    persistence = JsonProgressPersistence(Path(save_dir), file_format=file_format, locking=locking)
+    rng = random.Random(worker)
+    keep_copy = worker % 2 == 1
+    progress = persistence.load_progress(USER)
+
+    start = perf_counter()
+    for _ in range(EXAMS_PER_PROCESS):
+        if not keep_copy:
+            progress = persistence.load_progress(USER)
+        # Tiempo "rindiendo el examen" entre la carga y el guardado
+        sleep(rng.uniform(0, 0.002))
+        exams = progress.get('exams_completed', 0) + 1
+        progress['total_xp'] = progress.get('total_xp', 0) + XP_PER_EXAM
+        progress['exams_completed'] = exams
+        average = progress.get('average_accuracy', 0.0)
+        progress['average_accuracy'] = average + (50.0 + worker - average) / exams
+        progress['last_exam_date'] = f'worker {worker}'
+        series = DailyXpSeries.from_progress(progress)
+        series.add(date(2024, 1, 1 + worker), XP_PER_EXAM)
+        progress[DAILY_XP_KEY] = series.to_dict()
+        persistence.save_progress(USER, progress)
+
+    stats = persistence.get_lock_stats()
+    stats['elapsed'] = perf_counter() - start
+    return stats
+
+
+def run(locking: bool, file_format: str = 'json'):
+    with tempfile.TemporaryDirectory() as tmp:
+        JsonProgressPersistence(Path(tmp), file_format=file_format).save_progress(
+            USER, {'difficulty': 'normal', 'total_xp': 0, 'level': 1, 'exams_completed': 0})
+
+        with Pool(PROCESSES) as pool:
+            results = pool.map(run_worker, [(tmp, worker, locking, file_format) for worker in range(PROCESSES)])
+        final = JsonProgressPersistence(Path(tmp), file_format=file_format).load_progress(USER)
+
+    expected_exams = PROCESSES * EXAMS_PER_PROCESS
+    series = DailyXpSeries.from_progress(final)
+    daily_total = sum(xp for _, xp in series.days())
+    accuracies = [50.0 + worker for worker in range(PROCESSES)]
+
+    label = f"{'con bloqueo' if locking else 'sin bloqueo'} ({file_format})"
+    print(f"\n{label}")
+    print(f"  total_xp:        {final.get('total_xp', 0):>7,} / {expected_exams * XP_PER_EXAM:,}")
+    print(f"  exams_completed: {final.get('exams_completed', 0):>7,} / {expected_exams:,}")
+    print(f"  XP diaria:       {daily_total:>7,} / {expected_exams * XP_PER_EXAM:,}")
+    print(f"  average_accuracy: {final.get('average_accuracy', 0):.2f} "
+          f"(esperado {sum(accuracies) / len(accuracies):.2f})")
+    if locking:
+        acquisitions = sum(r['acquisitions'] for r in results)
+        wait_total = sum(r['wait_total'] for r in results)
+        wait_max = max(r['wait_max'] for r in results)
+        merges = sum(r['merges'] for r in results)
+        elapsed = max(r['elapsed'] for r in results)
+        print(f"  bloqueos: {acquisitions:,}, espera media {wait_total / acquisitions * 1000:.2f} ms, "
+              f"máxima {wait_max * 1000:.2f} ms, total {wait_total:.2f} s de {elapsed:.2f} s")
+        print(f"  fusiones: {merges:,}")
+        assert final['total_xp'] == expected_exams * XP_PER_EXAM
+        assert final['exams_completed'] == expected_exams
+        assert final['level'] == ImprovedLevelSystem('normal').get_level_progress(final['total_xp']).level
+        assert daily_total == expected_exams * XP_PER_EXAM
+        assert abs(final['average_accuracy'] - sum(accuracies) / len(accuracies)) < 1e-6
+        assert all(series.get(date(2024, 1, 1 + worker)) == EXAMS_PER_PROCESS * XP_PER_EXAM
+                   for worker in range(PROCESSES))
+        print("  Contadores exactos: OK")
+
+
+def main():
+    print(f"{PROCESSES} procesos x {EXAMS_PER_PROCESS} exámenes sobre el mismo usuario")
+    run(locking=False)
+    run(locking=True)
+    run(locking=True, file_format='binary')
+
+
+if __name__ == '__main__':
+    main()
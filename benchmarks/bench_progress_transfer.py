@@ -0,0 +1,120 @@
+"""
+Benchmark de importación/exportación masiva del progreso
+
+Crea 50k usuarios con archivos de progreso JSON, los exporta a un único JSONL,
+valida el archivo (--dry-run) y lo importa en un directorio vacío, comparando
+el resultado. También lo importa y exporta con la persistencia de bitácora, que
+no debe quedarse con los usuarios en memoria. Objetivo: menos de un minuto por operación.
+
+La importación usa la misma configuración que el comando: sin fsync por archivo
+y un os.sync() al final (incluido en el tiempo). La memoria se informa como el
+RSS máximo del proceso, que no debe crecer con el número de usuarios.
+
+Uso:
+    python -m benchmarks.bench_progress_transfer [usuarios]
+"""
+from pathlib import Path
+from time import perf_counter
+import json
+import os
+import sys
+import tempfile
+from src.services.daily_xp import DailyXpSeries
+from src.services.level_system import JsonProgressPersistence
+from src.services.progress_journal import JournaledProgressPersistence
+from src.services.progress_transfer import export_progress, import_progress, read_jsonl_records
+
+USERS = 50_000
+WORKERS = 8
+
+
+def progress_for(i: int) -> dict:
+    series = DailyXpSeries()
+    for day in range(i % 30):
+        series.add(f'2024-03-{day + 1:02d}', 50 + day)
+    return {'difficulty': 'normal', 'total_xp': i * 37, 'level': 1 + i % 40, 'exams_completed': i % 500,
+            'average_accuracy': float(i % 100), 'last_exam_date': '2024-03-30 10:00:00',
+            'daily_xp': series.to_dict()}
+
+
+def create_users(save_dir: Path, users: int):
+    """Archivos de progreso de prueba (sin fsync: solo preparación)"""
+    for i in range(users):
+        with open(save_dir / f'progress_alumno{i:06d}.json', 'w') as f:
+            json.dump({**progress_for(i), '_version': 1}, f, indent=4)
+
+
+def max_rss_mb() -> float:
+    """RSS máximo del proceso en MB (0 si la plataforma no lo informa)"""
+    try:
+        import resource
+    except ImportError:
+        return 0.0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def timed(label: str, users: int, function):
+    start = perf_counter()
+    report = function()
+    elapsed = perf_counter() - start
+    print(f"{label:<22} {elapsed:>7.2f} s  {users / elapsed:>9,.0f} usuarios/s  "
+          f"RSS máx. {max_rss_mb():>5.1f} MB  ({report.written} escritos, {report.invalid} inválidos)")
+    return report
+
+
+def main():
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else USERS
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        source_dir, target_dir = tmp / 'origen', tmp / 'destino'
+        source_dir.mkdir()
+        archive = tmp / 'curso.jsonl'
+
+        start = perf_counter()
+        create_users(source_dir, users)
+        print(f"{users:,} usuarios creados en {perf_counter() - start:.1f} s "
+              f"(RSS máx. {max_rss_mb():.1f} MB)\n")
+
+        source = JsonProgressPersistence(source_dir)
+        with open(archive, 'w', encoding='utf-8') as stream:
+            export = timed("Exportar (JSONL)", users,
+                           lambda: export_progress(source, source.list_users(), stream, workers=WORKERS))
+        print(f"{'':<22} archivo: {archive.stat().st_size / 2 ** 20:.1f} MB")
+
+        with open(archive, 'r', encoding='utf-8') as stream:
+            timed("Validar (--dry-run)", users,
+                  lambda: import_progress(JsonProgressPersistence(target_dir), read_jsonl_records(stream),
+                                          workers=WORKERS, dry_run=True))
+
+        target = JsonProgressPersistence(target_dir, fsync=not hasattr(os, 'sync'))
+
+        def import_and_sync():
+            with open(archive, 'r', encoding='utf-8') as stream:
+                report = import_progress(target, read_jsonl_records(stream), workers=WORKERS)
+            if hasattr(os, 'sync'):
+                os.sync()
+            return report
+
+        imported = timed("Importar (JSONL)", users, import_and_sync)
+
+        assert export.written == users and imported.written == users
+        assert target.list_users() == source.list_users()
+        for i in range(0, users, max(1, users // 100)):
+            user_id = f'alumno{i:06d}'
+            assert target.load_progress(user_id) == source.load_progress(user_id)
+        print("\nProgreso importado idéntico al original: OK\n")
+
+        journal = JournaledProgressPersistence(tmp / 'bitacora', fsync=False)
+        with open(archive, 'r', encoding='utf-8') as stream:
+            timed("Importar (bitácora)", users,
+                  lambda: import_progress(journal, read_jsonl_records(stream), workers=WORKERS))
+        with open(tmp / 'bitacora.jsonl', 'w', encoding='utf-8') as stream:
+            journal_export = timed("Exportar (bitácora)", users,
+                                   lambda: export_progress(journal, journal.list_users(), stream, workers=WORKERS))
+        assert journal_export.written == users
+        assert not journal._state, "La bitácora no debe acumular los usuarios transferidos"
+        assert (tmp / 'bitacora.jsonl').read_bytes() == archive.read_bytes()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark de escrituras de progreso por examen
+
+Completa un examen real (ExamsPage + ExamWindow, sin pantalla) y cuenta las
+escrituras a disco de progress_current_user.json con la persistencia JSON
+directa y con la capa write-behind. El flujo anterior (dos save_user_progress
+extra de ExamsPage tras cada examen) se reproduce para ver el agrupamiento.
+
+Uso:
+    python -m benchmarks.bench_progress_writes
+"""
+from pathlib import Path
+from time import perf_counter
+import os
+import tempfile
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6.QtWidgets import QApplication
+from src.services.exam_data import get_exams_by_category
+from src.services.level_system import ImprovedLevelSystem, JsonProgressPersistence
+from src.services.progress_write_behind import WriteBehindProgressPersistence
+from src.ui.exams_page import ExamsPage
+
+
+def complete_exam(progress_persistence, legacy_flow: bool = False) -> float:
+    """Abre ExamsPage, rinde un examen completo y cierra la ventana de resultados"""
+    page = ExamsPage(level_system=ImprovedLevelSystem('normal'),
+                     progress_persistence=progress_persistence)
+    exam = get_exams_by_category('paises')[0]
+
+    start = perf_counter()
+    page.start_exam(exam)
+    window = page.exam_window
+    while True:
+        window.check_answer(window.session.question['correct'])
+        if window.session.next() is None:
+            break
+        window.show_question()
+    window.show_results()
+    window.handle_results_closed({'xp_earned': 0, 'category': '', 'title': exam['title'],
+                                  'correct_answers': 0, 'total_questions': 0, 'accuracy': 0,
+                                  'new_level': 1, 'old_level': 1})
+    if legacy_flow:
+        page.save_user_progress()
+        page.save_user_progress()
+    return perf_counter() - start
+
+
+def main():
+    app = QApplication([])
+
+    for legacy_flow in (False, True):
+        print("Flujo anterior:" if legacy_flow else "Flujo actual:")
+        with tempfile.TemporaryDirectory() as tmp:
+            direct = JsonProgressPersistence(Path(tmp) / 'direct')
+            direct.save_progress('current_user', {'difficulty': 'normal', 'total_xp': 0, 'level': 1})
+            direct.write_count = 0
+            elapsed = complete_exam(direct, legacy_flow)
+            print(f"  JSON directo: {direct.write_count} escritura(s) a disco ({elapsed * 1e3:.1f} ms)")
+
+            backend = JsonProgressPersistence(Path(tmp) / 'write_behind')
+            backend.save_progress('current_user', {'difficulty': 'normal', 'total_xp': 0, 'level': 1})
+            backend.write_count = 0
+            write_behind = WriteBehindProgressPersistence(backend, flush_delay=0.5)
+            elapsed = complete_exam(write_behind, legacy_flow)
+            write_behind.close()
+            print(f"  Write-behind: {write_behind.save_requests} guardado(s) solicitado(s), "
+                  f"{write_behind.disk_writes} escritura(s) a disco ({elapsed * 1e3:.1f} ms)")
+
+    app.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+"""
+Benchmark del planificador de repaso espaciado
+
+Con un banco de 100.000 preguntas ya respondidas (fechas de repaso repartidas
+entre el pasado y el futuro) compara tomar las N siguientes preguntas pendientes:
+- Recorrido completo: filtrar las pendientes y ordenarlas por fecha (O(n log n))
+- SpacedRepetitionScheduler.next_due: montículo, O(N log n)
+
+También mide el costo de registrar una respuesta y de guardar/cargar el estado:
+- Guardar al terminar un examen: anexa a la bitácora solo sus preguntas, sin
+  el texto de las que están en el catálogo
+- Cargar el estado completo (instantánea + bitácora) y compactarlo
+
+Uso:
+    python -m benchmarks.bench_spaced_repetition [preguntas]
+"""
+from pathlib import Path
+from time import perf_counter
+import random
+import statistics
+import sys
+import tempfile
+from src.services.spaced_repetition import DAY, ReviewStateStore, SpacedRepetitionScheduler, question_key
+
+BANK_SIZE = 100_000
+PICKS = (10, 20, 100)
+REPEAT = 50
+QUESTIONS_PER_EXAM = 20
+EXAMS = 60
+SAVE_LIMIT_MS = 20.0
+
+
+def build_question(i: int) -> dict:
+    return {
+        'question': f'Pregunta {i}',
+        'image': f'imagen-{i % 50}.png',
+        'options': ['A', 'B', 'C', 'D'],
+        'correct': 'A',
+        'explanation': 'Explicación'
+    }
+
+
+def build_exams(questions: list) -> dict:
+    """Catálogo simulado: exámenes de QUESTIONS_PER_EXAM preguntas"""
+    return {f'examen-{n}': {'id': f'examen-{n}', 'questions': questions[start:start + QUESTIONS_PER_EXAM]}
+            for n, start in enumerate(range(0, len(questions), QUESTIONS_PER_EXAM))}
+
+
+def full_scan(scheduler: SpacedRepetitionScheduler, count: int, now: float) -> list:
+    due = [item for item in scheduler.items.values() if item.due <= now]
+    due.sort(key=lambda item: (item.due, item.key))
+    return due[:count]
+
+
+def main():
+    bank_size = int(sys.argv[1]) if len(sys.argv) > 1 else BANK_SIZE
+    rng = random.Random(3)
+    now = 1_700_000_000.0
+    scheduler = SpacedRepetitionScheduler()
+    questions = [build_question(i) for i in range(bank_size)]
+    exams = build_exams(questions)
+
+    start = perf_counter()
+    for i, question in enumerate(questions):
+        # Respuestas en los últimos 30 días: algunas ya vencieron y otras no
+        scheduler.review(question, rng.random() < 0.7, now=now - rng.random() * 30 * DAY,
+                         source=f'examen-{i // QUESTIONS_PER_EXAM}')
+    review_time = (perf_counter() - start) / bank_size
+    print(f"Banco: {bank_size:,} preguntas, {sum(1 for i in scheduler.items.values() if i.due <= now):,} pendientes")
+    print(f"Registrar una respuesta: {review_time * 1e6:.1f} µs\n")
+
+    print(f"{'Siguientes N':<14} {'recorrido completo':>20} {'montículo':>14}")
+    for count in PICKS:
+        start = perf_counter()
+        for _ in range(REPEAT // 10):
+            expected = full_scan(scheduler, count, now)
+        scan = (perf_counter() - start) / (REPEAT // 10)
+        start = perf_counter()
+        for _ in range(REPEAT):
+            selected = scheduler.next_due(count, now)
+        heap = (perf_counter() - start) / REPEAT
+        assert [item.key for item in selected] == [item.key for item in expected]
+        print(f"{count:<14} {scan * 1000:>17.1f} ms {heap * 1e6:>11.1f} µs")
+
+    # Repasar las elegidas las saca de las pendientes
+    for item in scheduler.next_due(20, now):
+        scheduler.review(item.question, True, now=now)
+    assert [i.key for i in scheduler.next_due(20, now)] == [i.key for i in full_scan(scheduler, 20, now)]
+    print("\nMismo resultado que el recorrido completo: OK")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        store = ReviewStateStore(tmp, resolve=exams.get)
+        user = store.get_scheduler('bench')
+        user.items.update(scheduler.items)
+        user.dirty.update(scheduler.items)
+        start = perf_counter()
+        assert store.save('bench')
+        first_save = perf_counter() - start
+        journal = store.get_journal_path('bench')
+        print(f"\nPrimer guardado ({bank_size:,} preguntas): {first_save * 1000:.0f} ms, "
+              f"{journal.stat().st_size / 2 ** 20:.1f} MB")
+
+        # Guardar al terminar cada examen: solo sus preguntas
+        saves = []
+        appended = journal.stat().st_size
+        for n in range(EXAMS):
+            exam = exams[f'examen-{rng.randrange(len(exams))}']
+            for question in exam['questions']:
+                user.review(question, rng.random() < 0.7, now=now, source=exam['id'])
+            start = perf_counter()
+            assert store.save('bench')
+            saves.append((perf_counter() - start) * 1000)
+        appended = (journal.stat().st_size - appended) / (EXAMS * QUESTIONS_PER_EXAM)
+        print(f"Guardar al terminar un examen de {QUESTIONS_PER_EXAM} preguntas: mediana "
+              f"{statistics.median(saves):.2f} ms, máx {max(saves):.2f} ms ({appended:.0f} bytes por pregunta)")
+
+        # Cargar: la bitácora ya tiene más registros que preguntas, así que se compacta
+        start = perf_counter()
+        loaded = ReviewStateStore(tmp, resolve=exams.get).get_scheduler('bench')
+        compact_time = perf_counter() - start
+        assert journal.stat().st_size == 0
+        start = perf_counter()
+        loaded = ReviewStateStore(tmp, resolve=exams.get).get_scheduler('bench')
+        load_time = perf_counter() - start
+        size = store.get_path('bench').stat().st_size
+        assert [i.key for i in loaded.next_due(20, now)] == [i.key for i in full_scan(user, 20, now)]
+        assert all(vars(loaded.items[key]) == {**vars(item), 'question': {}} for key, item in user.items.items())
+        print(f"Instantánea: {size / 2 ** 20:.1f} MB, cargar y compactar {compact_time * 1000:.0f} ms, "
+              f"cargar {load_time * 1000:.0f} ms")
+
+        # El repaso lee el texto de las preguntas del catálogo; las que ya no están se quitan
+        gone = {question_key(q) for q in exams.pop(loaded.next_due(1, now)[0].source)['questions']}
+        review_exam = loaded.build_review_exam(20, now)
+        expected = [i.key for i in full_scan(user, 20 + len(gone), now) if i.key not in gone][:20]
+        assert [question_key(q) for q in review_exam['questions']] == expected
+        assert all(q == exams[loaded.items[question_key(q)].source]['questions'][int(q['question'].split()[1]) % QUESTIONS_PER_EXAM]
+                   for q in review_exam['questions'])
+        print("Repaso con preguntas leídas del catálogo: OK")
+
+    assert statistics.median(saves) < SAVE_LIMIT_MS
+    assert appended < 200
+
+
+if __name__ == '__main__':
+    main()
@@ -3,15 +3,21 @@ from PyQt6.QtWidgets import QMainWindow, QApplication, QPushButton
 from src.ui.sidebar_ui import Ui_MainWindow
 from src.ui.exams_page import ExamsPage
 from src.ui.chat_page import ChatPage
-from src.services.level_system import ImprovedLevelSystem, JsonProgressPersistence
+from src.services.level_system import DEFAULT_USER_ID, ImprovedLevelSystem, JsonProgressPersistence
+from src.services.progress_write_behind import WriteBehindProgressPersistence
+from src.services.sqlite_progress import SqliteProgressPersistence, migrate_json_progress
+from src.services.daily_xp import migrate_daily_xp
+from src.services.progress_journal import JournaledProgressPersistence
 from pathlib import Path
 from src.ui.exams_page import DifficultySelector
 from datetime import datetime
 from src.ui.stats_page import StatsPage
 from src.ui.login_page import LoginWindow
 from src.ui.notes_page import NotesPage
-from src.utils.constants import ICON_PATH
+from src.services.asset_index import get_asset_index
 from PyQt6.QtGui import QIcon
+from dotenv import load_dotenv
+import os
 
 
 class MainWindow(QMainWindow):
@@ -19,8 +25,11 @@ class MainWindow(QMainWindow):
         super(MainWindow, self).__init__()
         self.showMaximized()
 
+        # Índice de recursos: se arma una vez aquí y avisa de los que faltan
+        assets = get_asset_index()
+
         # Establecer el icono de la ventana
-        self.setWindowIcon(QIcon(str(ICON_PATH / 'logo2_preview.png')))
+        self.setWindowIcon(QIcon(assets.path('icon/logo2_preview.png')))
 
         self.ui = Ui_MainWindow()
         self.ui.setupUi(self)
@@ -28,16 +37,23 @@ class MainWindow(QMainWindow):
         # Configuración inicial
         self.ui.icon_only_widget.hide()
 
-        # Inicializar sistema de niveles y persistencia
+        # Inicializar sistema de niveles y persistencia (compartida por todas las páginas)
         save_dir = Path.home() / '.geograpy' / 'progress'
-        self.progress_persistence = JsonProgressPersistence(save_dir)
+        self.progress_persistence = self.create_progress_backend(save_dir)
+        # Usuario cuyo progreso se muestra y guarda (GEOGRAPY_USER_ID, leído del .env)
+        self.user_id = os.getenv('GEOGRAPY_USER_ID') or DEFAULT_USER_ID
+        if not isinstance(self.progress_persistence, JournaledProgressPersistence):
+            # La bitácora ya escribe solo anexados pequeños; el resto agrupa escrituras completas
+            self.progress_persistence = WriteBehindProgressPersistence(self.progress_persistence)
+        QApplication.instance().aboutToQuit.connect(self.progress_persistence.close)
+        migrate_daily_xp(self.progress_persistence, self.user_id)
         self.level_system = None  # Se inicializará cuando se elija la dificultad
 
         # Inicializar páginas
         self.exams_page = None
         self.chat_page = ChatPage()
         # Página de estadísticas
-        self.stats_page = StatsPage()
+        self.stats_page = StatsPage(progress_persistence=self.progress_persistence, user_id=self.user_id)
         self.ui.page_2_layout.addWidget(self.stats_page)
 
         # Agregar chat page a su layout
@@ -57,6 +73,26 @@ class MainWindow(QMainWindow):
         self.ui.home_btn_2.setChecked(True)
         self.ui.stackedWidget.setCurrentIndex(0)
 
+    @staticmethod
+    def create_progress_backend(save_dir: Path):
+        """Crea la persistencia configurada en GEOGRAPY_PROGRESS_BACKEND (json, sqlite o journal)"""
+        load_dotenv()
+        backend_name = os.getenv('GEOGRAPY_PROGRESS_BACKEND', 'json').lower()
+        if backend_name == 'journal':
+            return JournaledProgressPersistence(save_dir)
+        if backend_name == 'sqlite':
+            backend = SqliteProgressPersistence(save_dir / 'progress.db')
+            # Primera vez: migrar los archivos JSON existentes
+            if not backend.list_users():
+                migrate_json_progress(save_dir, backend)
+            return backend
+        # GEOGRAPY_PROGRESS_FORMAT: json (por defecto) o binary; GEOGRAPY_PROGRESS_COMPRESSION: zlib o zstd
+        return JsonProgressPersistence(
+            save_dir,
+            file_format=os.getenv('GEOGRAPY_PROGRESS_FORMAT', 'json').lower(),
+            compression=os.getenv('GEOGRAPY_PROGRESS_COMPRESSION') or None
+        )
+
     def setup_navigation(self):
         """Configura las conexiones de navegación"""
         for i, (menu_btn, icon_btn) in enumerate(zip(self.ui.menu_buttons, self.ui.icon_buttons)):
@@ -76,7 +112,7 @@ class MainWindow(QMainWindow):
         """
         if self.exams_page is None:
             # Primero cargar el progreso existente
-            current_progress = self.progress_persistence.load_progress('current_user')
+            current_progress = self.progress_persistence.load_progress(self.user_id)
             difficulty = current_progress.get('difficulty')
 
             # Solo mostrar el selector si no hay dificultad guardada
@@ -85,7 +121,7 @@ class MainWindow(QMainWindow):
                 if difficulty:
                     # Guardar la dificultad seleccionada
                     current_progress['difficulty'] = difficulty
-                    self.progress_persistence.save_progress('current_user', current_progress)
+                    self.progress_persistence.save_progress(self.user_id, current_progress)
                 else:
                     # Si el usuario cancela la selección, volver a la página anterior
                     return
@@ -94,7 +130,8 @@ class MainWindow(QMainWindow):
             self.level_system = ImprovedLevelSystem(difficulty=difficulty)
             self.exams_page = ExamsPage(
                 level_system=self.level_system,
-                progress_persistence=self.progress_persistence
+                progress_persistence=self.progress_persistence,
+                user_id=self.user_id
             )
             self.ui.page_3_layout.addWidget(self.exams_page)
 
@@ -102,7 +139,7 @@ class MainWindow(QMainWindow):
 
     def show_difficulty_selector(self) -> str:
         """Muestra el selector de dificultad al entrar por primera vez"""
-        current_progress = self.progress_persistence.load_progress('current_user')
+        current_progress = self.progress_persistence.load_progress(self.user_id)
 
         # Si ya hay una dificultad guardada, usarla
         if current_progress and 'difficulty' in current_progress:
@@ -113,7 +150,7 @@ class MainWindow(QMainWindow):
         if selector.exec():
             difficulty = selector.get_selected_difficulty()
             # Guardar la preferencia
-            self.progress_persistence.save_progress('current_user', {
+            self.progress_persistence.save_progress(self.user_id, {
                 'difficulty': difficulty,
                 'total_xp': 0,
                 'level': 1,
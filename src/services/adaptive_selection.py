@@ -0,0 +1,251 @@
+"""
+Selección adaptativa de preguntas por dificultad estimada (estilo Elo)
+
+- Cada pregunta tiene una dificultad y cada usuario una habilidad, en la misma
+  escala (INITIAL_RATING = 1000)
+- Probabilidad de acierto: p = 1 / (1 + 10 ** ((dificultad - habilidad) / 400))
+- Tras cada respuesta ambos se corrigen en forma incremental: la habilidad sube y
+  la dificultad baja si el usuario acertó (y al revés), en proporción a lo
+  inesperado del resultado. El factor K baja con el número de respuestas
+- La siguiente pregunta es la de dificultad más cercana a la que da la tasa de
+  acierto objetivo (TARGET_SUCCESS): habilidad + 400 * log10(1 / objetivo - 1)
+
+Las preguntas candidatas se agrupan en cubetas de BUCKET_WIDTH puntos de
+dificultad; elegir una es ir a la cubeta del objetivo (o la más cercana con
+preguntas) y tomar una al azar, y sacarla es O(1). El costo no depende del
+tamaño del banco.
+"""
+from math import floor, log10
+from pathlib import Path
+from typing import Any, Dict, Hashable, List, Tuple
+import json
+import os
+import random
+from src.services.spaced_repetition import question_key
+
+INITIAL_RATING = 1000.0
+TARGET_SUCCESS = 0.75
+BUCKET_WIDTH = 25.0
+K_MAX = 64.0
+K_MIN = 8.0
+# Dificultad inicial de las preguntas según la dificultad del examen
+DIFFICULTY_RATINGS = {'Fácil': 900.0, 'Media': 1000.0, 'Difícil': 1100.0}
+RATINGS_VERSION = 1
+
+
+def expected_success(ability: float, difficulty: float) -> float:
+    """Probabilidad de acierto según el modelo Elo"""
+    return 1.0 / (1.0 + 10.0 ** ((difficulty - ability) / 400.0))
+
+
+def target_difficulty(ability: float, target_success: float = TARGET_SUCCESS) -> float:
+    """Dificultad con la que el usuario acierta con probabilidad `target_success`"""
+    return ability + 400.0 * log10(1.0 / target_success - 1.0)
+
+
+def initial_ability(level: int = 1, accuracy: float = None) -> float:
+    """Habilidad inicial a partir de lo que ya sabe el sistema de niveles
+
+    Args:
+        level (int): Nivel actual (pequeño ajuste de 5 puntos por nivel)
+        accuracy (float): Precisión media en porcentaje; se interpreta como la tasa de
+            acierto frente a preguntas de dificultad INITIAL_RATING
+    """
+    ability = INITIAL_RATING + 5.0 * (max(1, level) - 1)
+    if accuracy is not None:
+        rate = min(0.95, max(0.05, accuracy / 100.0))
+        ability += 400.0 * log10(rate / (1.0 - rate))
+    return ability
+
+
+def k_factor(answers: int) -> float:
+    """Factor K: grande con pocas respuestas (estimación incierta), luego estable"""
+    return max(K_MIN, K_MAX / (1.0 + answers / 10.0))
+
+
+class BucketedQuestionIndex:
+    """Índice de preguntas candidatas agrupadas por cubetas de dificultad"""
+
+    def __init__(self, bucket_width: float = BUCKET_WIDTH, seed: int = None):
+        self.bucket_width = bucket_width
+        self._rng = random.Random(seed)
+        self._buckets: Dict[int, List[Hashable]] = {}
+        # Ubicación de cada elemento: (cubeta, posición dentro de la cubeta)
+        self._positions: Dict[Hashable, Tuple[int, int]] = {}
+        self._min_bucket = 0
+        self._max_bucket = -1
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, item_id: Hashable) -> bool:
+        return item_id in self._positions
+
+    def _bucket_of(self, rating: float) -> int:
+        return floor(rating / self.bucket_width)
+
+    def add(self, item_id: Hashable, rating: float):
+        if item_id in self._positions:
+            self.remove(item_id)
+        bucket_id = self._bucket_of(rating)
+        bucket = self._buckets.setdefault(bucket_id, [])
+        self._positions[item_id] = (bucket_id, len(bucket))
+        bucket.append(item_id)
+        if self._max_bucket < self._min_bucket:
+            self._min_bucket = self._max_bucket = bucket_id
+        else:
+            self._min_bucket = min(self._min_bucket, bucket_id)
+            self._max_bucket = max(self._max_bucket, bucket_id)
+
+    def remove(self, item_id: Hashable):
+        """Saca un elemento en O(1): el último de su cubeta ocupa su lugar"""
+        bucket_id, position = self._positions.pop(item_id)
+        bucket = self._buckets[bucket_id]
+        last = bucket.pop()
+        if position < len(bucket):
+            bucket[position] = last
+            self._positions[last] = (bucket_id, position)
+        elif not bucket:
+            del self._buckets[bucket_id]
+
+    def pick(self, rating: float) -> Hashable:
+        """Elemento al azar de la cubeta más cercana a `rating` (None si está vacío)
+
+        Se recorren las cubetas hacia ambos lados del objetivo; como los límites se
+        acotan por la menor y la mayor cubeta usadas, el recorrido es corto.
+        """
+        if not self._positions:
+            return None
+        target = min(max(self._bucket_of(rating), self._min_bucket), self._max_bucket)
+        for distance in range(self._max_bucket - self._min_bucket + 1):
+            for bucket_id in (target - distance, target + distance) if distance else (target,):
+                bucket = self._buckets.get(bucket_id)
+                if bucket:
+                    return bucket[int(self._rng.random() * len(bucket))]
+        return None
+
+    def nearest(self, rating: float, count: int) -> List[Hashable]:
+        """Hasta `count` elementos de las cubetas más cercanas a `rating` (sin sacarlos)"""
+        found = []
+        if not self._positions:
+            return found
+        target = min(max(self._bucket_of(rating), self._min_bucket), self._max_bucket)
+        for distance in range(self._max_bucket - self._min_bucket + 1):
+            for bucket_id in (target - distance, target + distance) if distance else (target,):
+                found.extend(self._buckets.get(bucket_id, ())[:count - len(found)])
+                if len(found) >= count:
+                    return found
+        return found
+
+
+class AdaptiveSelector:
+    """Estimaciones de dificultad por pregunta y de habilidad por usuario, con persistencia"""
+
+    def __init__(self, ratings_path: Path = None, target_success: float = TARGET_SUCCESS):
+        """
+        Args:
+            ratings_path (Path): Archivo JSON de las estimaciones (None: solo en memoria)
+            target_success (float): Tasa de acierto buscada al elegir preguntas
+        """
+        self.ratings_path = Path(ratings_path) if ratings_path else None
+        self.target_success = target_success
+        # Clave -> [estimación, número de respuestas]
+        self.questions: Dict[str, List[float]] = {}
+        self.users: Dict[str, List[float]] = {}
+        if self.ratings_path is not None and self.ratings_path.exists():
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.ratings_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.questions = data.get('questions', {})
+            self.users = data.get('users', {})
+        except (OSError, ValueError) as e:
+            print(f"Error al cargar las estimaciones de dificultad: {e}")
+
+    def save(self) -> bool:
+        """Escribe las estimaciones (escritura atómica)"""
+        if self.ratings_path is None:
+            return True
+        temp_path = self.ratings_path.with_name(f"{self.ratings_path.name}.{os.getpid()}.tmp")
+        try:
+            self.ratings_path.parent.mkdir(parents=True, exist_ok=True)
+            data = json.dumps({'version': RATINGS_VERSION, 'questions': self.questions, 'users': self.users},
+                              separators=(',', ':'))
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(temp_path, self.ratings_path)
+            return True
+        except OSError as e:
+            print(f"Error al guardar las estimaciones de dificultad: {e}")
+            return False
+
+    def ensure_user(self, user_id: str, level: int = 1, accuracy: float = None) -> float:
+        """Habilidad del usuario; si es nuevo, se inicia desde su nivel y precisión"""
+        entry = self.users.get(user_id)
+        if entry is None:
+            entry = self.users[user_id] = [initial_ability(level, accuracy), 0]
+        return entry[0]
+
+    def user_rating(self, user_id: str) -> float:
+        entry = self.users.get(user_id)
+        return entry[0] if entry else INITIAL_RATING
+
+    def question_rating(self, question: Dict[str, Any], default: float = INITIAL_RATING) -> float:
+        entry = self.questions.get(question_key(question))
+        return entry[0] if entry else default
+
+    def record_answer(self, user_id: str, question: Dict[str, Any], correct: bool,
+                      default_rating: float = INITIAL_RATING, key: str = None) -> float:
+        """Actualiza la habilidad del usuario y la dificultad de la pregunta (`key`:
+        question_key(question), si ya se calculó)
+
+        Returns:
+            float: Probabilidad de acierto que predecía el modelo antes de responder
+        """
+        user = self.users.get(user_id)
+        if user is None:
+            user = self.users[user_id] = [INITIAL_RATING, 0]
+        key = key or question_key(question)
+        item = self.questions.get(key)
+        if item is None:
+            item = self.questions[key] = [default_rating, 0]
+
+        expected = expected_success(user[0], item[0])
+        surprise = (1.0 if correct else 0.0) - expected
+        user[0] += k_factor(user[1]) * surprise
+        item[0] -= k_factor(item[1]) * surprise
+        user[1] += 1
+        item[1] += 1
+        return expected
+
+    def build_index(self, questions: List[Dict[str, Any]], default_rating: float = INITIAL_RATING,
+                    seed: int = None) -> BucketedQuestionIndex:
+        """Índice con las preguntas candidatas (identificadas por su posición en la lista)"""
+        index = BucketedQuestionIndex(seed=seed)
+        for position, question in enumerate(questions):
+            index.add(position, self.question_rating(question, default_rating))
+        return index
+
+    def candidates(self, index: BucketedQuestionIndex, user_id: str, count: int) -> List[Hashable]:
+        """Preguntas con más probabilidad de elegirse a continuación (para precargarlas)"""
+        return index.nearest(target_difficulty(self.user_rating(user_id), self.target_success), count)
+
+    def pick(self, index: BucketedQuestionIndex, user_id: str) -> Hashable:
+        """Saca del índice la pregunta más cercana a la tasa de acierto objetivo"""
+        item_id = index.pick(target_difficulty(self.user_rating(user_id), self.target_success))
+        if item_id is not None:
+            index.remove(item_id)
+        return item_id
+
+
+_default_selector: AdaptiveSelector = None
+
+
+def get_adaptive_selector() -> AdaptiveSelector:
+    """Selector compartido de la aplicación (~/.geograpy/adaptive/ratings.json)"""
+    global _default_selector
+    if _default_selector is None:
+        _default_selector = AdaptiveSelector(Path.home() / '.geograpy' / 'adaptive' / 'ratings.json')
+    return _default_selector
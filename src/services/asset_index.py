@@ -0,0 +1,211 @@
+"""
+Índice de recursos (imágenes e íconos) de resources/
+
+Se arma una sola vez al iniciar la aplicación: cada archivo queda registrado
+con su nombre lógico (la ruta relativa a resources/, p. ej.
+'images/countries/francia.png'), su ruta absoluta, su tamaño en bytes, su
+formato real (según el contenido: hay .png que son JPEG) y sus dimensiones.
+Después, resolver un recurso es una búsqueda en un diccionario, sin tocar el
+disco, y no depende del directorio de trabajo.
+
+Si existe resources/assets.json (generado con
+`python -m src.services.asset_index`) y es más nuevo que todas las carpetas
+de resources/, se carga en vez de recorrer los archivos.
+
+Los recursos que faltan se avisan una sola vez: los de la interfaz
+(REQUIRED_ASSETS) al crear el índice y el resto la primera vez que se piden.
+"""
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+import argparse
+import json
+import os
+from PyQt6.QtGui import QImageReader
+from src.utils.constants import RESOURCE_PATH
+
+MANIFEST_NAME = 'assets.json'
+MANIFEST_VERSION = 1
+
+# Recursos que usa la interfaz directamente
+REQUIRED_ASSETS = (
+    'icon/paises-preview.png',
+    'icon/capitals-preview.png',
+    'icon/flora-preview.png',
+    'icon/fauna.png',
+    'icon/logo2_preview.png',
+    'icon/uva_fondo.png',
+    'images/levels/corona.png',
+    'images/levels/medalla-de-oro.png',
+    'images/levels/llave_inglesa.png',
+)
+
+
+@dataclass(frozen=True)
+class Asset:
+    """Un archivo de resources/"""
+    name: str  # Ruta relativa a resources/ con '/' ('icon/fauna.png')
+    path: str  # Ruta absoluta
+    size: int  # Bytes
+    format: str  # Formato según el contenido ('png', 'jpeg', ...) o la extensión si no es imagen
+    width: int = 0
+    height: int = 0
+
+
+def _describe(path: Path, name: str, size: int) -> Asset:
+    """Lee solo la cabecera del archivo para obtener formato y dimensiones"""
+    reader = QImageReader(str(path))
+    reader.setDecideFormatFromContent(True)
+    image_format = bytes(reader.format()).decode()
+    if not image_format:
+        return Asset(name, str(path), size, path.suffix.lstrip('.').lower())
+    dimensions = reader.size()
+    return Asset(name, str(path), size, image_format, max(0, dimensions.width()), max(0, dimensions.height()))
+
+
+class AssetIndex:
+    """Nombre lógico -> recurso, con búsquedas O(1) y avisos únicos de faltantes"""
+
+    def __init__(self, assets: Iterable[Asset] = (), root: Path = RESOURCE_PATH):
+        self.root = Path(root)
+        self._entries: List[Asset] = []
+        self._assets: Dict[str, Asset] = {}
+        # Carpeta ('icon', 'images/countries') -> nombre de archivo -> recurso
+        self._folders: Dict[str, Dict[str, Asset]] = {}
+        self._reported = set()
+        for asset in assets:
+            self._add(asset)
+
+    def _add(self, asset: Asset):
+        self._entries.append(asset)
+        self._assets[asset.name] = asset
+        # Algunos datos guardan la ruta desde la raíz del proyecto ('resources/icon/...')
+        self._assets[f"{self.root.name}/{asset.name}"] = asset
+        folder, _, file_name = asset.name.rpartition('/')
+        self._folders.setdefault(folder, {})[file_name] = asset
+
+    @classmethod
+    def scan(cls, root: Path = RESOURCE_PATH) -> 'AssetIndex':
+        """Recorre root una vez y registra todos sus archivos"""
+        root = Path(root)
+        assets = []
+        pending = [root] if root.is_dir() else []
+        while pending:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        pending.append(Path(entry.path))
+                    elif entry.is_file() and entry.name != MANIFEST_NAME:
+                        path = Path(entry.path)
+                        assets.append(_describe(path, path.relative_to(root).as_posix(), entry.stat().st_size))
+        assets.sort(key=lambda asset: asset.name)
+        return cls(assets, root)
+
+    @classmethod
+    def load_manifest(cls, manifest_path: Path, root: Path = RESOURCE_PATH) -> 'AssetIndex':
+        """Carga un índice generado con save_manifest (las rutas absolutas se calculan con root)"""
+        root = Path(root)
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls((Asset(**dict(entry, path=str(root / entry['name']))) for entry in data['assets']), root)
+
+    def save_manifest(self, manifest_path: Path) -> bool:
+        """Escribe el índice en JSON (escritura atómica), sin las rutas absolutas"""
+        manifest_path = Path(manifest_path)
+        temp_path = manifest_path.with_name(f"{manifest_path.name}.{os.getpid()}.tmp")
+        entries = [{key: value for key, value in asdict(asset).items() if key != 'path'}
+                   for asset in self.assets()]
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': MANIFEST_VERSION, 'assets': entries}, f, ensure_ascii=False, indent=1)
+            os.replace(temp_path, manifest_path)
+            # El reemplazo cambia la fecha de la carpeta: el manifiesto debe quedar más nuevo
+            os.utime(manifest_path)
+            return True
+        except OSError as e:
+            print(f"Error al guardar el índice de recursos: {e}")
+            return False
+
+    def assets(self) -> List[Asset]:
+        return list(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._assets
+
+    def get(self, name: str, folders: Tuple[str, ...] = ()) -> Asset:
+        """Recurso por nombre lógico o, si no, por nombre de archivo dentro de `folders` (en orden)
+
+        Returns:
+            Asset: El recurso, o None (avisando una sola vez por nombre) si no existe
+        """
+        asset = self._assets.get(name)
+        if asset is None:
+            for folder in folders:
+                asset = self._folders.get(folder, {}).get(name)
+                if asset is not None:
+                    break
+        if asset is None and name not in self._reported:
+            self._reported.add(name)
+            print(f"Error: recurso no encontrado: {name}")
+        return asset
+
+    def path(self, name: str, folders: Tuple[str, ...] = ()) -> str:
+        """Ruta absoluta del recurso ('' si no existe)"""
+        asset = self.get(name, folders)
+        return asset.path if asset is not None else ''
+
+    def check(self, names: Iterable[str]) -> List[str]:
+        """Avisa (una vez) de los recursos que faltan y los devuelve"""
+        return [name for name in names if self.get(name) is None]
+
+
+def _manifest_is_fresh(manifest_path: Path, root: Path) -> bool:
+    """El manifiesto sirve si es más nuevo que todas las carpetas (agregar o quitar un
+    archivo cambia la fecha de su carpeta)"""
+    try:
+        manifest_mtime = manifest_path.stat().st_mtime_ns
+        for directory, _, _ in os.walk(root):
+            if os.stat(directory).st_mtime_ns > manifest_mtime:
+                return False
+        return True
+    except OSError:
+        return False
+
+
+_default_index: AssetIndex = None
+
+
+def get_asset_index() -> AssetIndex:
+    """Índice compartido de resources/ (se arma la primera vez y avisa de los faltantes)"""
+    global _default_index
+    if _default_index is None:
+        manifest_path = RESOURCE_PATH / MANIFEST_NAME
+        index = None
+        if _manifest_is_fresh(manifest_path, RESOURCE_PATH):
+            try:
+                index = AssetIndex.load_manifest(manifest_path, RESOURCE_PATH)
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                print(f"Error al cargar el índice de recursos: {e}")
+        _default_index = index or AssetIndex.scan(RESOURCE_PATH)
+        _default_index.check(REQUIRED_ASSETS)
+    return _default_index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera el índice de recursos (resources/assets.json)")
+    parser.add_argument('root', nargs='?', type=Path, default=RESOURCE_PATH, help="Carpeta de recursos")
+    parser.add_argument('-o', '--output', type=Path, help="Archivo de salida (por defecto <root>/assets.json)")
+    args = parser.parse_args()
+    index = AssetIndex.scan(args.root)
+    output = args.output or args.root / MANIFEST_NAME
+    if not index.save_manifest(output):
+        return 1
+    print(f"{len(index)} recursos -> {output}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
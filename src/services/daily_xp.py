@@ -0,0 +1,190 @@
+from array import array
+from datetime import date, timedelta
+from typing import Any, Dict, List, Tuple
+
+LEGACY_PREFIX = 'daily_xp_'
+PROGRESS_KEY = 'daily_xp'
+
+
+def _parse_day(day) -> date:
+    return day if isinstance(day, date) else date.fromisoformat(str(day)[:10])
+
+
+def week_key(day: date) -> str:
+    """Clave ISO de la semana: YYYY-Www"""
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def month_key(day: date) -> str:
+    """Clave del mes: YYYY-MM"""
+    return f"{day.year}-{day.month:02d}"
+
+
+class DailyXpSeries:
+    """Serie temporal compacta de XP diaria
+
+    - Los días se guardan en un arreglo contiguo de enteros (un bucket por día)
+      a partir de una fecha de inicio, por lo que una consulta por rango es una
+      porción del arreglo: O(rango)
+    - Los totales semanales y mensuales se acumulan al agregar XP
+    - Política de retención: se conservan `daily_retention` días, `weekly_retention`
+      semanas y todos los meses
+    """
+
+    def __init__(self, daily_retention: int = 400, weekly_retention: int = 156):
+        self.daily_retention = daily_retention
+        self.weekly_retention = weekly_retention
+        self.start: date = None
+        self.values = array('q')
+        self.weekly: Dict[str, int] = {}
+        self.monthly: Dict[str, int] = {}
+
+    @property
+    def end(self) -> date:
+        """Último día con bucket (None si la serie está vacía)"""
+        if self.start is None:
+            return None
+        return self.start + timedelta(days=len(self.values) - 1)
+
+    def add(self, day, xp: int):
+        """Suma XP al día indicado (y a su semana y mes)"""
+        day = _parse_day(day)
+        if self.start is None:
+            self.start = day
+            self.values.append(0)
+        elif (day - self.end).days >= self.daily_retention:
+            # Todos los días guardados quedan fuera de la ventana de retención
+            self.start = day
+            self.values = array('q', [0])
+        elif day > self.end:
+            self.values.extend([0] * (day - self.end).days)
+        elif day < self.start:
+            if (self.end - day).days >= self.daily_retention:
+                return  # Fuera de la ventana de retención
+            self.values[0:0] = array('q', [0] * (self.start - day).days)
+            self.start = day
+
+        self.values[(day - self.start).days] += xp
+        self.weekly[week_key(day)] = self.weekly.get(week_key(day), 0) + xp
+        self.monthly[month_key(day)] = self.monthly.get(month_key(day), 0) + xp
+        self._apply_retention()
+
+    def _apply_retention(self):
+        excess = len(self.values) - self.daily_retention
+        if excess > 0:
+            del self.values[:excess]
+            self.start += timedelta(days=excess)
+        if len(self.weekly) > self.weekly_retention:
+            for key in sorted(self.weekly)[:len(self.weekly) - self.weekly_retention]:
+                del self.weekly[key]
+
+    def get(self, day) -> int:
+        """XP de un día (0 si no hay registro)"""
+        day = _parse_day(day)
+        if self.start is None or not self.start <= day <= self.end:
+            return 0
+        return self.values[(day - self.start).days]
+
+    def range(self, start_day, end_day) -> List[int]:
+        """XP de cada día entre start_day y end_day (inclusive), O(rango)"""
+        start_day, end_day = _parse_day(start_day), _parse_day(end_day)
+        days = (end_day - start_day).days + 1
+        if days <= 0:
+            return []
+        result = [0] * days
+        if self.start is None:
+            return result
+        first = max(start_day, self.start)
+        last = min(end_day, self.end)
+        if first <= last:
+            offset = (first - start_day).days
+            begin = (first - self.start).days
+            count = (last - first).days + 1
+            result[offset:offset + count] = self.values[begin:begin + count].tolist()
+        return result
+
+    def weekly_range(self, start_day, end_day) -> List[Tuple[str, int]]:
+        """Totales semanales (YYYY-Www, XP) de las semanas entre dos fechas"""
+        day, end_day = _parse_day(start_day), _parse_day(end_day)
+        day -= timedelta(days=day.weekday())
+        result = []
+        while day <= end_day:
+            key = week_key(day)
+            result.append((key, self.weekly.get(key, 0)))
+            day += timedelta(days=7)
+        return result
+
+    def monthly_range(self, start_day, end_day) -> List[Tuple[str, int]]:
+        """Totales mensuales (YYYY-MM, XP) de los meses entre dos fechas"""
+        day, end_day = _parse_day(start_day).replace(day=1), _parse_day(end_day)
+        result = []
+        while day <= end_day:
+            key = month_key(day)
+            result.append((key, self.monthly.get(key, 0)))
+            day = (day + timedelta(days=32)).replace(day=1)
+        return result
+
+    def days(self):
+        """Itera (fecha, XP) de los días con XP distinta de cero"""
+        if self.start is None:
+            return
+        for offset, xp in enumerate(self.values):
+            if xp:
+                yield self.start + timedelta(days=offset), xp
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Representación compacta para guardar en el documento de progreso"""
+        return {
+            'start': self.start.isoformat() if self.start else None,
+            'values': self.values.tolist(),
+            'weekly': dict(self.weekly),
+            'monthly': dict(self.monthly),
+            'daily_retention': self.daily_retention,
+            'weekly_retention': self.weekly_retention
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'DailyXpSeries':
+        series = cls(
+            daily_retention=data.get('daily_retention', 400),
+            weekly_retention=data.get('weekly_retention', 156)
+        )
+        if data.get('start'):
+            series.start = date.fromisoformat(data['start'])
+            series.values = array('q', data.get('values', []))
+        series.weekly = dict(data.get('weekly', {}))
+        series.monthly = dict(data.get('monthly', {}))
+        return series
+
+    @classmethod
+    def from_progress(cls, progress: Dict[str, Any]) -> 'DailyXpSeries':
+        """Obtiene la serie de un documento de progreso
+
+        Si el documento todavía tiene claves daily_xp_YYYY-MM-DD, se migran a la
+        serie y se eliminan del documento.
+        """
+        data = progress.get(PROGRESS_KEY)
+        series = cls.from_dict(data) if isinstance(data, dict) else cls()
+
+        legacy_keys = sorted(key for key in progress if key.startswith(LEGACY_PREFIX))
+        for key in legacy_keys:
+            xp = progress.pop(key)
+            try:
+                series.add(key[len(LEGACY_PREFIX):], int(xp))
+            except (TypeError, ValueError):
+                continue
+        return series
+
+
+def migrate_daily_xp(progress_persistence, user_id: str) -> bool:
+    """Mueve las claves daily_xp_YYYY-MM-DD de un usuario a la serie compacta
+
+    Returns:
+        bool: True si había claves para migrar y se guardó el documento
+    """
+    progress = progress_persistence.load_progress(user_id)
+    if not any(key.startswith(LEGACY_PREFIX) for key in progress):
+        return False
+    progress[PROGRESS_KEY] = DailyXpSeries.from_progress(progress).to_dict()
+    return progress_persistence.save_progress(user_id, progress)
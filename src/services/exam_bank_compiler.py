@@ -0,0 +1,352 @@
+"""
+Banco de exámenes compilado (binario, de solo lectura, para mmap)
+
+El compilador valida exams.json una sola vez (preguntas sin 'correct', 'correct'
+que no está entre las opciones, ids repetidos, ...) y escribe un archivo binario:
+
+    cabecera | categorías | exámenes | preguntas | opciones | índice de textos | textos
+
+- Los registros de categorías, exámenes y preguntas tienen tamaño fijo, por lo que
+  el examen i o la pregunta j se ubican con una multiplicación: O(1)
+- Los textos están internados: cada texto distinto se guarda una sola vez en UTF-8
+  y los registros guardan su índice en la tabla
+- Los campos desconocidos de exámenes y preguntas se conservan como JSON compacto
+
+En tiempo de ejecución CompiledExamBank mapea el archivo en memoria (mmap) y solo
+decodifica los registros que se piden.
+
+Uso:
+    python -m src.services.exam_bank_compiler src/data/json/exams.json [-o exams.ggb] [--check]
+"""
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+
+MAGIC = b'GGEB'
+VERSION = 1
+NONE = 0xFFFFFFFF
+
+# magic, versión, reservado | categorías, exámenes, preguntas, opciones, textos | offsets de secciones
+HEADER = struct.Struct('<4sHH5I6Q')
+# nombre, primer examen, número de exámenes
+CATEGORY = struct.Struct('<3I')
+# id, título, dificultad, ícono, extra | xp | categoría, primera pregunta, número de preguntas
+EXAM = struct.Struct('<5Ii3I')
+# pregunta, imagen, explicación, extra, primera opción | número de opciones, índice de la correcta
+QUESTION = struct.Struct('<5IHH')
+OPTION = struct.Struct('<I')
+STRING_OFFSET = struct.Struct('<Q')
+
+EXAM_FIELDS = ('id', 'title', 'difficulty', 'xp', 'icon', 'questions')
+QUESTION_FIELDS = ('question', 'image', 'options', 'correct', 'explanation')
+
+
+class ExamBankError(ValueError):
+    """El banco de exámenes no es válido o el archivo compilado está dañado"""
+
+
+# Errores al leer un banco compilado dañado (ValueError incluye ExamBankError,
+# UnicodeDecodeError y los errores de JSON de los campos extra)
+BANK_READ_ERRORS = (OSError, ValueError, UnicodeDecodeError, struct.error, IndexError)
+
+
+def validate_bank(bank: Any) -> List[str]:
+    """Valida el banco de exámenes
+
+    Args:
+        bank: Contenido de exams.json
+    Returns:
+        List[str]: Errores encontrados, con la ubicación de cada uno (vacía si es válido)
+    """
+    if not isinstance(bank, dict):
+        return ["el banco debe ser un objeto {categoría: [exámenes]}"]
+
+    errors = []
+    seen_ids = {}
+    for category, exams in bank.items():
+        if not isinstance(exams, list):
+            errors.append(f"{category}: debe ser una lista de exámenes")
+            continue
+        for e, exam in enumerate(exams):
+            where = f"{category}[{e}]"
+            if not isinstance(exam, dict):
+                errors.append(f"{where}: el examen debe ser un objeto")
+                continue
+            exam_id = exam.get('id')
+            if not isinstance(exam_id, str) or not exam_id:
+                errors.append(f"{where}: falta 'id'")
+            elif exam_id in seen_ids:
+                errors.append(f"{where}: 'id' repetido ({exam_id}, también en {seen_ids[exam_id]})")
+            else:
+                seen_ids[exam_id] = where
+            for name in ('title', 'difficulty', 'icon'):
+                if not isinstance(exam.get(name), str):
+                    errors.append(f"{where}: '{name}' debe ser un texto")
+            xp = exam.get('xp')
+            if type(xp) is not int or not 0 <= xp < 2 ** 31:
+                errors.append(f"{where}: 'xp' debe ser un entero no negativo")
+
+            questions = exam.get('questions')
+            if not isinstance(questions, list) or not questions:
+                errors.append(f"{where}: 'questions' debe ser una lista no vacía")
+                continue
+            for q, question in enumerate(questions):
+                errors.extend(f"{where}.questions[{q}]: {error}" for error in _validate_question(question))
+    return errors
+
+
+def _validate_question(question: Any) -> List[str]:
+    if not isinstance(question, dict):
+        return ["la pregunta debe ser un objeto"]
+    errors = []
+    if not isinstance(question.get('question'), str) or not question['question'].strip():
+        errors.append("falta el texto de 'question'")
+    for name in ('image', 'explanation'):
+        if name in question and not isinstance(question[name], str):
+            errors.append(f"'{name}' debe ser un texto")
+    options = question.get('options')
+    if not isinstance(options, list) or len(options) < 2 or not all(isinstance(o, str) for o in options):
+        errors.append("'options' debe ser una lista de al menos dos textos")
+        return errors
+    if len(set(options)) != len(options):
+        errors.append("'options' tiene opciones repetidas")
+    if len(options) > 0xFFFF:
+        errors.append("'options' tiene demasiadas opciones")
+    if 'correct' not in question:
+        errors.append("falta 'correct'")
+    elif question['correct'] not in options:
+        errors.append(f"'correct' ({question['correct']!r}) no está en 'options'")
+    return errors
+
+
+class _StringTable:
+    """Textos internados: cada texto distinto recibe un índice"""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.data: List[bytes] = []
+
+    def add(self, text: str) -> int:
+        if text is None:
+            return NONE
+        string_id = self.ids.get(text)
+        if string_id is None:
+            string_id = self.ids[text] = len(self.data)
+            self.data.append(text.encode('utf-8'))
+        return string_id
+
+    def add_extra(self, item: Dict[str, Any], known_fields: Tuple[str, ...]) -> int:
+        extra = {key: value for key, value in item.items() if key not in known_fields}
+        if not extra:
+            return NONE
+        return self.add(json.dumps(extra, ensure_ascii=False, separators=(',', ':'), sort_keys=True))
+
+
+def compile_bank(bank: Dict[str, List[dict]]) -> bytes:
+    """Compila un banco ya validado al formato binario
+
+    Args:
+        bank (Dict): Contenido de exams.json (validado con validate_bank)
+    Returns:
+        bytes: Contenido del archivo compilado
+    """
+    strings = _StringTable()
+    categories, exams, questions, options = bytearray(), bytearray(), bytearray(), bytearray()
+    exam_count = question_count = option_count = 0
+
+    for category_index, (category, category_exams) in enumerate(bank.items()):
+        categories += CATEGORY.pack(strings.add(category), exam_count, len(category_exams))
+        for exam in category_exams:
+            exams += EXAM.pack(
+                strings.add(exam['id']), strings.add(exam['title']), strings.add(exam['difficulty']),
+                strings.add(exam['icon']), strings.add_extra(exam, EXAM_FIELDS),
+                exam['xp'], category_index, question_count, len(exam['questions'])
+            )
+            exam_count += 1
+            for question in exam['questions']:
+                questions += QUESTION.pack(
+                    strings.add(question['question']), strings.add(question.get('image')),
+                    strings.add(question.get('explanation')), strings.add_extra(question, QUESTION_FIELDS),
+                    option_count, len(question['options']), question['options'].index(question['correct'])
+                )
+                question_count += 1
+                for option in question['options']:
+                    options += OPTION.pack(strings.add(option))
+                    option_count += 1
+
+    string_index = bytearray()
+    position = 0
+    for data in strings.data:
+        string_index += STRING_OFFSET.pack(position)
+        position += len(data)
+    string_index += STRING_OFFSET.pack(position)
+
+    sections = [categories, exams, questions, options, string_index]
+    offsets = []
+    position = HEADER.size
+    for section in sections:
+        offsets.append(position)
+        position += len(section)
+    offsets.append(position)  # Textos
+
+    header = HEADER.pack(MAGIC, VERSION, 0, len(bank), exam_count, question_count, option_count,
+                         len(strings.data), *offsets)
+    return b''.join([header, *sections, *strings.data])
+
+
+def compile_file(source: Path, target: Path) -> List[str]:
+    """Valida exams.json y, si es válido, escribe el banco compilado (escritura atómica)
+
+    Returns:
+        List[str]: Errores de validación (si hay errores no se escribe nada)
+    """
+    with open(source, 'r', encoding='utf-8') as f:
+        try:
+            bank = json.load(f)
+        except json.JSONDecodeError as e:
+            return [f"JSON inválido: {e}"]
+    errors = validate_bank(bank)
+    if errors:
+        return errors
+
+    temp_path = target.with_name(target.name + '.tmp')
+    with open(temp_path, 'wb') as f:
+        f.write(compile_bank(bank))
+    os.replace(temp_path, target)
+    return []
+
+
+class CompiledExamBank:
+    """Lector del banco compilado sobre un archivo mapeado en memoria
+
+    Cada examen, pregunta o texto se decodifica por separado en O(1), sin leer
+    el resto del archivo.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < HEADER.size:
+            self.close()
+            raise ExamBankError(f"Archivo compilado inválido: {self.path}")
+        (magic, version, _, self.category_count, self.exam_count, self.question_count, self.option_count,
+         self.string_count, *offsets) = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version > VERSION:
+            self.close()
+            raise ExamBankError(f"Archivo compilado inválido o de una versión más nueva: {self.path}")
+        (self._categories_offset, self._exams_offset, self._questions_offset, self._options_offset,
+         self._string_index_offset, self._strings_offset) = offsets
+        if not self._sections_fit():
+            self.close()
+            raise ExamBankError(f"Archivo compilado truncado o dañado: {self.path}")
+
+    def _sections_fit(self) -> bool:
+        """Comprueba que cada sección tenga el tamaño que indican los contadores y que
+        el archivo llegue hasta el último texto (un archivo truncado no pasa)"""
+        expected = (
+            (self._categories_offset, self.category_count * CATEGORY.size),
+            (self._exams_offset, self.exam_count * EXAM.size),
+            (self._questions_offset, self.question_count * QUESTION.size),
+            (self._options_offset, self.option_count * OPTION.size),
+            (self._string_index_offset, (self.string_count + 1) * STRING_OFFSET.size),
+        )
+        position = HEADER.size
+        for offset, size in expected:
+            if offset != position:
+                return False
+            position += size
+        if self._strings_offset != position or position > len(self._mmap):
+            return False
+        strings_size, = STRING_OFFSET.unpack_from(
+            self._mmap, self._string_index_offset + self.string_count * STRING_OFFSET.size)
+        return self._strings_offset + strings_size == len(self._mmap)
+
+    def close(self):
+        self._mmap.close()
+
+    def string(self, string_id: int) -> str:
+        """Texto internado por su índice (None para NONE)"""
+        if string_id == NONE:
+            return None
+        position = self._string_index_offset + string_id * STRING_OFFSET.size
+        start, = STRING_OFFSET.unpack_from(self._mmap, position)
+        end, = STRING_OFFSET.unpack_from(self._mmap, position + STRING_OFFSET.size)
+        return self._mmap[self._strings_offset + start:self._strings_offset + end].decode('utf-8')
+
+    def _extra(self, string_id: int) -> Dict[str, Any]:
+        return {} if string_id == NONE else json.loads(self.string(string_id))
+
+    def categories(self) -> Iterator[Tuple[str, int, int]]:
+        """Itera (categoría, primer examen, número de exámenes)"""
+        for i in range(self.category_count):
+            name, first, count = CATEGORY.unpack_from(self._mmap, self._categories_offset + i * CATEGORY.size)
+            yield self.string(name), first, count
+
+    def exam_header(self, index: int) -> Tuple[str, Dict[str, Any], int, int]:
+        """Cabecera del examen (categoría, datos sin preguntas, primera pregunta, número de preguntas)"""
+        (id_, title, difficulty, icon, extra, xp, category, first_question,
+         question_count) = EXAM.unpack_from(self._mmap, self._exams_offset + index * EXAM.size)
+        category_name = CATEGORY.unpack_from(self._mmap, self._categories_offset + category * CATEGORY.size)[0]
+        data = {'id': self.string(id_), 'title': self.string(title), 'difficulty': self.string(difficulty),
+                'xp': xp, 'icon': self.string(icon), **self._extra(extra)}
+        return self.string(category_name), data, first_question, question_count
+
+    def question(self, index: int) -> Dict[str, Any]:
+        """Pregunta por su índice global"""
+        text, image, explanation, extra, first_option, option_count, correct = QUESTION.unpack_from(
+            self._mmap, self._questions_offset + index * QUESTION.size)
+        option_ids = struct.unpack_from(f'<{option_count}I', self._mmap,
+                                        self._options_offset + first_option * OPTION.size)
+        options = [self.string(option_id) for option_id in option_ids]
+        question = {'question': self.string(text)}
+        if image != NONE:
+            question['image'] = self.string(image)
+        question['options'] = options
+        question['correct'] = options[correct]
+        if explanation != NONE:
+            question['explanation'] = self.string(explanation)
+        question.update(self._extra(extra))
+        return question
+
+    def exam(self, index: int) -> Dict[str, Any]:
+        """Examen completo con sus preguntas"""
+        _, data, first_question, question_count = self.exam_header(index)
+        data['questions'] = [self.question(first_question + q) for q in range(question_count)]
+        return data
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Valida y compila el banco de exámenes de GeoGrapy")
+    parser.add_argument('source', type=Path, help="Banco de exámenes (exams.json)")
+    parser.add_argument('-o', '--output', type=Path, help="Archivo compilado (por defecto, junto al JSON con extensión .ggb)")
+    parser.add_argument('--check', action='store_true', help="Solo valida, no escribe el archivo compilado")
+    args = parser.parse_args(argv)
+
+    target = args.output or args.source.with_suffix('.ggb')
+    if args.check:
+        with open(args.source, 'r', encoding='utf-8') as f:
+            errors = validate_bank(json.load(f))
+    else:
+        errors = compile_file(args.source, target)
+    for error in errors:
+        print(f"Error: {error}", file=sys.stderr)
+    if errors:
+        print(f"{len(errors)} errores; no se generó el banco compilado", file=sys.stderr)
+        return 1
+    if not args.check:
+        bank = CompiledExamBank(target)
+        print(f"{bank.exam_count} exámenes y {bank.question_count} preguntas compilados en {target}")
+        bank.close()
+    else:
+        print("Banco válido")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
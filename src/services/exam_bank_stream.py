@@ -0,0 +1,168 @@
+"""
+Lectura incremental de bancos de exámenes muy grandes
+
+El banco ({"categoría": [examen, ...], ...}) o un fragmento de una categoría
+([examen, ...]) se recorre en bloques, decodificando
+un examen a la vez con el decodificador JSON en C (raw_decode). De cada examen
+solo se conservan los datos de cabecera, el número de preguntas y la posición
+en bytes del examen dentro del archivo; las preguntas se descartan enseguida.
+
+read_exam_at lee y decodifica únicamente el examen pedido (seek + lectura de su
+tramo), de modo que las preguntas se materializan solo al abrir el examen.
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, TextIO, Tuple
+import json
+import re
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_DECODER = json.JSONDecoder()
+
+
+@dataclass(frozen=True)
+class ExamHeader:
+    """Cabecera de un examen del banco y la ubicación de su contenido en el archivo"""
+    category: str
+    index: int
+    data: Dict[str, Any]  # Campos del examen sin 'questions'
+    question_count: int
+    offset: int
+    length: int
+
+
+class _StreamReader:
+    """Búfer de texto sobre el archivo que recuerda el offset en bytes de cada posición"""
+
+    def __init__(self, file: TextIO, chunk_size: int):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        # Posición conocida (índice en el búfer, offset en bytes) para calcular offsets
+        # en forma incremental: cada carácter se codifica una sola vez
+        self._mark = (0, 0)
+
+    def fill(self, size: int = None) -> bool:
+        """Descarta lo ya consumido y agrega un bloque; False al final del archivo"""
+        if self.eof:
+            return False
+        chunk = self.file.read(size or self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        consumed = self.byte_offset(self.pos)
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        self._mark = (0, consumed)
+        return True
+
+    def byte_offset(self, pos: int) -> int:
+        """Offset en bytes (UTF-8) de una posición del búfer (posiciones crecientes)"""
+        mark_pos, mark_bytes = self._mark
+        offset = mark_bytes + len(self.buffer[mark_pos:pos].encode('utf-8'))
+        self._mark = (pos, offset)
+        return offset
+
+    def peek(self) -> str:
+        """Salta espacios y retorna el siguiente carácter ('' al final)"""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Se esperaba {char!r} y se encontró {found!r} "
+                             f"(byte {self.byte_offset(self.pos)})")
+        self.pos += 1
+
+    def decode(self) -> Tuple[Any, int, int]:
+        """Decodifica el siguiente valor JSON completo
+
+        Returns:
+            Tuple: (valor, offset inicial en bytes, largo en bytes)
+        """
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.pos)
+                break
+            except json.JSONDecodeError:
+                # El valor continúa en el siguiente bloque (los bloques crecen para no
+                # repetir el parseo muchas veces con exámenes grandes)
+                if not self.fill(size):
+                    raise
+                size *= 2
+        start = self.byte_offset(self.pos)
+        self.pos = end
+        return value, start, self.byte_offset(end) - start
+
+
+def _iter_exam_list(reader: _StreamReader, category: str) -> Iterator[ExamHeader]:
+    """Cabeceras de una lista de exámenes [examen, ...] (consume los corchetes)"""
+    reader.expect('[')
+    if reader.peek() == ']':
+        reader.pos += 1
+        return
+    index = 0
+    while True:
+        exam, offset, length = reader.decode()
+        if not isinstance(exam, dict):
+            raise ValueError(f"Se esperaba un examen y se encontró {type(exam).__name__} (byte {offset})")
+        questions = exam.pop('questions', [])
+        yield ExamHeader(category, index, exam, len(questions), offset, length)
+        del questions
+        index += 1
+        if reader.peek() == ',':
+            reader.pos += 1
+            continue
+        reader.expect(']')
+        return
+
+
+def iter_exam_headers(path: Path, chunk_size: int = 1 << 20) -> Iterator[ExamHeader]:
+    """Recorre el banco en flujo y retorna la cabecera de cada examen
+
+    Args:
+        path (Path): Archivo JSON del banco de exámenes
+        chunk_size (int): Caracteres leídos por bloque
+    Returns:
+        Iterator[ExamHeader]: Cabeceras en el orden del archivo
+    """
+    with open(path, 'r', encoding='utf-8') as file:
+        reader = _StreamReader(file, chunk_size)
+        reader.expect('{')
+        if reader.peek() == '}':
+            return
+        while True:
+            category, _, _ = reader.decode()
+            reader.expect(':')
+            yield from _iter_exam_list(reader, category)
+            if reader.peek() == ',':
+                reader.pos += 1
+                continue
+            reader.expect('}')
+            return
+
+
+def iter_shard_headers(path: Path, category: str, chunk_size: int = 1 << 20) -> Iterator[ExamHeader]:
+    """Igual que iter_exam_headers para el fragmento de una categoría ([examen, ...])"""
+    with open(path, 'r', encoding='utf-8') as file:
+        reader = _StreamReader(file, chunk_size)
+        yield from _iter_exam_list(reader, category)
+        if reader.peek() != '':
+            raise ValueError(f"Contenido inesperado después de la lista de exámenes "
+                             f"(byte {reader.byte_offset(reader.pos)})")
+
+
+def read_exam_at(path: Path, offset: int, length: int) -> Dict[str, Any]:
+    """Lee y decodifica solo el examen ubicado en [offset, offset + length)"""
+    with open(path, 'rb') as file:
+        file.seek(offset)
+        return json.loads(file.read(length))
@@ -0,0 +1,61 @@
+from time import perf_counter
+from PyQt6.QtCore import QFileSystemWatcher, QObject, QTimer, pyqtSignal
+from src.services.exam_catalog import ExamCatalog
+
+# Espera tras el último aviso antes de recargar: un guardado suele generar varios
+DEBOUNCE_MS = 20
+
+
+class ExamBankWatcher(QObject):
+    """Vigila los archivos del banco de exámenes y recarga el catálogo en caliente
+
+    Con fragmentos por categoría solo se vuelve a parsear el fragmento que cambió
+    y se emite category_changed para esa categoría. Los archivos reemplazados de
+    forma atómica (escribir y renombrar) dejan de estar vigilados, por lo que tras
+    cada recarga se vuelve a sincronizar la lista de rutas.
+    """
+
+    category_changed = pyqtSignal(str)
+
+    def __init__(self, catalog: ExamCatalog, parent=None):
+        """
+        Args:
+            catalog (ExamCatalog): Catálogo a recargar
+            parent (QObject): Objeto padre
+        """
+        super().__init__(parent)
+        self.catalog = catalog
+        # Milisegundos de la última recarga (parseo incluido)
+        self.last_reload_ms = 0.0
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._schedule_reload)
+        self._watcher.directoryChanged.connect(self._schedule_reload)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(DEBOUNCE_MS)
+        self._timer.timeout.connect(self.reload)
+
+        self._sync_paths()
+
+    def _schedule_reload(self, _path: str):
+        self._timer.start()
+
+    def _sync_paths(self):
+        """Vigila exactamente las rutas que usa el catálogo en este momento"""
+        wanted = {str(path) for path in self.catalog.watched_paths()}
+        watched = set(self._watcher.files()) | set(self._watcher.directories())
+        if watched - wanted:
+            self._watcher.removePaths(list(watched - wanted))
+        if wanted - watched:
+            self._watcher.addPaths(list(wanted - watched))
+
+    def reload(self):
+        """Recarga lo que haya cambiado y avisa por cada categoría recargada"""
+        start = perf_counter()
+        changed = self.catalog.refresh()
+        self.last_reload_ms = (perf_counter() - start) * 1000
+        self._sync_paths()
+        for category in changed:
+            self.category_changed.emit(category)
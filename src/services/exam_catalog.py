@@ -0,0 +1,359 @@
+from dataclasses import dataclass
+from pathlib import Path
+from time import monotonic
+from typing import Any, Dict, List, Tuple
+import json
+import threading
+from src.services.exam_bank_compiler import BANK_READ_ERRORS, CompiledExamBank
+from src.services.exam_bank_stream import iter_exam_headers, iter_shard_headers, read_exam_at
+from src.utils.constants import EXAMS_DATA
+
+# Tamaño a partir del cual el banco se carga en modo diferido (solo cabeceras)
+LAZY_THRESHOLD = 16 * 2 ** 20
+
+
+@dataclass(frozen=True)
+class ExamSummary:
+    """Datos de un examen para listarlo (sin las preguntas)"""
+    id: str
+    category: str
+    title: str
+    difficulty: str
+    xp: int
+    icon: str
+    question_count: int
+
+
+class ExamCatalog:
+    """Catálogo de exámenes en memoria con índices
+
+    - exams.json se parsea una sola vez y se indexa por id, categoría y dificultad
+    - Solo se vuelve a parsear si cambia la fecha de modificación o el tamaño del
+      archivo; esa comprobación (un stat) se hace a lo sumo cada `check_interval`
+      segundos, por lo que cambiar de categoría no hace E/S una vez cargado
+    - Para listar se usan resúmenes (ExamSummary) sin preguntas
+    - Modo diferido (bancos grandes): se leen solo las cabeceras de los exámenes en
+      flujo y las preguntas de un examen se leen del archivo al pedirlo con get_exam
+    - Si existe el banco compilado (exam_bank_compiler) y es más nuevo que el JSON,
+      se usa en su lugar: se mapea en memoria y cada examen se decodifica al pedirlo
+    - Si existe el directorio de fragmentos (un `<categoría>.json` con la lista de
+      exámenes por categoría), se usa en lugar de los anteriores y cada fragmento se
+      vuelve a leer solo cuando cambia, siempre en modo diferido: en memoria quedan
+      solo las cabeceras y las preguntas se leen del fragmento al pedir el examen
+    """
+
+    def __init__(self, path: Path = EXAMS_DATA, check_interval: float = 2.0, lazy: bool = None,
+                 compiled_path: Path = None, shards_dir: Path = None):
+        """
+        Args:
+            path (Path): Archivo JSON del banco de exámenes
+            check_interval (float): Segundos entre comprobaciones de cambios del archivo
+            lazy (bool): Cargar solo cabeceras; None para decidir según el tamaño
+                del archivo (LAZY_THRESHOLD)
+            compiled_path (Path): Banco compilado (por defecto, path con extensión .ggb)
+            shards_dir (Path): Directorio de fragmentos por categoría (por defecto,
+                path sin extensión: src/data/json/exams/)
+        """
+        self.path = Path(path)
+        self.compiled_path = Path(compiled_path) if compiled_path else self.path.with_suffix('.ggb')
+        self.shards_dir = Path(shards_dir) if shards_dir else self.path.with_suffix('')
+        self.check_interval = check_interval
+        self.lazy = lazy
+        self._bank: CompiledExamBank = None
+        self._lock = threading.Lock()
+        self._signature: Tuple = None
+        # Firma del banco compilado que no se pudo leer (se usa el JSON hasta que cambie)
+        self._failed_compiled: Tuple = None
+        # Modo fragmentos: (mtime, tamaño) del archivo de cada categoría
+        self._shard_signatures: Dict[str, Tuple[int, int]] = {}
+        self._next_check = 0.0
+        self._exams: Dict[str, dict] = {}
+        self._by_category: Dict[str, List[ExamSummary]] = {}
+        self._by_difficulty: Dict[str, List[ExamSummary]] = {}
+        # Dónde están las preguntas de cada examen si no están en memoria:
+        # (archivo, offset, largo) en el JSON o fragmento (modo diferido) o índice en
+        # el banco compilado
+        self._locations: Dict[str, Any] = {}
+        # Número de veces que se parseó el archivo
+        self.load_count = 0
+
+    def _ensure_loaded(self) -> List[str]:
+        """Recarga lo que haya cambiado; retorna las categorías recargadas"""
+        now = monotonic()
+        if self._signature is not None and now < self._next_check:
+            return []
+        with self._lock:
+            self._next_check = now + self.check_interval
+            shards = self.shard_paths()
+            if shards:
+                return self._refresh_shards(shards)
+
+            previous = list(self._by_category)
+            stat, compiled_stat = self._stat(self.path), self._stat(self.compiled_path)
+            signature = None
+            if compiled_stat is not None and (stat is None or compiled_stat.st_mtime_ns >= stat.st_mtime_ns):
+                compiled_signature = ('compiled', compiled_stat.st_mtime_ns, compiled_stat.st_size)
+                if compiled_signature == self._signature:
+                    return []
+                if compiled_signature != self._failed_compiled:
+                    if self._load_compiled():
+                        signature = compiled_signature
+                    else:
+                        # Banco compilado dañado: se usa el JSON hasta que se vuelva a compilar
+                        self._failed_compiled = compiled_signature
+            if signature is None:
+                if stat is None:
+                    if self._signature is None:
+                        print(f"Error: No se encontró el archivo {self.path}")
+                        self._signature = ('missing',)
+                    return []
+                signature = ('json', stat.st_mtime_ns, stat.st_size)
+                lazy = self.lazy if self.lazy is not None else stat.st_size >= LAZY_THRESHOLD
+                if signature == self._signature or not (self._load_headers() if lazy else self._load()):
+                    return []
+            self._signature = signature
+            self._shard_signatures = {}
+            return previous + [category for category in self._by_category if category not in previous]
+
+    @staticmethod
+    def _stat(path: Path):
+        try:
+            return path.stat()
+        except FileNotFoundError:
+            return None
+
+    def shard_paths(self) -> Dict[str, Path]:
+        """Fragmentos del directorio de fragmentos por categoría (vacío si no hay)"""
+        try:
+            return {path.stem: path for path in sorted(self.shards_dir.glob('*.json'))}
+        except OSError:
+            return {}
+
+    def watched_paths(self) -> List[Path]:
+        """Archivos en uso y directorios a vigilar para detectar cambios en el banco"""
+        shards = self.shard_paths()
+        if shards:
+            return [self.shards_dir, *shards.values()]
+        files = [path for path in (self.path, self.compiled_path) if path.exists()]
+        return [self.path.parent, *files]
+
+    def _refresh_shards(self, shards: Dict[str, Path]) -> List[str]:
+        """Vuelve a parsear solo los fragmentos que cambiaron (o aparecieron/desaparecieron)"""
+        if self._signature != ('shards',):
+            # Se pasa de un banco único a fragmentos: se descarta lo cargado
+            self._set_indexes({}, {}, {})
+            self._signature = ('shards',)
+            self._shard_signatures = {}
+
+        changed = []
+        for category in [c for c in self._shard_signatures if c not in shards]:
+            del self._shard_signatures[category]
+            self._replace_category(category, {}, {}, [])
+            changed.append(category)
+        for category, path in shards.items():
+            stat = self._stat(path)
+            if stat is None:
+                continue
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if signature == self._shard_signatures.get(category):
+                continue
+            # Se recuerda aunque falle: un fragmento a medio escribir se vuelve a leer
+            # cuando el editor termine de guardarlo (cambia de nuevo la fecha)
+            self._shard_signatures[category] = signature
+            if self._load_shard(category, path):
+                changed.append(category)
+        return changed
+
+    def _load_shard(self, category: str, path: Path) -> bool:
+        """Lee las cabeceras del fragmento de una categoría y reemplaza solo sus entradas
+
+        Las preguntas se decodifican de a un examen y se descartan enseguida: no
+        quedan miles de diccionarios vivos que alarguen las pasadas del recolector.
+        """
+        try:
+            exams, locations, by_category = self._index(
+                (header.category, header.index, header.data, header.question_count,
+                 (path, header.offset, header.length))
+                for header in iter_shard_headers(path, category))
+        except (OSError, ValueError) as e:
+            print(f"Error: No se pudo leer el fragmento {path}: {e}")
+            return False
+        self._replace_category(category, exams, locations, by_category.get(category, []))
+        self.load_count += 1
+        return True
+
+    def _replace_category(self, category: str, exams: Dict[str, dict], locations: Dict[str, Any],
+                          summaries: List[ExamSummary]):
+        exams_by_id = dict(self._exams)
+        locations_by_id = dict(self._locations)
+        for summary in self._by_category.get(category, []):
+            exams_by_id.pop(summary.id, None)
+            locations_by_id.pop(summary.id, None)
+        exams_by_id.update(exams)
+        locations_by_id.update(locations)
+        by_category = dict(self._by_category)
+        if summaries:
+            by_category[category] = summaries
+        else:
+            by_category.pop(category, None)
+        self._set_indexes(exams_by_id, locations_by_id, by_category)
+
+    def _iter_exams(self):
+        """Itera (categoría, índice, examen, número de preguntas, ubicación) con el banco completo"""
+        with open(self.path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+        for category, category_exams in data.items():
+            for index, exam in enumerate(category_exams):
+                yield category, index, exam, len(exam.get('questions', [])), None
+
+    def _iter_exam_headers(self):
+        """Igual que _iter_exams pero en flujo y sin preguntas (modo diferido)"""
+        for header in iter_exam_headers(self.path):
+            yield (header.category, header.index, header.data, header.question_count,
+                   (self.path, header.offset, header.length))
+
+    def _iter_compiled(self, bank: CompiledExamBank):
+        """Igual que _iter_exams pero desde las cabeceras del banco compilado"""
+        for category, first, count in bank.categories():
+            for index in range(count):
+                _, data, _, question_count = bank.exam_header(first + index)
+                yield category, index, data, question_count, first + index
+
+    def _load(self) -> bool:
+        """Parsea el banco completo y reconstruye los índices"""
+        return self._build_indexes(self._iter_exams())
+
+    def _load_headers(self) -> bool:
+        """Lee solo las cabeceras de los exámenes y reconstruye los índices"""
+        return self._build_indexes(self._iter_exam_headers())
+
+    def _load_compiled(self) -> bool:
+        """Mapea el banco compilado y reconstruye los índices desde sus cabeceras"""
+        try:
+            bank = CompiledExamBank(self.compiled_path)
+        except BANK_READ_ERRORS as e:
+            print(f"Error: No se pudo abrir el banco compilado {self.compiled_path}: {e}")
+            return False
+        if not self._build_indexes(self._iter_compiled(bank), bank):
+            bank.close()
+            return False
+        return True
+
+    @staticmethod
+    def _index(entries) -> Tuple[Dict[str, dict], Dict[str, Any], Dict[str, List[ExamSummary]]]:
+        """Construye los exámenes por id, sus ubicaciones y los resúmenes por categoría
+
+        Los exámenes sin preguntas no se indexan: no se pueden rendir.
+        """
+        exams, locations, by_category = {}, {}, {}
+        for category, index, exam, question_count, location in entries:
+            if not question_count:
+                continue
+            exam_id = exam.get('id') or f"{category}_{index}"
+            exams[exam_id] = {**exam, 'id': exam_id, 'category': category}
+            if location is not None:
+                locations[exam_id] = location
+            by_category.setdefault(category, []).append(ExamSummary(
+                id=exam_id,
+                category=category,
+                title=exam.get('title', ''),
+                difficulty=exam.get('difficulty', ''),
+                xp=exam.get('xp', 0),
+                icon=exam.get('icon', ''),
+                question_count=question_count
+            ))
+        return exams, locations, by_category
+
+    def _build_indexes(self, entries, bank: CompiledExamBank = None) -> bool:
+        try:
+            exams, locations, by_category = self._index(entries)
+        except BANK_READ_ERRORS as e:
+            print(f"Error: No se pudo leer el banco de exámenes {bank.path if bank else self.path}: {e}")
+            return False
+        self._set_indexes(exams, locations, by_category, bank)
+        self.load_count += 1
+        return True
+
+    def _set_indexes(self, exams, locations, by_category, bank: CompiledExamBank = None):
+        """Publica los nuevos índices (las consultas en curso siguen usando los anteriores)"""
+        by_difficulty = {}
+        for summaries in by_category.values():
+            for summary in summaries:
+                by_difficulty.setdefault(summary.difficulty, []).append(summary)
+        if self._bank is not None and self._bank is not bank:
+            self._bank.close()
+        self._bank = bank
+        self._exams, self._locations = exams, locations
+        self._by_category, self._by_difficulty = by_category, by_difficulty
+
+    def invalidate(self):
+        """Fuerza a comprobar el archivo en la próxima consulta"""
+        self._next_check = 0.0
+
+    def refresh(self) -> List[str]:
+        """Comprueba ahora los archivos del banco (por ejemplo, al avisar un vigilante)
+
+        Returns:
+            List[str]: Categorías recargadas; con fragmentos, solo las que cambiaron
+        """
+        self.invalidate()
+        return self._ensure_loaded()
+
+    def get_categories(self) -> List[str]:
+        self._ensure_loaded()
+        return list(self._by_category)
+
+    def get_summaries(self, category: str) -> List[ExamSummary]:
+        """Resúmenes de los exámenes de una categoría (sin preguntas)"""
+        self._ensure_loaded()
+        return list(self._by_category.get(category, []))
+
+    def get_summaries_by_difficulty(self, difficulty: str) -> List[ExamSummary]:
+        """Resúmenes de los exámenes con una dificultad ('Fácil', 'Media', ...)"""
+        self._ensure_loaded()
+        return list(self._by_difficulty.get(difficulty, []))
+
+    def get_exam(self, exam_id: str) -> dict:
+        """Examen completo (con preguntas y categoría), o None si no existe
+
+        La lista de preguntas es una copia: ExamWindow la baraja en su lugar. En modo
+        diferido las preguntas se leen del archivo en este momento y con el banco
+        compilado se decodifican solo las de este examen.
+        """
+        self._ensure_loaded()
+        exam = self._exams.get(exam_id)
+        if exam is None:
+            return None
+        if exam_id not in self._locations:
+            return {**exam, 'questions': list(exam.get('questions', []))}
+
+        # La ubicación solo es válida si el archivo no cambió desde que se indexó
+        self.invalidate()
+        self._ensure_loaded()
+        exam, location = self._exams.get(exam_id), self._locations.get(exam_id)
+        if exam is None or location is None:
+            return None
+        try:
+            if self._bank is not None:
+                full_exam = self._bank.exam(location)
+            else:
+                full_exam = read_exam_at(*location)
+        except BANK_READ_ERRORS as e:
+            print(f"Error: No se pudo leer el examen {exam_id}: {e}")
+            return None
+        return {**full_exam, 'id': exam['id'], 'category': exam['category']}
+
+    def get_exams_by_category(self, category: str) -> List[dict]:
+        """Exámenes completos de una categoría"""
+        return [self.get_exam(summary.id) for summary in self.get_summaries(category)]
+
+
+_default_catalog: ExamCatalog = None
+
+
+def get_exam_catalog() -> ExamCatalog:
+    """Catálogo compartido del banco de exámenes de la aplicación"""
+    global _default_catalog
+    if _default_catalog is None:
+        _default_catalog = ExamCatalog()
+    return _default_catalog
@@ -0,0 +1,321 @@
+"""
+Checkpoints de exámenes sin terminar
+
+Cada sesión de examen escribe un archivo pequeño de solo anexado
+(~/.geograpy/checkpoints/<usuario>_<sesión>.checkpoint):
+- Cabecera: resumen del examen (título, categoría, número de preguntas, ...) y
+  la fecha de inicio, para listar las sesiones sin decodificar el examen
+- El examen completo (las preguntas de un repaso o de una práctica generada no
+  se pueden volver a armar)
+- Un registro por respuesta con solo la posición de la pregunta en el examen y
+  la opción elegida: responder cuesta una escritura de unas decenas de bytes,
+  sin reescribir el progreso
+- Al cerrar la ventana sin terminar, un registro con cuántas respuestas ya se
+  guardaron en el repaso espaciado y la selección adaptativa (para no contarlas
+  dos veces al continuar)
+
+Al terminar el examen el archivo se borra; los que quedan son sesiones que se
+pueden continuar. Tras un cierre abrupto se descarta el registro final
+incompleto, como en la bitácora del progreso. Los resúmenes se guardan en
+memoria por archivo (fecha de modificación y tamaño), así listar las sesiones
+solo vuelve a leer los checkpoints que cambiaron.
+
+Formato de registro: [largo u32][crc32 u32][JSON compacto]
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import json
+import os
+from src.services.progress_journal import pack_record, read_payloads, read_records
+
+# Prefijo del id de los resúmenes de sesiones sin terminar ('continuar:<sesión>')
+RESUME_EXAM_PREFIX = 'continuar:'
+CHECKPOINT_SUFFIX = '.checkpoint'
+
+
+@dataclass
+class SavedSession:
+    """Sesión de examen sin terminar leída de su checkpoint"""
+    user_id: str
+    session_id: str
+    exam_data: Dict[str, Any]
+    started: str
+    # (posición de la pregunta en exam_data['questions'], opción elegida), en orden
+    answers: List[Tuple[int, str]] = field(default_factory=list)
+    # Respuestas ya guardadas en el repaso espaciado y la selección adaptativa
+    learned: int = 0
+    # Bytes válidos del archivo (lo que sigue es un registro incompleto)
+    size: int = 0
+
+    @property
+    def total(self) -> int:
+        return len(self.exam_data['questions'])
+
+
+@dataclass
+class CheckpointSummary:
+    """Resumen de una sesión sin terminar (sin las preguntas del examen)"""
+    session_id: str
+    title: str
+    category: str
+    difficulty: str
+    xp: int
+    icon: str
+    total: int
+    started: str = ''
+    answered: int = 0
+
+
+def _exam_summary(exam_data: dict) -> Dict[str, Any]:
+    """Campos de la cabecera del checkpoint"""
+    return {
+        'title': exam_data.get('title', ''),
+        'category': exam_data.get('category', ''),
+        'difficulty': exam_data.get('difficulty', 'Media'),
+        'xp': exam_data.get('xp', 0),
+        'icon': exam_data.get('icon') or '',
+        'total': len(exam_data['questions'])
+    }
+
+
+class ExamCheckpoint:
+    """Checkpoint abierto de una sesión: cada registro es una sola escritura al final del archivo"""
+
+    def __init__(self, path: Path, session_id: str, fsync: bool = False, answers: int = 0):
+        self.path = Path(path)
+        self.session_id = session_id
+        self.fsync = fsync
+        self.answers = answers
+        # Sin búfer: cada registro llega al sistema operativo con una única llamada write
+        self._file = open(self.path, 'ab', buffering=0)
+
+    def _write(self, *records: Dict[str, Any]) -> bool:
+        try:
+            self._file.write(b''.join(pack_record(record) for record in records))
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            return True
+        except (OSError, ValueError) as e:
+            print(f"Error al guardar el checkpoint del examen: {e}")
+            return False
+
+    def append_answer(self, index: int, selected: str) -> bool:
+        """Anexa una respuesta: posición de la pregunta en el examen y opción elegida"""
+        self.answers += 1
+        return self._write({'i': index, 'a': selected})
+
+    def mark_learned(self, now: datetime = None) -> bool:
+        """Registra que las respuestas hasta ahora ya están guardadas en el estado de aprendizaje"""
+        return self._write({'learned': self.answers, 'time': str(now or datetime.now())})
+
+    def close(self):
+        self._file.close()
+
+    def discard(self):
+        """Cierra y borra el checkpoint (el examen terminó)"""
+        self.close()
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Error al borrar el checkpoint del examen: {e}")
+
+
+class ExamCheckpointStore:
+    """Checkpoints de las sesiones de examen de cada usuario
+
+    Sin fsync por defecto: lo escrito sobrevive a un cierre abrupto de la
+    aplicación (queda en la caché del sistema operativo) y responder no espera
+    al disco; ante un corte de luz se pueden perder las últimas respuestas.
+    """
+
+    def __init__(self, save_dir: Path, fsync: bool = False):
+        self.save_dir = Path(save_dir)
+        self.save_dir.mkdir(parents=True, exist_ok=True)
+        self.fsync = fsync
+        # Resumen de cada archivo: (fecha de modificación, tamaño, resumen o None si no es válido)
+        self._summaries: Dict[Path, Tuple[int, int, Optional[CheckpointSummary]]] = {}
+
+    def get_checkpoint_path(self, user_id: str, session_id: str) -> Path:
+        return self.save_dir / f"{user_id}_{session_id}{CHECKPOINT_SUFFIX}"
+
+    def create(self, user_id: str, exam_data: dict, now: datetime = None) -> ExamCheckpoint:
+        """Empieza el checkpoint de una sesión nueva escribiendo su cabecera"""
+        now = now or datetime.now()
+        session_id = now.strftime('%Y%m%d%H%M%S%f')
+        path = self.get_checkpoint_path(user_id, session_id)
+        while path.exists():
+            session_id = str(int(session_id) + 1)
+            path = self.get_checkpoint_path(user_id, session_id)
+        checkpoint = ExamCheckpoint(path, session_id, self.fsync)
+        checkpoint._write({'summary': _exam_summary(exam_data), 'started': str(now)}, {'exam': exam_data})
+        return checkpoint
+
+    def load(self, user_id: str, session_id: str) -> Optional[SavedSession]:
+        """Lee una sesión guardada
+
+        Returns:
+            SavedSession: La sesión, o None si no existe, no tiene cabecera o no tiene respuestas
+        """
+        path = self.get_checkpoint_path(user_id, session_id)
+        saved = None
+        started = None
+        seen = set()
+        try:
+            for end, record in read_records(path):
+                if saved is None:
+                    if 'summary' in record and started is None:
+                        started = record.get('started', '')
+                        continue
+                    if 'exam' not in record:
+                        break
+                    saved = SavedSession(user_id, session_id, record['exam'],
+                                         record.get('started', started or ''), size=end)
+                elif 'learned' in record:
+                    saved.learned = record['learned']
+                else:
+                    index = record['i']
+                    if not 0 <= index < saved.total or index in seen:
+                        break
+                    seen.add(index)
+                    saved.answers.append((index, record['a']))
+                saved.size = end
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Error al leer el checkpoint del examen {path.name}: {e}")
+        if saved is None or not saved.answers:
+            return None
+        return saved
+
+    def _session_paths(self, user_id: str) -> List[Tuple[str, Path]]:
+        """(sesión, archivo) de los checkpoints del usuario, del más reciente al más antiguo"""
+        prefix = f"{user_id}_"
+        sessions = []
+        for path in sorted(self.save_dir.glob(f"{prefix}*{CHECKPOINT_SUFFIX}"), reverse=True):
+            session_id = path.name[len(prefix):-len(CHECKPOINT_SUFFIX)]
+            if session_id.isdigit():
+                sessions.append((session_id, path))
+        return sessions
+
+    def _summarize(self, session_id: str, path: Path) -> Optional[CheckpointSummary]:
+        """Lee la cabecera y cuenta las respuestas válidas sin decodificar el examen
+
+        Los checkpoints anteriores a la cabecera con resumen se leen completos.
+        """
+        summary = None
+        total = 0
+        has_header = False
+        seen = set()
+        try:
+            for position, (_, payload) in enumerate(read_payloads(path)):
+                if position == 0:
+                    record = json.loads(payload)
+                    if 'summary' in record:
+                        has_header = True
+                        summary = CheckpointSummary(session_id, started=record.get('started', ''),
+                                                    **record['summary'])
+                    elif 'exam' in record:
+                        summary = CheckpointSummary(session_id, started=record.get('started', ''),
+                                                    **_exam_summary(record['exam']))
+                    else:
+                        return None
+                    total = summary.total
+                    continue
+                if position == 1 and has_header:
+                    # El examen completo: no hace falta para el resumen
+                    continue
+                record = json.loads(payload)
+                if 'learned' in record:
+                    continue
+                index = record['i']
+                if not 0 <= index < total or index in seen:
+                    break
+                seen.add(index)
+                summary.answered += 1
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Error al leer el checkpoint del examen {path.name}: {e}")
+        return summary
+
+    def summaries(self, user_id: str) -> List[CheckpointSummary]:
+        """Resúmenes de las sesiones sin terminar del usuario (con al menos una respuesta),
+        de la más reciente a la más antigua
+
+        Solo se vuelven a leer los checkpoints que cambiaron desde la última vez.
+        """
+        result = []
+        current = set()
+        for session_id, path in self._session_paths(user_id):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            current.add(path)
+            cached = self._summaries.get(path)
+            if cached is None or cached[:2] != (stat.st_mtime_ns, stat.st_size):
+                cached = self._summaries[path] = (stat.st_mtime_ns, stat.st_size, self._summarize(session_id, path))
+            summary = cached[2]
+            if summary is not None and summary.answered:
+                result.append(summary)
+        # Se olvidan los checkpoints borrados (exámenes terminados)
+        prefix = f"{user_id}_"
+        for path in [p for p in self._summaries if p.name.startswith(prefix) and p not in current]:
+            del self._summaries[path]
+        return result
+
+    def unfinished(self, user_id: str) -> List[SavedSession]:
+        """Sesiones sin terminar del usuario (completas), de la más reciente a la más antigua"""
+        sessions = []
+        for session_id, _ in self._session_paths(user_id):
+            saved = self.load(user_id, session_id)
+            if saved is not None:
+                sessions.append(saved)
+        return sessions
+
+    def remove_empty(self, user_id: str) -> int:
+        """Borra los checkpoints sin ninguna respuesta válida (se llama una vez al iniciar)
+
+        Returns:
+            int: Número de checkpoints borrados
+        """
+        removed = 0
+        for session_id, path in self._session_paths(user_id):
+            summary = self._summarize(session_id, path)
+            if summary is not None and summary.answered:
+                continue
+            try:
+                path.unlink()
+                removed += 1
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Error al borrar el checkpoint del examen: {e}")
+            self._summaries.pop(path, None)
+        return removed
+
+    def reopen(self, saved: SavedSession) -> ExamCheckpoint:
+        """Vuelve a abrir el checkpoint de una sesión para seguir anexando respuestas
+
+        Se descarta antes el registro final incompleto, si lo hay.
+        """
+        path = self.get_checkpoint_path(saved.user_id, saved.session_id)
+        if path.exists() and path.stat().st_size > saved.size:
+            with open(path, 'r+b') as f:
+                f.truncate(saved.size)
+        return ExamCheckpoint(path, saved.session_id, self.fsync, answers=len(saved.answers))
+
+
+_default_store: ExamCheckpointStore = None
+
+
+def get_checkpoint_store() -> ExamCheckpointStore:
+    """Checkpoints compartidos de la aplicación (~/.geograpy/checkpoints)"""
+    global _default_store
+    if _default_store is None:
+        _default_store = ExamCheckpointStore(Path.home() / '.geograpy' / 'checkpoints')
+    return _default_store
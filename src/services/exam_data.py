@@ -1,5 +1,4 @@
-from src.utils.constants import EXAMS_DATA
-import json
+from src.services.exam_catalog import get_exam_catalog
 
 def get_exams_by_category(categoria: str) -> list:
     """Obtiene los exámenes de una categoría
@@ -10,10 +9,16 @@ def get_exams_by_category(categoria: str) -> list:
     Returns:
         list: Lista de exámenes de la categoría
     """
-    try:
-        with open(EXAMS_DATA, 'r', encoding='utf-8') as file:
-            exams = json.load(file)
-            return exams.get(categoria, [])
-    except FileNotFoundError:
-        print(f"Error: No se encontró el archivo {EXAMS_DATA}")
-        return []
\ No newline at end of file
+    return get_exam_catalog().get_exams_by_category(categoria)
+
+
+def get_exam_by_id(exam_id: str) -> dict:
+    """Obtiene un examen por su identificador
+
+    Args:
+        exam_id (str): Identificador del examen (campo 'id')
+
+    Returns:
+        dict: Datos del examen con su categoría, o None si no existe
+    """
+    return get_exam_catalog().get_exam(exam_id)
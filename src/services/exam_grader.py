@@ -0,0 +1,215 @@
+"""
+Corrección masiva de hojas de respuesta (sin interfaz gráfica)
+
+Permite corregir versiones en papel de los exámenes con las mismas reglas de la
+aplicación: el puntaje se calcula como en ExamScore y la XP con
+ImprovedLevelSystem.calculate_exam_rewards.
+
+Formatos de entrada:
+- CSV: primera columna el identificador del estudiante y luego una columna por
+  pregunta, en el orden de exams.json (la primera fila es el encabezado)
+- JSONL: una línea por hoja {"student_id": "...", "answers": ["...", ...]}
+
+Uso:
+    python -m src.services.exam_grader paises_america respuestas.csv -o resultados.csv
+"""
+from dataclasses import dataclass, asdict
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, TextIO, Tuple
+import argparse
+import csv
+import json
+import sys
+import numpy as np
+from src.services.exam_data import get_exam_by_id
+from src.services.exam_score import ExamScore
+from src.services.level_system import AbstractLevelSystem, ExamRewards, ImprovedLevelSystem
+
+
+@dataclass
+class GradedSheet:
+    """Clase para almacenar el resultado de una hoja de respuestas"""
+    student_id: str
+    correct_answers: int
+    total_questions: int
+    accuracy: float
+    base_xp: int
+    completion_bonus: int
+    accuracy_bonus: int
+    total_xp: int
+
+
+RESULT_FIELDS = list(GradedSheet.__dataclass_fields__)
+
+
+class ExamGrader:
+    """Corrige hojas de respuesta de un examen por bloques vectorizados
+
+    - Las respuestas de cada bloque se codifican como índices de opción en una
+      matriz NumPy y se comparan de una sola vez con la clave de respuestas
+    - Como la XP base y el total de preguntas son fijos por examen, las
+      recompensas solo dependen del número de respuestas correctas: se calculan
+      una vez por cada valor posible (0..n) con el sistema de niveles
+    """
+
+    def __init__(self, exam_data: dict, level_system: AbstractLevelSystem = None,
+                 chunk_size: int = 4096):
+        self.exam_data = exam_data
+        self.level_system = level_system or ImprovedLevelSystem()
+        self.chunk_size = chunk_size
+
+        questions = exam_data['questions']
+        self.total_questions = len(questions)
+        if self.total_questions == 0:
+            raise ValueError(f"El examen {exam_data.get('id')} no tiene preguntas")
+
+        # Código de cada opción por pregunta; las respuestas desconocidas valen -1
+        self._option_codes: List[Dict[str, int]] = [
+            {option: code for code, option in enumerate(question['options'])}
+            for question in questions
+        ]
+        self._answer_key = np.array(
+            [codes.get(question['correct'], -2) for codes, question in zip(self._option_codes, questions)],
+            dtype=np.int16
+        )
+        self._rewards = self._build_rewards_table()
+
+    def _build_rewards_table(self) -> List[ExamRewards]:
+        """Recompensas para cada número posible de respuestas correctas"""
+        difficulty_multiplier = self.level_system.difficulty.reward_multiplier
+        table = []
+        for correct in range(self.total_questions + 1):
+            score = ExamScore(correct, self.total_questions, self.exam_data['xp'])
+            adjusted_score = score * difficulty_multiplier
+            table.append(self.level_system.calculate_exam_rewards(
+                exam_base_xp=adjusted_score.xp_earned,
+                correct_answers=score.correct_answers,
+                total_questions=score.total_questions
+            ))
+        return table
+
+    def _encode(self, answers: List[str]) -> List[int]:
+        codes = [-1] * self.total_questions
+        for i, (answer, option_codes) in enumerate(zip(answers, self._option_codes)):
+            codes[i] = option_codes.get((answer or '').strip(), -1)
+        return codes
+
+    def grade_chunk(self, sheets: List[Tuple[str, List[str]]]) -> List[GradedSheet]:
+        """Corrige un bloque de hojas (student_id, respuestas)"""
+        if not sheets:
+            return []
+        encoded = np.array([self._encode(answers) for _, answers in sheets], dtype=np.int16)
+        correct_counts = (encoded == self._answer_key).sum(axis=1)
+
+        results = []
+        for (student_id, _), correct in zip(sheets, correct_counts.tolist()):
+            rewards = self._rewards[correct]
+            results.append(GradedSheet(
+                student_id=student_id,
+                correct_answers=correct,
+                total_questions=self.total_questions,
+                accuracy=rewards.accuracy,
+                base_xp=rewards.base_xp,
+                completion_bonus=rewards.completion_bonus,
+                accuracy_bonus=rewards.accuracy_bonus,
+                total_xp=rewards.total_xp
+            ))
+        return results
+
+    def grade(self, sheets: Iterable[Tuple[str, List[str]]]) -> Iterator[GradedSheet]:
+        """Corrige un flujo de hojas de respuesta sin cargarlo completo en memoria"""
+        sheets = iter(sheets)
+        while True:
+            chunk = list(islice(sheets, self.chunk_size))
+            if not chunk:
+                return
+            yield from self.grade_chunk(chunk)
+
+
+def read_csv_sheets(stream: TextIO) -> Iterator[Tuple[str, List[str]]]:
+    """Lee hojas de respuesta en CSV (student_id, respuesta_1, ..., respuesta_n)"""
+    reader = csv.reader(stream)
+    next(reader, None)  # Encabezado
+    for row in reader:
+        if row:
+            yield row[0], row[1:]
+
+
+def read_jsonl_sheets(stream: TextIO) -> Iterator[Tuple[str, List[str]]]:
+    """Lee hojas de respuesta en JSONL ({"student_id": ..., "answers": [...]})"""
+    for line in stream:
+        line = line.strip()
+        if line:
+            sheet = json.loads(line)
+            yield str(sheet['student_id']), sheet.get('answers', [])
+
+
+def _as_row(result: GradedSheet) -> tuple:
+    """Equivalente a dataclasses.astuple sin copias profundas"""
+    return tuple(getattr(result, field) for field in RESULT_FIELDS)
+
+
+def write_csv_results(results: Iterable[GradedSheet], stream: TextIO) -> int:
+    """Escribe los resultados en CSV a medida que se generan"""
+    writer = csv.writer(stream)
+    writer.writerow(RESULT_FIELDS)
+    count = 0
+    for result in results:
+        writer.writerow(_as_row(result))
+        count += 1
+    return count
+
+
+def write_jsonl_results(results: Iterable[GradedSheet], stream: TextIO) -> int:
+    """Escribe los resultados en JSONL a medida que se generan"""
+    count = 0
+    for result in results:
+        stream.write(json.dumps(asdict(result), ensure_ascii=False) + '\n')
+        count += 1
+    return count
+
+
+def _detect_format(path: str, explicit: str = None) -> str:
+    if explicit:
+        return explicit
+    return 'jsonl' if path.endswith(('.jsonl', '.ndjson')) else 'csv'
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Corrige hojas de respuesta de un examen de GeoGrapy")
+    parser.add_argument('exam_id', help="Identificador del examen en exams.json")
+    parser.add_argument('answers', help="Archivo de respuestas (CSV o JSONL), '-' para stdin")
+    parser.add_argument('-o', '--output', default='-', help="Archivo de resultados, '-' para stdout")
+    parser.add_argument('-d', '--difficulty', default='normal',
+                        choices=list(ImprovedLevelSystem.DIFFICULTIES))
+    parser.add_argument('--input-format', choices=['csv', 'jsonl'])
+    parser.add_argument('--output-format', choices=['csv', 'jsonl'])
+    args = parser.parse_args(argv)
+
+    exam_data = get_exam_by_id(args.exam_id)
+    if exam_data is None:
+        print(f"Error: No existe el examen {args.exam_id}", file=sys.stderr)
+        return 1
+
+    grader = ExamGrader(exam_data, ImprovedLevelSystem(difficulty=args.difficulty))
+    input_format = _detect_format(args.answers, args.input_format)
+    output_format = _detect_format(args.output, args.output_format)
+
+    source = sys.stdin if args.answers == '-' else open(args.answers, 'r', encoding='utf-8', newline='')
+    target = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8', newline='')
+    try:
+        read = read_jsonl_sheets if input_format == 'jsonl' else read_csv_sheets
+        write = write_jsonl_results if output_format == 'jsonl' else write_csv_results
+        count = write(grader.grade(read(source)), target)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+    print(f"{count} hojas corregidas", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,382 @@
+"""
+Sesión de examen sin interfaz gráfica
+
+ExamSession tiene todo el flujo de un examen: orden de las preguntas (mezcla y
+selección adaptativa), corrección de cada respuesta, puntaje, recompensas y
+actualización del progreso. No depende de Qt, así que se puede usar desde otra
+interfaz, simular o medir; ExamWindow solo muestra su estado.
+
+Estados:
+    QUESTION --answer()--> ANSWERED --next()--> QUESTION (quedan preguntas)
+                                             \\-> COMPLETE --finish()--> FINISHED
+reset() vuelve a empezar desde cualquier estado.
+
+Con un ExamCheckpointStore cada respuesta se anexa al checkpoint de la sesión;
+restore() continúa una sesión sin terminar a partir de su checkpoint.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import random
+from src.services.adaptive_selection import AdaptiveSelector, DIFFICULTY_RATINGS, INITIAL_RATING
+from src.services.exam_checkpoint import ExamCheckpoint, ExamCheckpointStore, SavedSession
+from src.services.daily_xp import DailyXpSeries, PROGRESS_KEY as DAILY_XP_KEY
+from src.services.exam_score import ExamScore
+from src.services.level_system import (AbstractLevelSystem, AbstractProgressPersistence, DEFAULT_USER_ID,
+                                       ExamRewards, LevelProgress, LevelRewards)
+from src.services.spaced_repetition import REVIEW_EXAM_ID, ReviewStateStore, question_key
+
+QUESTION = 'question'
+ANSWERED = 'answered'
+COMPLETE = 'complete'
+FINISHED = 'finished'
+
+
+@dataclass
+class AnswerResult:
+    """Resultado de responder una pregunta"""
+    question: Dict[str, Any]
+    selected: str
+    correct_answer: str
+    is_correct: bool
+    explanation: str
+    correct_answers: int  # Aciertos hasta ahora
+    is_last: bool
+
+
+@dataclass
+class ExamResult:
+    """Resultado de un examen terminado (lo que se guardó y lo que se muestra)"""
+    correct_answers: int
+    total_questions: int
+    accuracy: float
+    rewards: ExamRewards
+    old_level: LevelProgress
+    new_level: LevelProgress
+    # Recompensas desbloqueadas al subir de nivel (None si no subió)
+    level_up_rewards: Optional[LevelRewards]
+    # Frente al intento anterior: 1 mejor, 0 igual, -1 peor, None si no hay intento anterior
+    comparison: Optional[int]
+    attempt: Dict[str, Any] = field(default_factory=dict)
+    progress_data: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def leveled_up(self) -> bool:
+        return self.new_level.level > self.old_level.level
+
+
+class ExamSession:
+    """Máquina de estados de un examen: answer(), next() y finish()"""
+
+    def __init__(self, exam_data: dict, level_system: AbstractLevelSystem,
+                 progress_persistence: AbstractProgressPersistence,
+                 review_store: ReviewStateStore = None, adaptive_selector: AdaptiveSelector = None,
+                 user_id: str = DEFAULT_USER_ID, seed: int = None,
+                 checkpoint_store: ExamCheckpointStore = None):
+        """
+        Args:
+            exam_data (dict): Examen con el formato de exams.json
+            level_system (AbstractLevelSystem): Sistema de niveles para las recompensas
+            progress_persistence (AbstractProgressPersistence): Donde se guarda el progreso
+            review_store (ReviewStateStore): Repaso espaciado (None: no se registra)
+            adaptive_selector (AdaptiveSelector): Selección adaptativa (None: orden aleatorio)
+            user_id (str): Usuario
+            seed (int): Semilla para el orden de las preguntas
+            checkpoint_store (ExamCheckpointStore): Checkpoints de las respuestas (None: no se guardan)
+        """
+        if not exam_data.get('questions'):
+            raise ValueError(f"El examen {exam_data.get('id')} no tiene preguntas")
+        self.exam_data = exam_data
+        self.level_system = level_system
+        self.progress_persistence = progress_persistence
+        self.review_store = review_store
+        self.adaptive_selector = adaptive_selector
+        self.user_id = user_id
+        self._random = random.Random(seed)
+        # Copia: el orden de la sesión no debe alterar el examen original
+        self.questions: List[Dict[str, Any]] = list(exam_data['questions'])
+        # Posición de cada pregunta en el examen original (lo que se guarda en el checkpoint)
+        self._exam_positions = {id(question): i for i, question in enumerate(exam_data['questions'])}
+        self.checkpoint_store = checkpoint_store
+        self.checkpoint: ExamCheckpoint = None
+
+        self.review_scheduler = review_store.get_scheduler(user_id) if review_store is not None else None
+        # Examen del catálogo del que salen las preguntas (el repaso conserva el de cada una)
+        self._review_source = exam_data.get('id') if exam_data.get('id') != REVIEW_EXAM_ID else None
+
+        # Cargar último resultado del usuario para este examen
+        self.current_progress = progress_persistence.load_progress(user_id)
+        self.last_exam_score = None
+        if self.current_progress:
+            self.last_exam_score = ExamScore(
+                self.current_progress.get('last_exam_score', 0),
+                self.current_progress.get('last_exam_total', 1),
+                self.current_progress.get('last_exam_xp', 0)
+            )
+
+        # Selección adaptativa: cada pregunta se elige según la habilidad estimada
+        self.default_rating = DIFFICULTY_RATINGS.get(exam_data.get('difficulty'), INITIAL_RATING)
+        if adaptive_selector is not None:
+            adaptive_selector.ensure_user(
+                user_id,
+                level=self.current_progress.get('level', 1),
+                accuracy=(self.current_progress.get('average_accuracy')
+                          if self.current_progress.get('exams_completed') else None)
+            )
+        self.reset()
+
+    @property
+    def total(self) -> int:
+        return len(self.questions)
+
+    @property
+    def question(self) -> Dict[str, Any]:
+        """Pregunta actual"""
+        return self.questions[self.position]
+
+    @property
+    def finished(self) -> bool:
+        return self.state == FINISHED
+
+    def reset(self):
+        """Empieza de nuevo: puntaje a cero y preguntas mezcladas"""
+        if self.checkpoint is not None:
+            # Las respuestas anteriores ya no se pueden continuar
+            self.checkpoint.discard()
+            self.checkpoint = None
+        self.position = 0
+        self.score = ExamScore(correct_answers=0, total_questions=len(self.questions),
+                               xp_earned=self.exam_data['xp'])
+        self._random.shuffle(self.questions)
+        if self.adaptive_selector is not None:
+            # Las preguntas se identifican en el índice por su posición en la lista
+            self.adaptive_index = self.adaptive_selector.build_index(self.questions, self.default_rating)
+            self._place_next_question()
+        self.state = QUESTION
+
+    def _place_next_question(self):
+        """Pone en la posición actual la pregunta más cercana a la tasa de acierto objetivo"""
+        position = self.adaptive_selector.pick(self.adaptive_index, self.user_id)
+        if position is None:
+            return
+        # Se intercambian las posiciones también en el índice
+        current = self.position
+        if position != current:
+            self.questions[current], self.questions[position] = self.questions[position], self.questions[current]
+            self.adaptive_index.remove(current)
+            self.adaptive_index.add(position, self.adaptive_selector.question_rating(
+                self.questions[position], self.default_rating))
+
+    def upcoming(self, count: int) -> List[Dict[str, Any]]:
+        """Preguntas que probablemente sigan (para precargar sus imágenes)"""
+        if self.adaptive_selector is None:
+            return self.questions[self.position + 1:self.position + 1 + count]
+        return [self.questions[position] for position in
+                self.adaptive_selector.candidates(self.adaptive_index, self.user_id, count)]
+
+    def answer(self, selected_option: str) -> AnswerResult:
+        """Corrige la respuesta a la pregunta actual y la registra para el repaso y la
+        selección adaptativa"""
+        if self.state != QUESTION:
+            raise ValueError(f"No se puede responder en el estado '{self.state}'")
+        question = self.questions[self.position]
+        correct_answer = question['correct']
+        is_correct = selected_option == correct_answer
+        if is_correct:
+            self.score += 1
+
+        self._record_learning(question, is_correct)
+
+        if self.checkpoint_store is not None:
+            # Una escritura pequeña al final del checkpoint (el primero se crea con la primera respuesta)
+            if self.checkpoint is None:
+                self.checkpoint = self.checkpoint_store.create(self.user_id, self.exam_data)
+            self.checkpoint.append_answer(self._exam_positions[id(question)], selected_option)
+
+        self.state = ANSWERED
+        return AnswerResult(question, selected_option, correct_answer, is_correct,
+                            question.get('explanation', ''), self.score.correct_answers,
+                            self.position == len(self.questions) - 1)
+
+    def _record_learning(self, question: Dict[str, Any], is_correct: bool):
+        """Registra la respuesta para el repaso espaciado y la selección adaptativa"""
+        if self.review_scheduler is not None or self.adaptive_selector is not None:
+            key = question_key(question)
+            if self.review_scheduler is not None:
+                self.review_scheduler.review(question, is_correct, key=key, source=self._review_source)
+            if self.adaptive_selector is not None:
+                self.adaptive_selector.record_answer(self.user_id, question, is_correct,
+                                                     self.default_rating, key=key)
+
+    def restore(self, saved: SavedSession):
+        """Continúa una sesión sin terminar: repite sus respuestas y sigue anexando a su checkpoint
+
+        El examen de la sesión debe ser saved.exam_data. Las respuestas que todavía no se
+        guardaron en el estado de aprendizaje (cierre abrupto) se registran ahora.
+        """
+        questions = saved.exam_data['questions']
+        if len(questions) != len(self.questions) or any(
+                id(questions[index]) not in self._exam_positions for index, _ in saved.answers):
+            raise ValueError(f"La sesión guardada {saved.session_id} no corresponde a este examen")
+        self.reset()
+
+        # Primero las preguntas respondidas, en el orden en que se respondieron
+        answered = [questions[index] for index, _ in saved.answers]
+        answered_ids = {id(question) for question in answered}
+        self.questions = answered + [question for question in self.questions if id(question) not in answered_ids]
+        for n, (question, (_, selected)) in enumerate(zip(answered, saved.answers)):
+            is_correct = selected == question['correct']
+            if is_correct:
+                self.score += 1
+            if n >= saved.learned:
+                self._record_learning(question, is_correct)
+
+        if self.adaptive_selector is not None:
+            self.adaptive_index = self.adaptive_selector.build_index(self.questions, self.default_rating)
+            for position in range(len(answered)):
+                self.adaptive_index.remove(position)
+        if len(answered) >= len(self.questions):
+            # Se respondió todo pero no se llegó a guardar el resultado
+            self.position = len(self.questions) - 1
+            self.state = COMPLETE
+        else:
+            self.position = len(answered)
+            if self.adaptive_selector is not None:
+                self._place_next_question()
+            self.state = QUESTION
+        if self.checkpoint_store is not None:
+            self.checkpoint = self.checkpoint_store.reopen(saved)
+
+    def next(self) -> Optional[Dict[str, Any]]:
+        """Pasa a la siguiente pregunta
+
+        Returns:
+            Dict: La nueva pregunta actual, o None si no quedan (el examen está completo)
+        """
+        if self.state != ANSWERED:
+            raise ValueError(f"No se puede avanzar en el estado '{self.state}'")
+        if self.position + 1 >= len(self.questions):
+            self.state = COMPLETE
+            return None
+        self.position += 1
+        if self.adaptive_selector is not None:
+            self._place_next_question()
+        self.state = QUESTION
+        return self.questions[self.position]
+
+    def finish(self, now: datetime = None) -> ExamResult:
+        """Calcula las recompensas y guarda el intento y el progreso del usuario"""
+        if self.state != COMPLETE:
+            raise ValueError(f"No se puede terminar el examen en el estado '{self.state}'")
+        now = now or datetime.now()
+        score = self.score
+
+        # Aplicar multiplicador de dificultad a la puntuación
+        adjusted_score = score * self.level_system.difficulty.reward_multiplier
+
+        # Comparar con el último intento
+        comparison = None
+        if self.last_exam_score:
+            comparison = 1 if score > self.last_exam_score else 0 if score == self.last_exam_score else -1
+
+        rewards = self.level_system.calculate_exam_rewards(
+            exam_base_xp=adjusted_score.xp_earned,
+            correct_answers=score.correct_answers,
+            total_questions=score.total_questions
+        )
+
+        old_total_xp = self.current_progress.get('total_xp', 0)
+        new_total_xp = old_total_xp + rewards.total_xp
+        old_level = self.level_system.get_level_progress(old_total_xp)
+        new_level = self.level_system.get_level_progress(new_total_xp)
+
+        # Calcular nueva precisión media
+        accuracy = score.get_accuracy()
+        total_exams = self.current_progress.get('exams_completed', 0)
+        if total_exams == 0:
+            new_accuracy = accuracy
+        else:
+            old_total_accuracy = self.current_progress.get('average_accuracy', 0) * (total_exams - 1)
+            new_accuracy = (old_total_accuracy + accuracy) / total_exams
+
+        level_up_rewards = None
+        if new_level.level > old_level.level:
+            # Solo las recompensas desbloqueadas en esta subida de nivel
+            level_up_rewards = self.level_system.get_rewards_unlocked_between(old_level.level, new_level.level)
+
+        date = str(now)
+        progress_data = {
+            'total_xp': new_total_xp,
+            'level': new_level.level,
+            'last_exam_date': date,
+            'exams_completed': total_exams + 1,
+            'average_accuracy': new_accuracy,
+            'last_accuracy': accuracy,
+            'last_exam_score': score.correct_answers,
+            'last_exam_total': score.total_questions,
+            'last_exam_xp': adjusted_score.xp_earned,
+            'last_session': date,
+            'difficulty': self.current_progress.get('difficulty', 'normal')
+        }
+
+        # Actualizar XP diaria (serie compacta; migra las claves daily_xp_YYYY-MM-DD antiguas)
+        if self.current_progress:
+            daily_xp = DailyXpSeries.from_progress(self.current_progress)
+            daily_xp.add(now.date(), rewards.total_xp)
+            self.current_progress[DAILY_XP_KEY] = daily_xp.to_dict()
+            self.current_progress.update(progress_data)
+            progress_data = self.current_progress
+        else:
+            self.current_progress = progress_data
+
+        # Guardar el intento y el progreso (incluye last_session: al cerrar no hace falta otra escritura)
+        attempt = {
+            'exam_id': self.exam_data.get('id', ''),
+            'title': self.exam_data['title'],
+            'date': date,
+            'correct_answers': score.correct_answers,
+            'total_questions': score.total_questions,
+            'xp_earned': rewards.total_xp,
+            'difficulty': progress_data['difficulty']
+        }
+        self.progress_persistence.record_attempt(self.user_id, attempt, progress_data)
+        self._save_learning_state()
+        if self.checkpoint is not None:
+            self.checkpoint.discard()
+            self.checkpoint = None
+
+        # Un reintento se compara con este intento
+        self.last_exam_score = ExamScore(score.correct_answers, score.total_questions, adjusted_score.xp_earned)
+        self.state = FINISHED
+        return ExamResult(
+            correct_answers=score.correct_answers,
+            total_questions=score.total_questions,
+            accuracy=accuracy,
+            rewards=rewards,
+            old_level=old_level,
+            new_level=new_level,
+            level_up_rewards=level_up_rewards,
+            comparison=comparison,
+            attempt=attempt,
+            progress_data=progress_data
+        )
+
+    def abandon(self, now: datetime = None):
+        """Guarda lo aprendido si el examen se deja sin terminar
+
+        El progreso no se reescribe: las respuestas ya están en el checkpoint, que
+        queda cerrado con la hora de la sesión para continuarla después.
+        """
+        if self.state == FINISHED:
+            return
+        self._save_learning_state()
+        if self.checkpoint is not None:
+            self.checkpoint.mark_learned(now)
+            self.checkpoint.close()
+            self.checkpoint = None
+
+    def _save_learning_state(self):
+        if self.review_store is not None:
+            self.review_store.save(self.user_id)
+        if self.adaptive_selector is not None:
+            self.adaptive_selector.save()
@@ -0,0 +1,86 @@
+"""
+Precarga de imágenes de preguntas en un hilo de trabajo
+
+Las imágenes se decodifican ya escaladas al tamaño en que se muestran
+(QImageReader.setScaledSize), en un hilo aparte, y se entregan como QImage
+listas: en el hilo de la interfaz solo queda convertirlas a QPixmap y
+asignarlas. QImage (a diferencia de QPixmap) puede crearse fuera del hilo de
+la interfaz.
+"""
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Tuple
+from PyQt6.QtCore import QSize, Qt
+from PyQt6.QtGui import QImage, QImageReader
+
+# Preguntas siguientes cuyas imágenes se precargan
+PREFETCH_AHEAD = 3
+# Imágenes listas que se conservan (las preguntas generadas repiten imágenes)
+MAX_READY = 8
+
+
+def decode_scaled(path: str, box: QSize) -> QImage:
+    """Decodifica la imagen escalada para caber en `box` manteniendo la proporción
+
+    Returns:
+        QImage: Imagen escalada (nula si el archivo no existe o no se puede leer)
+    """
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    size = reader.size()
+    if size.isValid() and not size.isEmpty():
+        reader.setScaledSize(size.scaled(box, Qt.AspectRatioMode.KeepAspectRatio))
+    return reader.read()
+
+
+class ImagePrefetcher:
+    """Decodifica imágenes por adelantado en un hilo y las entrega ya escaladas"""
+
+    def __init__(self, max_ready: int = MAX_READY):
+        self.max_ready = max_ready
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='image-prefetch')
+        # (ruta, ancho, alto) -> Future[QImage], en orden de uso (LRU)
+        self._images: OrderedDict = OrderedDict()
+        # take() con la imagen ya pedida (lista o en curso) / decodificada en el momento
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(path: str, box: QSize) -> Tuple[str, int, int]:
+        return path, box.width(), box.height()
+
+    def prefetch(self, path: str, box: QSize):
+        """Pide decodificar una imagen en segundo plano (no hace nada si ya se pidió)"""
+        key = self._key(path, box)
+        if key in self._images:
+            self._images.move_to_end(key)
+            return
+        self._images[key] = self._executor.submit(decode_scaled, path, QSize(box))
+        while len(self._images) > self.max_ready:
+            _, future = self._images.popitem(last=False)
+            future.cancel()
+
+    def take(self, path: str, box: QSize) -> QImage:
+        """Imagen escalada: la precargada si se pidió (espera si aún se decodifica) o
+        decodificada en el momento"""
+        key = self._key(path, box)
+        future: Future = self._images.get(key)
+        if future is not None and not future.cancelled():
+            self._images.move_to_end(key)
+            self.hits += 1
+            return future.result()
+        self.misses += 1
+        image = decode_scaled(path, box)
+        done = Future()
+        done.set_result(image)
+        self._images[key] = done
+        while len(self._images) > self.max_ready:
+            self._images.popitem(last=False)[1].cancel()
+        return image
+
+    def shutdown(self):
+        """Cancela lo pendiente y libera el hilo"""
+        for future in self._images.values():
+            future.cancel()
+        self._images.clear()
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,253 @@
+"""
+Simulador Monte Carlo de la curva de niveles
+
+Modela miles de estudiantes sintéticos que rinden exámenes durante un periodo
+para ajustar base_xp, xp_multiplier y reward_multiplier de
+ImprovedLevelSystem.DIFFICULTIES con datos en vez de intuición.
+
+- La precisión de cada estudiante se obtiene de una distribución Beta
+- Cada día el estudiante rinde un número de exámenes según una distribución de Poisson
+- La XP de cada examen se calcula con calculate_exam_rewards (igual que ExamWindow)
+- Los estudiantes se reparten en bloques que se simulan en un pool de procesos
+
+Uso:
+    python -m src.services.level_simulator --students 50000 --days 365
+    python -m src.services.level_simulator --set hard.base_xp=120 --set hard.xp_multiplier=1.6
+"""
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, fields, replace
+from typing import Dict, List, Tuple
+import argparse
+import os
+import sys
+import numpy as np
+from src.services.exam_score import ExamScore
+from src.services.level_system import Difficulty, ImprovedLevelSystem
+
+
+@dataclass
+class SimulationConfig:
+    """Parámetros de la simulación"""
+    students: int = 10_000
+    days: int = 365
+    exams_per_day: float = 0.8          # Media de la distribución de Poisson
+    max_exams_per_day: int = 6
+    questions_per_exam: int = 10
+    exam_xp: int = 120                  # XP base de los exámenes (ver exams.json)
+    accuracy_alpha: float = 6.0         # Distribución Beta de la precisión
+    accuracy_beta: float = 2.5
+    target_levels: Tuple[int, ...] = (5, 10, 15, 25, 30, 50)
+    percentiles: Tuple[int, ...] = (10, 50, 90)
+    chunk_size: int = 2_000
+    workers: int = None                 # None usa todos los núcleos
+    seed: int = 42
+
+
+@dataclass
+class DifficultyReport:
+    """Resultado de la simulación para una dificultad"""
+    difficulty: str
+    students: int
+    final_level_median: float
+    # nivel -> (fracción de estudiantes que lo alcanzó, {percentil: días})
+    time_to_level: Dict[int, Tuple[float, Dict[int, float]]] = field(default_factory=dict)
+
+
+def exam_xp_table(level_system: ImprovedLevelSystem, exam_xp: int, questions: int) -> np.ndarray:
+    """XP ganada en un examen para cada número posible de respuestas correctas"""
+    multiplier = level_system.difficulty.reward_multiplier
+    table = []
+    for correct in range(questions + 1):
+        score = ExamScore(correct, questions, exam_xp)
+        rewards = level_system.calculate_exam_rewards(
+            exam_base_xp=(score * multiplier).xp_earned,
+            correct_answers=score.correct_answers,
+            total_questions=score.total_questions
+        )
+        table.append(rewards.total_xp)
+    return np.array(table, dtype=np.int64)
+
+
+def _simulate_chunk(args) -> Tuple[np.ndarray, np.ndarray]:
+    """Simula un bloque de estudiantes (se ejecuta en un proceso del pool)
+
+    Returns:
+        Tuple: (días hasta cada nivel objetivo, -1 si no lo alcanzó; nivel final)
+    """
+    difficulty, config_override, config, students, seed = args
+    rng = np.random.default_rng(seed)
+    level_system = ImprovedLevelSystem(difficulty, config=config_override)
+    xp_table = exam_xp_table(level_system, config.exam_xp, config.questions_per_exam)
+    thresholds, _ = level_system.difficulty.level_curve.arrays
+
+    accuracy = rng.beta(config.accuracy_alpha, config.accuracy_beta, size=students)
+    exams = np.minimum(
+        rng.poisson(config.exams_per_day, size=(students, config.days)),
+        config.max_exams_per_day
+    )
+
+    # Un intento por cada examen posible del día; se descartan los que no se rindieron
+    shape = (students, config.days, config.max_exams_per_day)
+    correct = rng.binomial(config.questions_per_exam, accuracy[:, None, None], size=shape)
+    taken = np.arange(config.max_exams_per_day) < exams[:, :, None]
+    daily_xp = np.where(taken, xp_table[correct], 0).sum(axis=2)
+    cumulative_xp = np.cumsum(daily_xp, axis=1)
+
+    targets = [level for level in config.target_levels if level <= len(thresholds)]
+    days_to_level = np.full((students, len(targets)), -1, dtype=np.int32)
+    for i, level in enumerate(targets):
+        reached = cumulative_xp >= thresholds[level - 1]
+        any_reached = reached[:, -1]
+        days_to_level[any_reached, i] = reached[any_reached].argmax(axis=1) + 1
+
+    final_level = np.searchsorted(thresholds, cumulative_xp[:, -1], side='right')
+    return days_to_level, final_level
+
+
+class LevelCurveSimulator:
+    """Ejecuta la simulación Monte Carlo para una o más dificultades"""
+
+    def __init__(self, config: SimulationConfig = None,
+                 difficulties: Dict[str, Difficulty] = None):
+        self.config = config or SimulationConfig()
+        self.difficulties = difficulties or dict(ImprovedLevelSystem.DIFFICULTIES)
+
+    def _tasks(self, difficulty: str, seed_sequence: np.random.SeedSequence) -> List[tuple]:
+        config = self.config
+        sizes = [min(config.chunk_size, config.students - start)
+                 for start in range(0, config.students, config.chunk_size)]
+        seeds = seed_sequence.spawn(len(sizes))
+        return [(difficulty, self.difficulties[difficulty], config, size, seed)
+                for size, seed in zip(sizes, seeds)]
+
+    def run(self) -> List[DifficultyReport]:
+        """Simula todas las dificultades y retorna los percentiles de días hasta cada nivel"""
+        config = self.config
+        root_seed = np.random.SeedSequence(config.seed)
+        difficulty_seeds = root_seed.spawn(len(self.difficulties))
+        workers = config.workers or os.cpu_count() or 1
+
+        reports = []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for difficulty, seed in zip(self.difficulties, difficulty_seeds):
+                results = list(pool.map(_simulate_chunk, self._tasks(difficulty, seed)))
+                days_to_level = np.concatenate([days for days, _ in results])
+                final_level = np.concatenate([level for _, level in results])
+                reports.append(self._report(difficulty, days_to_level, final_level))
+        return reports
+
+    def _report(self, difficulty: str, days_to_level: np.ndarray,
+                final_level: np.ndarray) -> DifficultyReport:
+        max_level = self.difficulties[difficulty].max_level
+        targets = [level for level in self.config.target_levels if level <= max_level]
+        report = DifficultyReport(
+            difficulty=difficulty,
+            students=len(final_level),
+            final_level_median=float(np.median(final_level))
+        )
+        for i, level in enumerate(targets):
+            days = days_to_level[:, i]
+            days = days[days >= 0]
+            reached = len(days) / len(days_to_level)
+            percentiles = {
+                p: float(np.percentile(days, p)) if len(days) else float('nan')
+                for p in self.config.percentiles
+            }
+            report.time_to_level[level] = (reached, percentiles)
+        return report
+
+
+def format_reports(reports: List[DifficultyReport], config: SimulationConfig) -> str:
+    """Tabla de texto con los días hasta cada nivel por dificultad"""
+    lines = []
+    header = f"{'nivel':>6} {'alcanzado':>10} " + ' '.join(f"{f'p{p} (días)':>11}" for p in config.percentiles)
+    for report in reports:
+        lines.append(f"\n[{report.difficulty}] {report.students:,} estudiantes, "
+                     f"nivel final mediano: {report.final_level_median:.0f}")
+        lines.append(header)
+        for level, (reached, percentiles) in report.time_to_level.items():
+            values = ' '.join(f"{percentiles[p]:>11.0f}" for p in config.percentiles)
+            lines.append(f"{level:>6} {reached:>9.0%} {values}")
+    return '\n'.join(lines)
+
+
+BOOLEAN_VALUES = {'true': True, '1': True, 'si': True, 'sí': True, 'yes': True,
+                  'false': False, '0': False, 'no': False}
+
+
+def _parse_value(value: str, field_type: type):
+    """Convierte el texto de un ajuste al tipo del campo (bool('False') sería True)"""
+    if field_type is bool:
+        parsed = BOOLEAN_VALUES.get(value.strip().lower())
+        if parsed is None:
+            raise ValueError(f"'{value}' no es un booleano (use true/false)")
+        return parsed
+    try:
+        return field_type(value)
+    except ValueError:
+        raise ValueError(f"'{value}' no es un valor {field_type.__name__} válido") from None
+
+
+def _apply_overrides(difficulties: Dict[str, Difficulty], overrides: List[str]) -> Dict[str, Difficulty]:
+    """Aplica ajustes con el formato dificultad.campo=valor
+
+    Raises:
+        ValueError: Si un ajuste no tiene ese formato o la dificultad, el campo o el valor no son válidos
+    """
+    difficulties = dict(difficulties)
+    field_types = {f.name: f.type for f in fields(Difficulty) if f.name != 'name'}
+    for override in overrides:
+        key, separator, value = override.partition('=')
+        difficulty, dot, field_name = key.partition('.')
+        if not separator or not dot:
+            raise ValueError(f"Ajuste inválido '{override}': se espera dificultad.campo=valor")
+        if difficulty not in difficulties:
+            raise ValueError(f"Dificultad desconocida '{difficulty}' (opciones: {', '.join(difficulties)})")
+        if field_name not in field_types:
+            raise ValueError(f"Campo desconocido '{field_name}' (opciones: {', '.join(field_types)})")
+        try:
+            parsed = _parse_value(value, field_types[field_name])
+        except ValueError as e:
+            raise ValueError(f"Ajuste inválido '{override}': {e}") from None
+        difficulties[difficulty] = replace(difficulties[difficulty], **{field_name: parsed})
+    return difficulties
+
+
+def main(argv: List[str] = None) -> int:
+    defaults = SimulationConfig()
+    parser = argparse.ArgumentParser(description="Simulador de la curva de niveles de GeoGrapy")
+    parser.add_argument('--students', type=int, default=defaults.students)
+    parser.add_argument('--days', type=int, default=defaults.days)
+    parser.add_argument('--exams-per-day', type=float, default=defaults.exams_per_day)
+    parser.add_argument('--questions', type=int, default=defaults.questions_per_exam)
+    parser.add_argument('--exam-xp', type=int, default=defaults.exam_xp)
+    parser.add_argument('--accuracy', type=float, nargs=2, metavar=('ALPHA', 'BETA'),
+                        default=(defaults.accuracy_alpha, defaults.accuracy_beta))
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=defaults.seed)
+    parser.add_argument('--set', action='append', default=[], metavar='DIFICULTAD.CAMPO=VALOR',
+                        help="Ajusta un parámetro de dificultad, p. ej. hard.base_xp=120")
+    args = parser.parse_args(argv)
+
+    config = SimulationConfig(
+        students=args.students,
+        days=args.days,
+        exams_per_day=args.exams_per_day,
+        questions_per_exam=args.questions,
+        exam_xp=args.exam_xp,
+        accuracy_alpha=args.accuracy[0],
+        accuracy_beta=args.accuracy[1],
+        workers=args.workers,
+        seed=args.seed
+    )
+    try:
+        difficulties = _apply_overrides(ImprovedLevelSystem.DIFFICULTIES, args.set)
+    except ValueError as e:
+        parser.error(str(e))
+    reports = LevelCurveSimulator(config, difficulties).run()
+    print(format_reports(reports, config))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,9 +1,21 @@
 # src/services/level_system.py
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import List, Dict, Any
+from collections import OrderedDict
+from bisect import bisect_right
+from dataclasses import dataclass, replace
+from functools import cached_property
+from typing import List, Dict, Any, Tuple
+import copy
 import json
+import os
+import threading
 from pathlib import Path
+import numpy as np
+from src.services.progress_codec import DECODE_ERRORS, decode_progress, encode_progress
+from src.services.progress_sync import FileLock, VERSION_KEY, lock_path_for, merge_progress
+
+# Usuario de la aplicación de escritorio cuando no se configura otro (GEOGRAPY_USER_ID)
+DEFAULT_USER_ID = 'current_user'
 
 """
 @dataclass lo usamos para definir una clase de datos simple, que solo tiene atributos y no métodos.
@@ -23,6 +35,29 @@ class LevelProgress:
     progress_percentage: float
 
 
+@dataclass
+class BatchLevelProgress:
+    """Clase para almacenar el progreso de nivel de muchos usuarios a la vez (arreglos NumPy)"""
+    level: np.ndarray
+    current_xp: np.ndarray
+    xp_for_next: np.ndarray
+    total_xp: np.ndarray
+    progress_percentage: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.total_xp)
+
+    def __getitem__(self, index: int) -> LevelProgress:
+        """Retorna el progreso de un usuario como LevelProgress"""
+        return LevelProgress(
+            level=int(self.level[index]),
+            current_xp=int(self.current_xp[index]),
+            xp_for_next=int(self.xp_for_next[index]),
+            total_xp=int(self.total_xp[index]),
+            progress_percentage=float(self.progress_percentage[index])
+        )
+
+
 @dataclass
 class ExamRewards:
     """Clase para almacenar las recompensas del examen"""
@@ -33,17 +68,111 @@ class ExamRewards:
     accuracy: float
 
 
-@dataclass
+@dataclass(frozen=True)
 class LevelRewards:
-    """Clase para almacenar las recompensas por nivel"""
-    titles: List[str]
-    badges: List[str]
-    features: List[str]
+    """Clase inmutable para almacenar las recompensas por nivel"""
+    titles: Tuple[str, ...]
+    badges: Tuple[str, ...]
+    features: Tuple[str, ...]
 
 
-@dataclass
+@dataclass(frozen=True)
+class RewardRule:
+    """Regla de recompensa: se desbloquea `value` de tipo `kind` al llegar a `level`"""
+    level: int
+    kind: str
+    value: str
+
+
+class RewardTable:
+    """Reglas de recompensa compiladas para una dificultad
+
+    - Las reglas se guardan ordenadas por nivel para obtener con búsqueda binaria
+      solo las desbloqueadas entre dos niveles
+    - Las recompensas acumuladas de cada nivel se memorizan como LevelRewards inmutables
+    """
+
+    KINDS = ('titles', 'badges', 'features')
+
+    def __init__(self, rules: List[RewardRule]):
+        # Orden de definición: se respeta en las recompensas acumuladas
+        self._rules = tuple(rules)
+        # Orden por nivel (sort estable): se usa para los deltas
+        self._sorted_rules = tuple(sorted(self._rules, key=lambda rule: rule.level))
+        self._levels = tuple(rule.level for rule in self._sorted_rules)
+        self._cache: Dict[int, LevelRewards] = {}
+
+    @staticmethod
+    def _build(rules) -> LevelRewards:
+        rewards = {kind: [] for kind in RewardTable.KINDS}
+        for rule in rules:
+            rewards[rule.kind].append(rule.value)
+        return LevelRewards(**{kind: tuple(values) for kind, values in rewards.items()})
+
+    def rewards_for(self, level: int) -> LevelRewards:
+        """Recompensas acumuladas hasta el nivel indicado (memorizadas)"""
+        # Sobre el último umbral ya no cambia nada
+        level = min(level, self._levels[-1]) if self._levels else 0
+        rewards = self._cache.get(level)
+        if rewards is None:
+            rewards = self._build(rule for rule in self._rules if rule.level <= level)
+            self._cache[level] = rewards
+        return rewards
+
+    def unlocked_between(self, old_level: int, new_level: int) -> LevelRewards:
+        """Recompensas desbloqueadas al pasar de old_level a new_level (O(log n + k))"""
+        start = bisect_right(self._levels, old_level)
+        end = bisect_right(self._levels, new_level)
+        return self._build(self._sorted_rules[start:end])
+
+
+@dataclass(frozen=True)
+class LevelCurve:
+    """Tabla inmutable con los umbrales de XP de una dificultad
+
+    - thresholds[i]: XP total acumulada necesaria para alcanzar el nivel i + 1
+    - xp_for_next[i]: XP necesaria para pasar del nivel i + 1 al siguiente
+    """
+    thresholds: Tuple[int, ...]
+    xp_for_next: Tuple[int, ...]
+
+    def level_index(self, total_xp: int) -> int:
+        """Retorna el índice (nivel - 1) correspondiente a la XP total con búsqueda binaria"""
+        return max(bisect_right(self.thresholds, total_xp) - 1, 0)
+
+    @cached_property
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Umbrales y XP por nivel como arreglos int64 de solo lectura
+
+        Los valores que no caben en int64 se saturan a su máximo, así que dejan de
+        ser exactos desde el índice exact_levels: una XP que cae ahí (p. ej. la XP
+        int64 máxima, que iguala un umbral saturado) debe calcularse con enteros de
+        Python.
+        """
+        limit = np.iinfo(np.int64).max
+        thresholds = np.array([min(value, limit) for value in self.thresholds], dtype=np.int64)
+        xp_for_next = np.array([min(value, limit) for value in self.xp_for_next], dtype=np.int64)
+        thresholds.flags.writeable = False
+        xp_for_next.flags.writeable = False
+        return thresholds, xp_for_next
+
+    @cached_property
+    def exact_levels(self) -> int:
+        """Cantidad de niveles iniciales cuyo umbral y XP al siguiente caben en int64"""
+        limit = np.iinfo(np.int64).max
+        for index, (threshold, gap) in enumerate(zip(self.thresholds, self.xp_for_next)):
+            if threshold > limit or gap > limit:
+                return index
+        return len(self.thresholds)
+
+
+@dataclass(frozen=True)
 class Difficulty:
-    """Configuración de dificultad"""
+    """Configuración de dificultad
+
+    Es inmutable porque level_curve se calcula una sola vez: para ajustar un
+    parámetro se crea otra con dataclasses.replace.
+    """
     name: str
     base_xp: int
     xp_multiplier: float
@@ -52,6 +181,25 @@ class Difficulty:
     exclusive_rewards: bool
     description: str
 
+    def xp_for_level(self, level: int) -> int:
+        """XP necesaria para alcanzar un nivel desde el nivel anterior"""
+        if level <= 1:
+            return 0
+        return int(self.base_xp * (self.xp_multiplier ** (level - 1)))
+
+    @cached_property
+    def level_curve(self) -> LevelCurve:
+        """Construye una única vez la tabla de umbrales acumulados (enteros exactos)"""
+        thresholds = []
+        xp_for_next = []
+        accumulated = 0
+        for level in range(1, self.max_level + 1):
+            thresholds.append(accumulated)
+            gap = self.xp_for_level(level + 1)
+            xp_for_next.append(gap)
+            accumulated += gap
+        return LevelCurve(thresholds=tuple(thresholds), xp_for_next=tuple(xp_for_next))
+
 
 class AbstractLevelSystem(ABC):
     """Clase base para el sistema de niveles"""
@@ -72,6 +220,22 @@ class AbstractLevelSystem(ABC):
         """Obtiene el progreso actual del nivel"""
         pass
 
+    def get_level_progress_batch(self, total_xp) -> BatchLevelProgress:
+        """Obtiene el progreso de nivel para un arreglo de XP totales
+
+        La implementación por defecto llama a get_level_progress por cada valor;
+        las subclases pueden sobrescribirla con una versión vectorizada.
+        """
+        total_xp = np.asarray(total_xp, dtype=np.int64).ravel()
+        progress = [self.get_level_progress(int(xp)) for xp in total_xp]
+        return BatchLevelProgress(
+            level=np.array([p.level for p in progress], dtype=np.int64),
+            current_xp=np.array([p.current_xp for p in progress], dtype=np.int64),
+            xp_for_next=np.array([p.xp_for_next for p in progress], dtype=np.int64),
+            total_xp=total_xp,
+            progress_percentage=np.array([p.progress_percentage for p in progress], dtype=np.float64)
+        )
+
     @abstractmethod
     def calculate_exam_rewards(self, exam_base_xp: int,
                                correct_answers: int,
@@ -84,6 +248,19 @@ class AbstractLevelSystem(ABC):
         """Obtiene las recompensas por nivel"""
         pass
 
+    def get_rewards_unlocked_between(self, old_level: int, new_level: int) -> LevelRewards:
+        """Obtiene solo las recompensas nuevas al pasar de old_level a new_level
+
+        La implementación por defecto compara las recompensas acumuladas de ambos niveles.
+        """
+        old_rewards = self.get_level_rewards(old_level)
+        new_rewards = self.get_level_rewards(new_level)
+        return LevelRewards(
+            titles=tuple(t for t in new_rewards.titles if t not in old_rewards.titles),
+            badges=tuple(b for b in new_rewards.badges if b not in old_rewards.badges),
+            features=tuple(f for f in new_rewards.features if f not in old_rewards.features)
+        )
+
 
 class AbstractProgressPersistence(ABC):
     """Clase base para la persistencia del progreso"""
@@ -98,6 +275,14 @@ class AbstractProgressPersistence(ABC):
         """Carga el progreso del usuario"""
         pass
 
+    def record_attempt(self, user_id: str, attempt: Dict[str, Any], progress_data: Dict[str, Any]) -> bool:
+        """Guarda el progreso tras un intento de examen
+
+        Por defecto solo guarda el progreso; las persistencias con historial
+        también guardan el intento.
+        """
+        return self.save_progress(user_id, progress_data)
+
 
 class ImprovedLevelSystem(AbstractLevelSystem):
     """Sistema de niveles mejorado con diferentes dificultades
@@ -147,23 +332,82 @@ class ImprovedLevelSystem(AbstractLevelSystem):
         )
     }
 
-    def __init__(self, difficulty: str = 'normal'):
+    # Recompensas base: (nivel, tipo, valor). {name} es el nombre de la dificultad y {key} su clave
+    BASE_REWARD_RULES = (
+        (5, 'titles', '{name} Novato'),
+        (5, 'badges', 'Insignia {key} 1'),
+        (10, 'titles', '{name} Aprendiz'),
+        (10, 'badges', 'Insignia {key} 2'),
+        (25, 'titles', '{name} Experto'),
+        (25, 'badges', 'Insignia {key} 3'),
+        (25, 'features', 'custom_profile'),
+        (50, 'titles', '{name} Legendario'),
+        (50, 'badges', 'Insignia {key} 4'),
+        (50, 'features', 'create_custom_quizzes'),
+    )
+
+    # Recompensas exclusivas para dificultades con exclusive_rewards
+    EXCLUSIVE_REWARD_RULES = (
+        (5, 'titles', 'Maestro Intrépido'),
+        (5, 'badges', 'Corona de Espinas'),
+        (15, 'titles', 'Sabio de la Geografía'),
+        (15, 'badges', 'Pergamino de la Sabiduría'),
+        (30, 'titles', 'Leyenda Geográfica'),
+        (30, 'badges', 'Globo de Oro'),
+        (30, 'features', 'custom_theme'),
+        (60, 'titles', 'Deidad Geográfica'),
+        (60, 'badges', 'Jardin del Edén'),
+        (60, 'features', 'create_challenges'),
+    )
+
+    # Tablas de recompensas compiladas, una por dificultad
+    _reward_tables: Dict[str, RewardTable] = {}
+
+    def __init__(self, difficulty: str = 'normal', config: Difficulty = None):
+        """
+        Args:
+            difficulty (str): Clave de la dificultad en DIFFICULTIES
+            config (Difficulty): Configuración personalizada que reemplaza a la de
+                DIFFICULTIES (por ejemplo, para simular ajustes de la curva)
+        """
         if difficulty not in self.DIFFICULTIES:
             difficulty = 'normal'
 
-        self.difficulty = self.DIFFICULTIES[difficulty]
+        self.difficulty = config or self.DIFFICULTIES[difficulty]
         self._difficulty_name = difficulty  # Cambiado a _difficulty_name
-
-        # Inicializar con los valores de la dificultad seleccionada
-        self.base_xp = self.difficulty.base_xp
-        self.xp_multiplier = self.difficulty.xp_multiplier
-        self.max_level = self.difficulty.max_level
+        self._custom_reward_table = None
 
     @property
     def difficulty_name(self) -> str:
         """Retorna el nombre de la dificultad actual"""
         return self._difficulty_name
 
+    # Los parámetros de la curva se leen de la dificultad; al asignarlos se crea una
+    # dificultad nueva (con su propia curva) en lugar de modificar la compartida
+    @property
+    def base_xp(self) -> int:
+        return self.difficulty.base_xp
+
+    @base_xp.setter
+    def base_xp(self, value: int):
+        self.difficulty = replace(self.difficulty, base_xp=value)
+
+    @property
+    def xp_multiplier(self) -> float:
+        return self.difficulty.xp_multiplier
+
+    @xp_multiplier.setter
+    def xp_multiplier(self, value: float):
+        self.difficulty = replace(self.difficulty, xp_multiplier=value)
+
+    @property
+    def max_level(self) -> int:
+        return self.difficulty.max_level
+
+    @max_level.setter
+    def max_level(self, value: int):
+        self.difficulty = replace(self.difficulty, max_level=value)
+
 
     def calculate_xp_for_level(self, level: int) -> int:
         """
@@ -173,9 +417,7 @@ class ImprovedLevelSystem(AbstractLevelSystem):
             int: Cantidad de XP necesaria para alcanzar el nivel especificado
         """
 
-        if level <= 1:
-            return 0
-        return int(self.base_xp * (self.xp_multiplier ** (level - 1)))
+        return self.difficulty.xp_for_level(level)
 
     def get_level_progress(self, total_xp: int) -> LevelProgress:
         """Calcula el nivel actual y el progreso basado en la XP total
@@ -190,18 +432,14 @@ class ImprovedLevelSystem(AbstractLevelSystem):
                     - total_xp: XP total acumulada
                     - progress_percentage: porcentaje de progreso al siguiente nivel
         """
-        current_level = 1
-        accumulated_xp = 0
-        xp_for_next = self.calculate_xp_for_level(2)
-
-        # Encontrar el nivel actual
-        while accumulated_xp + xp_for_next <= total_xp and current_level < self.max_level:
-            accumulated_xp += xp_for_next
-            current_level += 1
-            xp_for_next = self.calculate_xp_for_level(current_level + 1)
+        # Encontrar el nivel actual en la tabla precalculada (O(log n))
+        curve = self.difficulty.level_curve
+        index = curve.level_index(total_xp)
+        current_level = index + 1
+        xp_for_next = curve.xp_for_next[index]
 
         # Calcular XP en el nivel actual
-        xp_in_current_level = total_xp - accumulated_xp
+        xp_in_current_level = total_xp - curve.thresholds[index]
         progress_percentage = (xp_in_current_level / xp_for_next * 100) if xp_for_next > 0 else 100
 
         return LevelProgress(
@@ -212,47 +450,109 @@ class ImprovedLevelSystem(AbstractLevelSystem):
             progress_percentage=progress_percentage
         )
 
+    def get_level_progress_batch(self, total_xp) -> BatchLevelProgress:
+        """Calcula el progreso de nivel de muchos usuarios de forma vectorizada
+
+            Args:
+                total_xp (array-like): XP total acumulada de cada usuario
+            Returns:
+                BatchLevelProgress: Arreglos con los mismos valores que retornaría
+                    get_level_progress para cada elemento
+        """
+        total_xp = np.asarray(total_xp, dtype=np.int64).ravel()
+        curve = self.difficulty.level_curve
+        thresholds, xp_for_next_table = curve.arrays
+
+        # Búsqueda binaria vectorizada sobre la curva de umbrales
+        index = np.searchsorted(thresholds, total_xp, side='right') - 1
+        np.maximum(index, 0, out=index)
+
+        xp_for_next = xp_for_next_table[index]
+        current_xp = total_xp - thresholds[index]
+        progress_percentage = np.full(len(total_xp), 100.0)
+        has_next = xp_for_next > 0
+        progress_percentage[has_next] = (
+            current_xp[has_next] / xp_for_next[has_next] * 100
+        )
+
+        # Sobre 2**53 la división en float64 puede diferir en el último bit de la
+        # división entera de Python; esos casos (muy raros) se calculan uno a uno
+        inexact = has_next & ((np.abs(current_xp) > 2 ** 53) | (xp_for_next > 2 ** 53))
+        for i in np.flatnonzero(inexact):
+            progress_percentage[i] = int(current_xp[i]) / int(xp_for_next[i]) * 100
+
+        # En los niveles con valores saturados en int64 se usa el cálculo escalar; si la
+        # XP al siguiente nivel no cabe en int64, ese arreglo pasa a enteros de Python
+        saturated = np.flatnonzero(index >= curve.exact_levels)
+        for i in saturated:
+            progress = self.get_level_progress(int(total_xp[i]))
+            index[i] = progress.level - 1
+            current_xp[i] = progress.current_xp
+            if progress.xp_for_next > np.iinfo(np.int64).max and xp_for_next.dtype != object:
+                xp_for_next = xp_for_next.astype(object)
+            xp_for_next[i] = progress.xp_for_next
+            progress_percentage[i] = progress.progress_percentage
+
+        return BatchLevelProgress(
+            level=index + 1,
+            current_xp=current_xp,
+            xp_for_next=xp_for_next,
+            total_xp=total_xp,
+            progress_percentage=progress_percentage
+        )
+
+    @classmethod
+    def _build_reward_table(cls, key: str, config: Difficulty) -> RewardTable:
+        """Compila las reglas de recompensa de una configuración de dificultad"""
+        rules = list(cls.BASE_REWARD_RULES)
+        if config.exclusive_rewards:
+            rules += cls.EXCLUSIVE_REWARD_RULES
+        return RewardTable([
+            RewardRule(level, kind, value.format(name=config.name, key=key))
+            for level, kind, value in rules
+        ])
+
+    @classmethod
+    def _get_reward_table(cls, difficulty: str) -> RewardTable:
+        """Compila (una sola vez) las reglas de recompensa de una dificultad"""
+        table = cls._reward_tables.get(difficulty)
+        if table is None:
+            table = cls._build_reward_table(difficulty, cls.DIFFICULTIES[difficulty])
+            cls._reward_tables[difficulty] = table
+        return table
+
+    def _current_reward_table(self) -> RewardTable:
+        """Tabla de recompensas de la configuración de esta instancia
+
+        Las dificultades de DIFFICULTIES comparten la tabla de la clase; una
+        configuración personalizada compila la suya y la guarda en la instancia.
+        """
+        if self.difficulty is self.DIFFICULTIES[self._difficulty_name]:
+            return self._get_reward_table(self._difficulty_name)
+        cached = self._custom_reward_table
+        if cached is None or cached[0] is not self.difficulty:
+            cached = (self.difficulty, self._build_reward_table(self._difficulty_name, self.difficulty))
+            self._custom_reward_table = cached
+        return cached[1]
+
     def get_level_rewards(self, level: int) -> LevelRewards:
-        rewards = {
-            'titles': [],
-            'badges': [],
-            'features': []
-        }
+        """
+        Args:
+            level (int): Nivel del usuario
+        Returns:
+            LevelRewards: Títulos, insignias y características acumuladas hasta el nivel
+        """
+        return self._current_reward_table().rewards_for(level)
 
-        # Recompensas base
-        if level >= 5:
-            rewards['titles'].append(f'{self.difficulty.name} Novato')
-            rewards['badges'].append(f'Insignia {self.difficulty_name} 1')
-        if level >= 10:
-            rewards['titles'].append(f'{self.difficulty.name} Aprendiz')
-            rewards['badges'].append(f'Insignia {self.difficulty_name} 2')
-        if level >= 25:
-            rewards['titles'].append(f'{self.difficulty.name} Experto')
-            rewards['badges'].append(f'Insignia {self.difficulty_name} 3')
-            rewards['features'].append('custom_profile')
-        if level >= 50:
-            rewards['titles'].append(f'{self.difficulty.name} Legendario')
-            rewards['badges'].append(f'Insignia {self.difficulty_name} 4')
-            rewards['features'].append('create_custom_quizzes')
-
-        # Recompensas exclusivas para dificultad difícil
-        if self.difficulty.exclusive_rewards:
-            if level >= 5:
-                rewards['titles'].append('Maestro Intrépido')
-                rewards['badges'].append('Corona de Espinas')
-            if level >= 15:
-                rewards['titles'].append('Sabio de la Geografía')
-                rewards['badges'].append('Pergamino de la Sabiduría')
-            if level >= 30:
-                rewards['titles'].append('Leyenda Geográfica')
-                rewards['badges'].append('Globo de Oro')
-                rewards['features'].append('custom_theme')
-            if level >= 60:
-                rewards['titles'].append('Deidad Geográfica')
-                rewards['badges'].append('Jardin del Edén')
-                rewards['features'].append('create_challenges')
-
-        return LevelRewards(**rewards)
+    def get_rewards_unlocked_between(self, old_level: int, new_level: int) -> LevelRewards:
+        """
+        Args:
+            old_level (int): Nivel anterior
+            new_level (int): Nivel nuevo
+        Returns:
+            LevelRewards: Solo las recompensas desbloqueadas en (old_level, new_level]
+        """
+        return self._current_reward_table().unlocked_between(old_level, new_level)
 
     def calculate_exam_rewards(self, exam_base_xp: int,
                                correct_answers: int,
@@ -323,14 +623,187 @@ class ImprovedLevelSystem(AbstractLevelSystem):
 
 
 class JsonProgressPersistence(AbstractProgressPersistence):
-    """Implementación de persistencia usando JSON"""
+    """Implementación de persistencia usando JSON
+
+    - file_format='json': archivo progress_<usuario>.json con indentación (por defecto)
+    - file_format='binary': archivo progress_<usuario>.ggp en el formato binario
+      versionado de progress_codec, con compresión opcional ('zlib' o 'zstd')
+
+    La lectura es transparente: se usa el archivo más reciente de los dos formatos,
+    por lo que los JSON antiguos se siguen leyendo al cambiar a binario.
+
+    Varios procesos (dos ventanas de GeoGrapy, carpetas en red) pueden guardar a la vez:
+    - Cada guardado toma un bloqueo exclusivo sobre progress_<usuario>.lock
+    - El documento lleva una versión (_version) que se incrementa en cada escritura
+    - Si la versión en disco no es la que cargamos, otro proceso guardó antes y se
+      fusionan los cambios (merge_progress): los contadores como total_xp,
+      exams_completed y la XP diaria se suman en lugar de sobrescribirse
+    - Un archivo en disco corrupto o truncado se aparta como progress_<usuario>.<ext>.corrupt
+      y se escribe el estado nuevo (como antes del bloqueo, que simplemente sobrescribía)
+    """
 
-    def __init__(self, save_dir: Path):
+    EXTENSIONS = {'json': '.json', 'binary': '.ggp'}
+
+    # Usuarios cuya versión base se recuerda (LRU): acota la memoria en operaciones masivas
+    MAX_TRACKED_USERS = 1024
+
+    def __init__(self, save_dir: Path, file_format: str = 'json', compression: str = None,
+                 locking: bool = True, fsync: bool = True):
+        """
+        Args:
+            save_dir (Path): Directorio de los archivos de progreso
+            file_format (str): 'json' o 'binary'
+            compression (str): None, 'zlib' o 'zstd' (solo formato binario)
+            locking (bool): Bloqueo entre procesos y fusión de cambios concurrentes
+            fsync (bool): Forzar cada escritura a disco (las importaciones masivas lo
+                desactivan y sincronizan una sola vez al final)
+        """
+        if file_format not in self.EXTENSIONS:
+            raise ValueError(f"Formato de progreso desconocido: {file_format}")
         self.save_dir = save_dir
         self.save_dir.mkdir(parents=True, exist_ok=True)
+        self.file_format = file_format
+        self.compression = compression
+        self.locking = locking
+        self.fsync = fsync
+        # Número de escrituras completas a disco realizadas
+        self.write_count = 0
+
+        # Versión y contenido que conoce este proceso, por usuario: (versión, progreso).
+        # El bloqueo de archivo es por usuario; _thread_lock solo protege estos datos
+        self._bases: OrderedDict = OrderedDict()
+        self._thread_lock = threading.Lock()
+
+        # Costo de la contención entre procesos
+        self.lock_acquisitions = 0
+        self.lock_wait_total = 0.0
+        self.lock_wait_max = 0.0
+        self.merge_count = 0
+
+    def get_save_path(self, user_id: str, file_format: str = None) -> Path:
+        extension = self.EXTENSIONS[file_format or self.file_format]
+        return self.save_dir / f"progress_{user_id}{extension}"
+
+    def get_lock_path(self, user_id: str) -> Path:
+        return lock_path_for(self.get_save_path(user_id))
+
+    def list_users(self) -> List[str]:
+        """Retorna los usuarios con archivo de progreso en cualquiera de los formatos"""
+        users = set()
+        for extension in self.EXTENSIONS.values():
+            for path in self.save_dir.glob(f"progress_*{extension}"):
+                user_id = path.name[len('progress_'):-len(extension)]
+                # Se ignoran archivos auxiliares como progress_<usuario>.snapshot.json
+                if '.' not in user_id:
+                    users.add(user_id)
+        return sorted(users)
+
+    def get_lock_stats(self) -> Dict[str, Any]:
+        """Estadísticas del bloqueo entre procesos
 
-    def get_save_path(self, user_id: str) -> Path:
-        return self.save_dir / f"progress_{user_id}.json"
+        Returns:
+            Dict: Adquisiciones, espera total/máxima/media (segundos) y fusiones realizadas
+        """
+        return {
+            'acquisitions': self.lock_acquisitions,
+            'wait_total': self.lock_wait_total,
+            'wait_max': self.lock_wait_max,
+            'wait_avg': self.lock_wait_total / self.lock_acquisitions if self.lock_acquisitions else 0.0,
+            'merges': self.merge_count
+        }
+
+    def _latest_file(self, user_id: str) -> Path:
+        """Archivo de progreso más reciente de los dos formatos, o None"""
+        candidates = [path for path in (self.get_save_path(user_id, file_format)
+                                        for file_format in self.EXTENSIONS)
+                      if path.exists()]
+        if not candidates:
+            return None
+        return max(candidates, key=lambda path: path.stat().st_mtime_ns)
+
+    def _read_file(self, user_id: str) -> Dict[str, Any]:
+        """Lee el archivo de progreso más reciente (incluye la clave _version)"""
+        save_path = self._latest_file(user_id)
+        if save_path is None:
+            return {}
+        with open(save_path, 'rb') as f:
+            return decode_progress(f.read())
+
+    def _set_aside_corrupt(self, user_id: str, error: Exception):
+        """Aparta el archivo ilegible (progress_<usuario>.<ext>.corrupt) para que el guardado no falle siempre"""
+        save_path = self._latest_file(user_id)
+        if save_path is None:
+            return
+        print(f"Error: el progreso de {user_id} está dañado ({error}); se guarda una copia en {save_path.name}.corrupt")
+        os.replace(save_path, save_path.with_name(f"{save_path.name}.corrupt"))
+
+    def _write_file(self, user_id: str, progress_data: Dict[str, Any], version: int):
+        save_path = self.get_save_path(user_id)
+        document = {**progress_data, VERSION_KEY: version}
+        # Escritura atómica: archivo temporal + rename, nunca queda un archivo a medias
+        # (temporal por proceso, para que dos procesos nunca compartan el mismo)
+        temp_path = save_path.with_name(f"{save_path.name}.{os.getpid()}.tmp")
+        if self.file_format == 'binary':
+            with open(temp_path, 'wb') as f:
+                f.write(encode_progress(document, self.compression))
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+        else:
+            with open(temp_path, 'w') as f:
+                json.dump(document, f, indent=4)
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+        os.replace(temp_path, save_path)
+        self.write_count += 1
+
+        # El archivo en el otro formato (p. ej. el JSON anterior a pasar a binario) ya
+        # quedó reemplazado por este: se borra para no dejar dos copias del progreso
+        for file_format in self.EXTENSIONS:
+            if file_format != self.file_format:
+                try:
+                    self.get_save_path(user_id, file_format).unlink()
+                except FileNotFoundError:
+                    pass
+
+    def _remember_base(self, user_id: str, version: int, progress_data: Dict[str, Any]):
+        with self._thread_lock:
+            self._bases[user_id] = (version, copy.deepcopy(progress_data))
+            self._bases.move_to_end(user_id)
+            if len(self._bases) > self.MAX_TRACKED_USERS:
+                self._bases.popitem(last=False)
+
+    @staticmethod
+    def _update_level(progress_data: Dict[str, Any]):
+        """Recalcula el nivel a partir de la XP fusionada"""
+        if 'level' in progress_data:
+            level_system = ImprovedLevelSystem(progress_data.get('difficulty', 'normal'))
+            progress_data['level'] = level_system.get_level_progress(progress_data.get('total_xp', 0)).level
+
+    def _save_locked(self, user_id: str, progress_data: Dict[str, Any]):
+        """Lee la versión en disco, fusiona si otro proceso guardó y escribe (con el bloqueo tomado)"""
+        try:
+            current = self._read_file(user_id)
+        except DECODE_ERRORS as e:
+            # Sin versión legible en disco: se escribe el estado nuevo tal cual
+            self._set_aside_corrupt(user_id, e)
+            current = {}
+        version = current.pop(VERSION_KEY, 0)
+        with self._thread_lock:
+            base_version, base = self._bases.get(user_id, (None, None))
+
+        data = progress_data
+        if current and base is not None and version != base_version:
+            data = merge_progress(base, progress_data, current)
+            self._update_level(data)
+            with self._thread_lock:
+                self.merge_count += 1
+        self._write_file(user_id, data, version + 1)
+
+        # Tras una fusión el llamador no tiene los cambios del otro proceso: el próximo
+        # guardado debe volver a fusionar contra lo que él conoce
+        self._remember_base(user_id, version + 1 if data is progress_data else None, progress_data)
 
     def save_progress(self, user_id: str, progress_data: Dict[str, Any]) -> bool:
 
@@ -344,9 +817,15 @@ class JsonProgressPersistence(AbstractProgressPersistence):
         """
 
         try:
-            save_path = self.get_save_path(user_id)
-            with open(save_path, 'w') as f:
-                json.dump(progress_data, f, indent=4)
+            if not self.locking:
+                self._write_file(user_id, progress_data, 0)
+                return True
+            with FileLock(self.get_lock_path(user_id), remove=True) as lock:
+                with self._thread_lock:
+                    self.lock_acquisitions += 1
+                    self.lock_wait_total += lock.wait_time
+                    self.lock_wait_max = max(self.lock_wait_max, lock.wait_time)
+                self._save_locked(user_id, progress_data)
             return True
         except Exception as e:
             print(f"Error saving progress: {e}")
@@ -362,11 +841,15 @@ class JsonProgressPersistence(AbstractProgressPersistence):
         """
 
         try:
-            save_path = self.get_save_path(user_id)
-            if save_path.exists():
-                with open(save_path, 'r') as f:
-                    return json.load(f)
+            progress = self._read_file(user_id)
+        except DECODE_ERRORS as e:
+            # Igual que sin archivo: el próximo guardado lo aparta y fusiona con quien guarde antes
+            print(f"Error loading progress: {e}")
+            self._remember_base(user_id, 0, {})
             return {}
         except Exception as e:
             print(f"Error loading progress: {e}")
-            return {}
\ No newline at end of file
+            return {}
+        version = progress.pop(VERSION_KEY, 0)
+        self._remember_base(user_id, version, progress)
+        return progress
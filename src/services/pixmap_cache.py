@@ -0,0 +1,112 @@
+"""
+Caché de pixmaps escalados compartida por toda la aplicación
+
+Cada entrada es la imagen ya escalada para un tamaño y una densidad de píxeles
+(ruta, ancho, alto, device pixel ratio). Siempre se escala desde el archivo
+original (nunca desde otro pixmap ya reducido, que pierde calidad en cada
+paso), decodificando directamente al tamaño final con QImageReader.
+
+La caché tiene un límite en bytes y descarta primero lo usado hace más
+tiempo (LRU). Los botones de exámenes, las categorías, las tarjetas de
+recompensas y los mensajes del chat reconstruyen sus widgets a menudo con los
+mismos archivos: con la caché solo la primera vez se lee del disco.
+"""
+from collections import OrderedDict
+from typing import Tuple
+from PyQt6.QtCore import QSize, Qt
+from PyQt6.QtGui import QImageReader, QPixmap
+
+# Límite de memoria de los pixmaps guardados
+MAX_BYTES = 32 * 1024 * 1024
+# Espera tras el último cambio de tamaño de una ventana antes de reescalar
+RESIZE_DEBOUNCE_MS = 80
+
+
+class PixmapCache:
+    """LRU de pixmaps escalados desde su archivo, con límite en bytes"""
+
+    def __init__(self, max_bytes: int = MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes_used = 0
+        self._pixmaps: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(path: str, width: int, height: int, dpr: float) -> Tuple[str, int, int, float]:
+        return str(path), int(width), int(height), round(float(dpr), 2)
+
+    @staticmethod
+    def _size_of(pixmap: QPixmap) -> int:
+        return pixmap.width() * pixmap.height() * max(1, pixmap.depth()) // 8
+
+    def pixmap(self, path: str, width: int, height: int, dpr: float = 1.0) -> QPixmap:
+        """Imagen escalada para caber en width x height (píxeles lógicos) manteniendo la proporción
+
+        Args:
+            path (str): Archivo de la imagen
+            width (int): Ancho máximo en píxeles lógicos
+            height (int): Alto máximo en píxeles lógicos
+            dpr (float): Device pixel ratio de la pantalla (devicePixelRatioF del widget)
+        Returns:
+            QPixmap: Copia (compartida) del pixmap; nulo si el archivo no existe o no se puede leer
+        """
+        key = self._key(path, width, height, dpr)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(key)
+            self.hits += 1
+            return QPixmap(pixmap)
+
+        self.misses += 1
+        pixmap = self._load(key[0], QSize(round(width * dpr), round(height * dpr)))
+        pixmap.setDevicePixelRatio(key[3])
+        if not pixmap.isNull():
+            self._store(key, pixmap)
+        return QPixmap(pixmap)
+
+    @staticmethod
+    def _load(path: str, box: QSize) -> QPixmap:
+        """Decodifica desde el archivo directamente al tamaño final"""
+        reader = QImageReader(path)
+        reader.setAutoTransform(True)
+        size = reader.size()
+        if size.isValid() and not size.isEmpty():
+            reader.setScaledSize(size.scaled(box, Qt.AspectRatioMode.KeepAspectRatio))
+        image = reader.read()
+        return QPixmap.fromImage(image) if not image.isNull() else QPixmap()
+
+    def insert(self, path: str, width: int, height: int, dpr: float, pixmap: QPixmap):
+        """Guarda un pixmap ya escalado (p. ej. uno decodificado en otro hilo)"""
+        self._store(self._key(path, width, height, dpr), pixmap)
+
+    def _store(self, key: Tuple[str, int, int, float], pixmap: QPixmap):
+        size = self._size_of(pixmap)
+        if size > self.max_bytes:
+            return
+        old = self._pixmaps.pop(key, None)
+        if old is not None:
+            self.bytes_used -= self._size_of(old)
+        self._pixmaps[key] = pixmap
+        self.bytes_used += size
+        while self.bytes_used > self.max_bytes:
+            _, evicted = self._pixmaps.popitem(last=False)
+            self.bytes_used -= self._size_of(evicted)
+
+    def clear(self):
+        self._pixmaps.clear()
+        self.bytes_used = 0
+
+    def __len__(self) -> int:
+        return len(self._pixmaps)
+
+
+_default_cache: PixmapCache = None
+
+
+def get_pixmap_cache() -> PixmapCache:
+    """Caché de pixmaps compartida de la aplicación"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = PixmapCache()
+    return _default_cache
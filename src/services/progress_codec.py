@@ -0,0 +1,208 @@
+"""
+Formato binario versionado para documentos de progreso
+
+Estructura del archivo:
+    b'GGPY' | versión (u8) | compresión (u8) | contenido
+
+El contenido es una codificación etiquetada al estilo msgpack: cada valor
+comienza con un byte de tipo seguido de sus datos en little-endian. Las listas
+de enteros (como la serie de XP diaria) se guardan empaquetadas como int64.
+
+Compresión opcional: zlib (biblioteca estándar) o zstd si está instalado el
+paquete `zstandard`. decode_progress también lee archivos JSON antiguos.
+"""
+from array import array
+from typing import Any, Dict, Tuple
+import json
+import struct
+import sys
+import zlib
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+MAGIC = b'GGPY'
+VERSION = 1
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_ZSTD = 2
+COMPRESSIONS = {None: COMPRESSION_NONE, 'none': COMPRESSION_NONE,
+                'zlib': COMPRESSION_ZLIB, 'zstd': COMPRESSION_ZSTD}
+
+_HEADER = struct.Struct('<4sBB')
+_U32 = struct.Struct('<I')
+_I64 = struct.Struct('<q')
+_F64 = struct.Struct('<d')
+_INT64_MIN, _INT64_MAX = -2 ** 63, 2 ** 63 - 1
+_LITTLE_ENDIAN = sys.byteorder == 'little'
+
+
+class ProgressFormatError(ValueError):
+    """El contenido no es un documento de progreso válido"""
+
+
+# Errores que puede lanzar decode_progress con un archivo truncado o corrupto
+DECODE_ERRORS = (ValueError, struct.error, zlib.error, IndexError, OverflowError)
+if zstandard is not None:
+    DECODE_ERRORS += (zstandard.ZstdError,)
+
+
+def _encode_value(value: Any, out: bytearray):
+    if value is None:
+        out += b'N'
+    elif value is True:
+        out += b'T'
+    elif value is False:
+        out += b'F'
+    elif isinstance(value, int):
+        if _INT64_MIN <= value <= _INT64_MAX:
+            out += b'i'
+            out += _I64.pack(value)
+        else:
+            raw = value.to_bytes((value.bit_length() + 8) // 8, 'little', signed=True)
+            out += b'I'
+            out += _U32.pack(len(raw))
+            out += raw
+    elif isinstance(value, float):
+        out += b'f'
+        out += _F64.pack(value)
+    elif isinstance(value, str):
+        raw = value.encode('utf-8')
+        out += b's'
+        out += _U32.pack(len(raw))
+        out += raw
+    elif isinstance(value, dict):
+        out += b'd'
+        out += _U32.pack(len(value))
+        for key, item in value.items():
+            raw = str(key).encode('utf-8')
+            out += _U32.pack(len(raw))
+            out += raw
+            _encode_value(item, out)
+    elif isinstance(value, (list, tuple)):
+        if value and all(type(item) is int and _INT64_MIN <= item <= _INT64_MAX for item in value):
+            packed = array('q', value)
+            if not _LITTLE_ENDIAN:
+                packed.byteswap()
+            out += b'a'
+            out += _U32.pack(len(packed))
+            out += packed.tobytes()
+        else:
+            out += b'l'
+            out += _U32.pack(len(value))
+            for item in value:
+                _encode_value(item, out)
+    else:
+        raise TypeError(f"Tipo no soportado en el progreso: {type(value).__name__}")
+
+
+def _decode_value(data: bytes, pos: int) -> Tuple[Any, int]:
+    tag = data[pos]
+    pos += 1
+    if tag == 0x4E:  # N
+        return None, pos
+    if tag == 0x54:  # T
+        return True, pos
+    if tag == 0x46:  # F
+        return False, pos
+    if tag == 0x69:  # i
+        return _I64.unpack_from(data, pos)[0], pos + 8
+    if tag == 0x66:  # f
+        return _F64.unpack_from(data, pos)[0], pos + 8
+    if tag == 0x73:  # s
+        length = _U32.unpack_from(data, pos)[0]
+        pos += 4
+        return data[pos:pos + length].decode('utf-8'), pos + length
+    if tag == 0x64:  # d
+        count = _U32.unpack_from(data, pos)[0]
+        pos += 4
+        result = {}
+        for _ in range(count):
+            length = _U32.unpack_from(data, pos)[0]
+            pos += 4
+            key = data[pos:pos + length].decode('utf-8')
+            result[key], pos = _decode_value(data, pos + length)
+        return result, pos
+    if tag == 0x6C:  # l
+        count = _U32.unpack_from(data, pos)[0]
+        pos += 4
+        result = []
+        for _ in range(count):
+            item, pos = _decode_value(data, pos)
+            result.append(item)
+        return result, pos
+    if tag == 0x61:  # a
+        count = _U32.unpack_from(data, pos)[0]
+        pos += 4
+        packed = array('q')
+        packed.frombytes(data[pos:pos + count * 8])
+        if not _LITTLE_ENDIAN:
+            packed.byteswap()
+        return packed.tolist(), pos + count * 8
+    if tag == 0x49:  # I
+        length = _U32.unpack_from(data, pos)[0]
+        pos += 4
+        return int.from_bytes(data[pos:pos + length], 'little', signed=True), pos + length
+    raise ProgressFormatError(f"Etiqueta desconocida: {tag!r}")
+
+
+def encode_progress(progress_data: Dict[str, Any], compression: str = None) -> bytes:
+    """Codifica un documento de progreso en el formato binario
+
+    Args:
+        progress_data (Dict): Documento de progreso
+        compression (str): None, 'zlib' o 'zstd'
+    Returns:
+        bytes: Contenido listo para escribir en disco
+    """
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Compresión desconocida: {compression}")
+    codec = COMPRESSIONS[compression]
+    if codec == COMPRESSION_ZSTD and zstandard is None:
+        raise ValueError("La compresión zstd requiere el paquete zstandard")
+
+    body = bytearray()
+    _encode_value(progress_data, body)
+    if codec == COMPRESSION_ZLIB:
+        body = zlib.compress(body, 1)
+    elif codec == COMPRESSION_ZSTD:
+        body = zstandard.ZstdCompressor(level=3).compress(bytes(body))
+    return _HEADER.pack(MAGIC, VERSION, codec) + bytes(body)
+
+
+def decode_progress(raw: bytes) -> Dict[str, Any]:
+    """Decodifica un documento de progreso binario o JSON antiguo
+
+    Args:
+        raw (bytes): Contenido del archivo
+    Returns:
+        Dict: Documento de progreso
+    """
+    if not raw.startswith(MAGIC):
+        value = json.loads(raw.decode('utf-8'))
+    else:
+        value = _decode_binary(raw)
+    if not isinstance(value, dict):
+        raise ProgressFormatError("El documento de progreso debe ser un diccionario")
+    return value
+
+
+def _decode_binary(raw: bytes) -> Any:
+    _, version, codec = _HEADER.unpack_from(raw)
+    if version > VERSION:
+        raise ProgressFormatError(f"Versión de formato no soportada: {version}")
+    body = raw[_HEADER.size:]
+    if codec == COMPRESSION_ZLIB:
+        body = zlib.decompress(body)
+    elif codec == COMPRESSION_ZSTD:
+        if zstandard is None:
+            raise ProgressFormatError("El archivo usa zstd y el paquete zstandard no está instalado")
+        body = zstandard.ZstdDecompressor().decompress(body)
+    elif codec != COMPRESSION_NONE:
+        raise ProgressFormatError(f"Compresión desconocida: {codec}")
+
+    value, _ = _decode_value(body, 0)
+    return value
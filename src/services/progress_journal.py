@@ -0,0 +1,272 @@
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+import copy
+import json
+import os
+import struct
+import threading
+import zlib
+from src.services.daily_xp import DailyXpSeries, PROGRESS_KEY as DAILY_XP_KEY
+from src.services.level_system import AbstractProgressPersistence, JsonProgressPersistence
+
+# Cabecera de cada registro: largo del contenido y CRC32 (little-endian)
+RECORD_HEADER = struct.Struct('<II')
+
+
+def pack_record(record: Dict[str, Any]) -> bytes:
+    """Registro listo para anexar: [largo u32][crc32 u32][JSON compacto]"""
+    payload = json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def read_payloads(path: Path, offset: int = 0) -> Iterator[Tuple[int, bytes]]:
+    """Itera (posición final, contenido sin decodificar) desde offset; se detiene en el
+    primer registro incompleto o corrupto"""
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        while True:
+            header = f.read(RECORD_HEADER.size)
+            if len(header) < RECORD_HEADER.size:
+                return
+            length, crc = RECORD_HEADER.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length or zlib.crc32(payload) != crc:
+                return
+            offset += RECORD_HEADER.size + length
+            yield offset, payload
+
+
+def read_records(path: Path, offset: int = 0) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Itera (posición final, registro) desde offset; se detiene en el primer registro incompleto o corrupto"""
+    for end, payload in read_payloads(path, offset):
+        yield end, json.loads(payload)
+
+
+class JournaledProgressPersistence(AbstractProgressPersistence):
+    """Persistencia con bitácora de solo anexado (append-only) y snapshots
+
+    - Cada cambio de progreso se anexa como un registro pequeño con solo las claves
+      modificadas; un examen terminado cuesta un único anexado (intento + cambios)
+    - De la serie de XP diaria se anexa solo la XP sumada al día del examen
+      ('xp_day': [fecha, xp]), no la serie completa
+    - Cada `snapshot_interval` registros se escribe un snapshot compactado con el
+      progreso completo y la posición de la bitácora hasta la que está aplicado
+    - Al iniciar se carga el snapshot y se reproducen solo los registros posteriores
+    - La bitácora nunca se trunca (salvo un registro final incompleto tras un corte):
+      es el historial completo de intentos
+
+    Formato de registro: [largo u32][crc32 u32][JSON compacto]
+    """
+
+    def __init__(self, save_dir: Path, snapshot_interval: int = 200, fsync: bool = True):
+        self.save_dir = Path(save_dir)
+        self.save_dir.mkdir(parents=True, exist_ok=True)
+        self.snapshot_interval = snapshot_interval
+        self.fsync = fsync
+        # Archivos progress_<usuario>.json antiguos: base si no hay snapshot
+        self.legacy = JsonProgressPersistence(self.save_dir)
+
+        self._lock = threading.Lock()
+        self._state: Dict[str, Dict[str, Any]] = {}
+        self._offsets: Dict[str, int] = {}
+        self._pending: Dict[str, int] = {}
+
+    def get_journal_path(self, user_id: str) -> Path:
+        return self.save_dir / f"progress_{user_id}.journal"
+
+    def get_snapshot_path(self, user_id: str) -> Path:
+        return self.save_dir / f"progress_{user_id}.snapshot.json"
+
+    def list_users(self) -> List[str]:
+        """Retorna los usuarios con bitácora, snapshot o archivo de progreso antiguo"""
+        users = set(self.legacy.list_users())
+        for pattern, suffix in (('progress_*.journal', '.journal'), ('progress_*.snapshot.json', '.snapshot.json')):
+            for path in self.save_dir.glob(pattern):
+                users.add(path.name[len('progress_'):-len(suffix)])
+        return sorted(users)
+
+    # Lectura
+
+    def _load_state(self, user_id: str) -> Dict[str, Any]:
+        """Carga el snapshot y reproduce la cola de la bitácora (una vez por usuario)"""
+        if user_id in self._state:
+            return self._state[user_id]
+
+        snapshot_path = self.get_snapshot_path(user_id)
+        offset = 0
+        if snapshot_path.exists():
+            with open(snapshot_path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            state = snapshot['progress']
+            offset = snapshot['journal_offset']
+        else:
+            state = self.legacy.load_progress(user_id)
+
+        replayed = 0
+        for end, record in self._read_records(user_id, offset):
+            self._apply(state, record)
+            offset = end
+            replayed += 1
+        self._truncate_tail(user_id, offset)
+
+        self._state[user_id] = state
+        self._offsets[user_id] = offset
+        self._pending[user_id] = replayed
+        return state
+
+    def _read_records(self, user_id: str, offset: int = 0) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Itera (posición final, registro) desde offset; se detiene en el primer registro incompleto o corrupto"""
+        return read_records(self.get_journal_path(user_id), offset)
+
+    def _truncate_tail(self, user_id: str, offset: int):
+        """Elimina un registro final incompleto (corte de luz o cierre abrupto)"""
+        journal_path = self.get_journal_path(user_id)
+        if journal_path.exists() and journal_path.stat().st_size > offset:
+            with open(journal_path, 'r+b') as f:
+                f.truncate(offset)
+
+    @staticmethod
+    def _apply(state: Dict[str, Any], record: Dict[str, Any]):
+        state.update(record.get('set', {}))
+        for key in record.get('del', []):
+            state.pop(key, None)
+        if 'xp_day' in record:
+            day, xp = record['xp_day']
+            data = state.get(DAILY_XP_KEY)
+            series = DailyXpSeries.from_dict(data) if isinstance(data, dict) else DailyXpSeries()
+            series.add(day, xp)
+            state[DAILY_XP_KEY] = series.to_dict()
+
+    @staticmethod
+    def _daily_xp_delta(state: Dict[str, Any], progress_data: Dict[str, Any]):
+        """[fecha, xp] si la nueva serie de XP diaria es la anterior más XP en el día del
+        último examen (lo que hace terminar un examen); None si cambió de otra forma"""
+        old, new = state.get(DAILY_XP_KEY), progress_data.get(DAILY_XP_KEY)
+        day = str(progress_data.get('last_exam_date', ''))[:10]
+        if not isinstance(new, dict) or not day or (old is not None and not isinstance(old, dict)):
+            return None
+        try:
+            series = DailyXpSeries.from_dict(old) if old is not None else DailyXpSeries()
+            xp = DailyXpSeries.from_dict(new).get(day) - series.get(day)
+            series.add(day, xp)
+        except (TypeError, ValueError):
+            return None
+        # Se verifica que reproducir el registro dé exactamente la serie nueva
+        return [day, xp] if series.to_dict() == new else None
+
+    def load_progress(self, user_id: str) -> Dict[str, Any]:
+        """
+        Args:
+            user_id (str): Identificador del usuario
+        Returns:
+            Dict: Datos de progreso del usuario o diccionario vacío si no existe
+        """
+        try:
+            with self._lock:
+                return copy.deepcopy(self._load_state(user_id))
+        except Exception as e:
+            print(f"Error loading progress: {e}")
+            return {}
+
+    def load_attempts(self, user_id: str) -> Iterator[Dict[str, Any]]:
+        """Itera todos los intentos de examen registrados en la bitácora"""
+        for _, record in self._read_records(user_id):
+            if 'attempt' in record:
+                yield record['attempt']
+
+    # Escritura
+
+    def _append(self, user_id: str, progress_data: Dict[str, Any], attempt: Dict[str, Any] = None) -> bool:
+        state = self._load_state(user_id)
+        record = {'time': str(datetime.now())}
+        changes = {key: value for key, value in progress_data.items()
+                   if key not in state or state[key] != value}
+        removed = [key for key in state if key not in progress_data]
+        if DAILY_XP_KEY in changes:
+            delta = self._daily_xp_delta(state, progress_data)
+            if delta is not None:
+                del changes[DAILY_XP_KEY]
+                record['xp_day'] = delta
+        if changes:
+            record['set'] = changes
+        if removed:
+            record['del'] = removed
+        if attempt is not None:
+            record['attempt'] = attempt
+        if len(record) == 1:
+            return True  # Sin cambios: no se escribe nada
+
+        data = pack_record(record)
+        with open(self.get_journal_path(user_id), 'ab') as f:
+            f.write(data)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+
+        self._state[user_id] = copy.deepcopy(progress_data)
+        self._offsets[user_id] += len(data)
+        self._pending[user_id] += 1
+        if self._pending[user_id] >= self.snapshot_interval:
+            self._write_snapshot(user_id)
+        return True
+
+    def _write_snapshot(self, user_id: str):
+        """Escribe atómicamente el progreso completo y la posición aplicada de la bitácora"""
+        snapshot_path = self.get_snapshot_path(user_id)
+        temp_path = snapshot_path.with_name(snapshot_path.name + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'journal_offset': self._offsets[user_id], 'progress': self._state[user_id]},
+                      f, ensure_ascii=False, separators=(',', ':'))
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(temp_path, snapshot_path)
+        self._pending[user_id] = 0
+
+    def save_progress(self, user_id: str, progress_data: Dict[str, Any]) -> bool:
+        """
+        Args:
+            user_id (str): Identificador del usuario
+            progress_data (Dict): Datos de progreso a guardar
+        Returns:
+            bool: True si el progreso se guardó correctamente, False en caso contrario
+        """
+        try:
+            with self._lock:
+                return self._append(user_id, progress_data)
+        except Exception as e:
+            print(f"Error saving progress: {e}")
+            return False
+
+    def record_attempt(self, user_id: str, attempt: Dict[str, Any], progress_data: Dict[str, Any]) -> bool:
+        """Registra un intento de examen y el nuevo progreso en un solo anexado"""
+        try:
+            with self._lock:
+                return self._append(user_id, progress_data, attempt)
+        except Exception as e:
+            print(f"Error saving progress: {e}")
+            return False
+
+    def release(self, user_id: str):
+        """Quita de memoria el estado de un usuario (para recorrer muchos usuarios sin acumularlos)
+
+        Los registros sin snapshot siguen en la bitácora: se reproducen al volver a cargarlo.
+        """
+        with self._lock:
+            self._state.pop(user_id, None)
+            self._offsets.pop(user_id, None)
+            self._pending.pop(user_id, None)
+
+    def compact(self, user_id: str = None):
+        """Escribe el snapshot de un usuario (o de todos los cargados) si hay registros pendientes"""
+        with self._lock:
+            for uid in ([user_id] if user_id else list(self._state)):
+                if self._pending.get(uid):
+                    self._write_snapshot(uid)
+
+    def close(self):
+        """Compacta antes de salir para que el próximo inicio no tenga que reproducir registros"""
+        self.compact()
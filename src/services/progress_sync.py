@@ -0,0 +1,187 @@
+"""
+Sincronización del progreso entre procesos
+
+- FileLock: bloqueo consultivo (advisory) sobre un archivo .lock, con flock en
+  POSIX (funciona también en directorios de red NFS/SMB montados en Linux) y
+  msvcrt.locking en Windows. Mide el tiempo de espera de cada adquisición y,
+  en POSIX, puede borrar el archivo .lock al liberarlo.
+- merge_progress: fusión a tres vías (base, nuestra versión, versión en disco)
+  para cuando otro proceso guardó después de que cargamos el progreso. Los
+  contadores acumulativos se suman en lugar de sobrescribirse.
+"""
+from time import perf_counter, sleep
+from pathlib import Path
+from typing import Any, Dict
+import copy
+import os
+from src.services.daily_xp import DailyXpSeries, LEGACY_PREFIX as DAILY_XP_PREFIX, PROGRESS_KEY as DAILY_XP_KEY
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+# Clave con la versión del documento (se incrementa en cada escritura)
+VERSION_KEY = '_version'
+
+# Contadores que solo crecen: se fusionan sumando las diferencias
+ADDITIVE_KEYS = ('total_xp', 'exams_completed')
+
+# Promedios ponderados por otro contador: (clave, clave del peso)
+WEIGHTED_AVERAGE_KEYS = (('average_accuracy', 'exams_completed'),)
+
+
+class FileLock:
+    """Bloqueo exclusivo entre procesos sobre un archivo
+
+    Uso:
+        with FileLock(path) as lock:
+            ...
+        lock.wait_time  # segundos esperando el bloqueo
+
+    Con remove=True el archivo .lock se borra al liberar (en POSIX), así no queda
+    uno por usuario. Quien esperaba sobre el archivo borrado lo detecta al
+    obtener el bloqueo (el archivo ya no es el de la ruta) y vuelve a intentarlo.
+    En Windows no se puede borrar un archivo abierto y se conserva.
+    """
+
+    def __init__(self, path: Path, poll_interval: float = 0.005, remove: bool = False):
+        self.path = Path(path)
+        self.poll_interval = poll_interval
+        self.remove = remove and fcntl is not None
+        self.wait_time = 0.0
+        self._file = None
+
+    def _is_current(self) -> bool:
+        """Si el archivo bloqueado sigue siendo el de la ruta (otro proceso no lo borró)"""
+        try:
+            path_stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        file_stat = os.fstat(self._file.fileno())
+        return (path_stat.st_dev, path_stat.st_ino) == (file_stat.st_dev, file_stat.st_ino)
+
+    def acquire(self):
+        start = perf_counter()
+        self._file = open(self.path, 'a+b')
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+                while self.remove and not self._is_current():
+                    self._file.close()
+                    self._file = open(self.path, 'a+b')
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            else:
+                # msvcrt.locking solo reintenta durante 10 s: se espera en un ciclo
+                self._file.seek(0)
+                while True:
+                    try:
+                        msvcrt.locking(self._file.fileno(), msvcrt.LK_NBLCK, 1)
+                        break
+                    except OSError:
+                        sleep(self.poll_interval)
+        except BaseException:
+            self._file.close()
+            self._file = None
+            raise
+        self.wait_time = perf_counter() - start
+
+    def release(self):
+        if self._file is None:
+            return
+        try:
+            if fcntl is not None:
+                if self.remove:
+                    # Se borra antes de soltar el bloqueo: nadie puede tomar este archivo después
+                    try:
+                        os.unlink(self.path)
+                    except OSError:
+                        pass
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> 'FileLock':
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+def _number(value) -> float:
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else 0
+
+
+def _merge_daily_series(base: Dict[str, Any], ours: Dict[str, Any], theirs: Dict[str, Any]) -> Dict[str, Any]:
+    """Suma a la serie en disco la XP diaria que agregamos desde la base
+
+    from_progress también incluye las claves daily_xp_YYYY-MM-DD antiguas, por lo
+    que migrar la serie en un solo proceso no duplica la XP.
+    """
+    base_series = DailyXpSeries.from_progress(dict(base))
+    merged = DailyXpSeries.from_progress(dict(theirs))
+    for day, xp in DailyXpSeries.from_progress(dict(ours)).days():
+        delta = xp - base_series.get(day)
+        if delta:
+            merged.add(day, delta)
+    return merged.to_dict()
+
+
+def merge_progress(base: Dict[str, Any], ours: Dict[str, Any], theirs: Dict[str, Any]) -> Dict[str, Any]:
+    """Fusiona nuestros cambios con los de otro proceso
+
+    Args:
+        base (Dict): Progreso que cargamos antes de modificarlo
+        ours (Dict): Progreso que queremos guardar
+        theirs (Dict): Progreso que otro proceso guardó mientras tanto
+    Returns:
+        Dict: Progreso fusionado
+
+    - total_xp, exams_completed y la XP diaria: disco + (nuestro - base)
+    - average_accuracy: promedio ponderado por exams_completed
+    - Resto de claves: gana nuestro valor si lo cambiamos; si no, el del disco
+    - 'level' no se recalcula aquí (depende de la dificultad; ver JsonProgressPersistence)
+    """
+    merged = copy.deepcopy(theirs)
+    merged.pop(VERSION_KEY, None)
+
+    for key, value in ours.items():
+        if key == VERSION_KEY or (key in base and base[key] == value):
+            continue
+        if key in ADDITIVE_KEYS or (key.startswith(DAILY_XP_PREFIX) and isinstance(value, int)):
+            merged[key] = _number(theirs.get(key)) + _number(value) - _number(base.get(key))
+        elif key == DAILY_XP_KEY and isinstance(value, dict):
+            merged[key] = _merge_daily_series(base, ours, theirs)
+            for legacy_key in [k for k in merged if k.startswith(DAILY_XP_PREFIX)]:
+                del merged[legacy_key]
+        elif key not in dict(WEIGHTED_AVERAGE_KEYS):
+            merged[key] = copy.deepcopy(value)
+
+    for key, weight_key in WEIGHTED_AVERAGE_KEYS:
+        # Se recalcula si cambió el promedio o su peso (un examen con la misma precisión
+        # que el promedio no cambia el valor, pero sí el peso)
+        if key not in ours or all(k in base and base[k] == ours.get(k) for k in (key, weight_key)):
+            continue
+        # Suma ponderada: la del disco más la que aportamos desde la base
+        total = (_number(theirs.get(key)) * _number(theirs.get(weight_key))
+                 + _number(ours[key]) * _number(ours.get(weight_key))
+                 - _number(base.get(key)) * _number(base.get(weight_key)))
+        weight = _number(merged.get(weight_key))
+        merged[key] = total / weight if weight else ours[key]
+
+    for key in base:
+        if key not in ours and key != VERSION_KEY:
+            merged.pop(key, None)
+    return merged
+
+
+def lock_path_for(save_path: Path) -> Path:
+    """Archivo de bloqueo que acompaña a un archivo de progreso"""
+    return save_path.with_name(save_path.stem + '.lock')
+
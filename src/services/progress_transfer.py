@@ -0,0 +1,345 @@
+"""
+Importación y exportación masiva del progreso (sin interfaz gráfica)
+
+Mueve el progreso de todos los usuarios entre una persistencia
+(AbstractProgressPersistence) y un único archivo:
+- JSONL: una línea por usuario {"user_id": "...", "progress": {...}}
+- CSV: columnas user_id, difficulty, total_xp, level, exams_completed y progress
+  (el documento completo en JSON); las columnas intermedias son solo informativas
+
+Los usuarios se procesan en flujo (memoria constante) y la lectura/escritura de
+archivos de progreso se hace en paralelo con un número acotado de operaciones
+en curso. --dry-run valida todos los registros sin escribir nada.
+
+Uso:
+    python -m src.services.progress_transfer export ~/.geograpy/progress curso.jsonl
+    python -m src.services.progress_transfer import curso.jsonl ~/.geograpy/progress --dry-run
+"""
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, TextIO, Tuple
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+from src.services.daily_xp import PROGRESS_KEY as DAILY_XP_KEY
+from src.services.level_system import AbstractProgressPersistence, ImprovedLevelSystem, JsonProgressPersistence
+
+CSV_FIELDS = ['user_id', 'difficulty', 'total_xp', 'level', 'exams_completed', 'progress']
+
+# Los identificadores forman parte del nombre de archivo: sin puntos ni separadores
+USER_ID_PATTERN = re.compile(r'^[\w\-@]+$')
+
+# Campos enteros no negativos del progreso
+COUNTER_FIELDS = ('total_xp', 'level', 'exams_completed')
+
+# Máximo de mensajes de error que se guardan en el reporte
+MAX_REPORTED_ERRORS = 20
+
+
+@dataclass
+class TransferReport:
+    """Clase para almacenar el resultado de una importación o exportación"""
+    processed: int = 0
+    written: int = 0
+    invalid: int = 0
+    failed: int = 0
+    errors: List[str] = field(default_factory=list)
+
+    def add_error(self, message: str):
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(message)
+
+
+def validate_record(user_id: Any, progress: Any) -> List[str]:
+    """Valida un registro de progreso
+
+    Args:
+        user_id: Identificador del usuario
+        progress: Documento de progreso
+    Returns:
+        List[str]: Errores encontrados (vacía si el registro es válido)
+    """
+    if not isinstance(user_id, str) or not USER_ID_PATTERN.match(user_id):
+        return [f"identificador inválido: {user_id!r}"]
+    if not isinstance(progress, dict):
+        return [f"{user_id}: el progreso debe ser un objeto"]
+
+    errors = []
+    for name in COUNTER_FIELDS:
+        value = progress.get(name)
+        if name in progress and (type(value) is not int or value < 0):
+            errors.append(f"{user_id}: {name} debe ser un entero no negativo ({value!r})")
+    accuracy = progress.get('average_accuracy')
+    if 'average_accuracy' in progress and (
+            isinstance(accuracy, bool) or not isinstance(accuracy, (int, float)) or not 0 <= accuracy <= 100):
+        errors.append(f"{user_id}: average_accuracy debe estar entre 0 y 100 ({accuracy!r})")
+    difficulty = progress.get('difficulty')
+    if 'difficulty' in progress and difficulty not in ImprovedLevelSystem.DIFFICULTIES:
+        errors.append(f"{user_id}: dificultad desconocida ({difficulty!r})")
+    daily = progress.get(DAILY_XP_KEY)
+    if DAILY_XP_KEY in progress and not (
+            isinstance(daily, dict) and all(type(xp) is int for xp in daily.get('values', []))):
+        errors.append(f"{user_id}: {DAILY_XP_KEY} no es una serie válida")
+    return errors
+
+
+def bounded_map(executor: Executor, function: Callable, items: Iterable, max_pending: int) -> Iterator[Tuple[Any, Any]]:
+    """Aplica function en paralelo con a lo sumo max_pending tareas en curso
+
+    Returns:
+        Iterator: Pares (elemento, resultado) en el mismo orden de items
+    """
+    pending = deque()
+    for item in items:
+        pending.append((item, executor.submit(function, item)))
+        if len(pending) >= max_pending:
+            done_item, future = pending.popleft()
+            yield done_item, future.result()
+    while pending:
+        done_item, future = pending.popleft()
+        yield done_item, future.result()
+
+
+# Lectura y escritura de archivos
+
+def read_jsonl_records(stream: TextIO) -> Iterator[Tuple[Any, Any]]:
+    """Lee registros (user_id, progreso) de un archivo JSONL"""
+    for number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield None, f"línea {number}: JSON inválido ({e.msg})"
+            continue
+        if not isinstance(record, dict):
+            yield None, f"línea {number}: se esperaba un objeto"
+            continue
+        yield record.get('user_id'), record.get('progress')
+
+
+def read_csv_records(stream: TextIO) -> Iterator[Tuple[Any, Any]]:
+    """Lee registros (user_id, progreso) de un archivo CSV"""
+    csv.field_size_limit(min(sys.maxsize, 2 ** 31 - 1))
+    reader = csv.DictReader(stream)
+    for number, row in enumerate(reader, start=2):
+        try:
+            progress = json.loads(row.get('progress') or '')
+        except json.JSONDecodeError as e:
+            yield None, f"línea {number}: progreso inválido ({e.msg})"
+            continue
+        yield row.get('user_id'), progress
+
+
+def write_jsonl_record(stream: TextIO, user_id: str, progress: Dict[str, Any]):
+    stream.write(json.dumps({'user_id': user_id, 'progress': progress},
+                            ensure_ascii=False, separators=(',', ':')) + '\n')
+
+
+def csv_writer(stream: TextIO) -> Callable[[TextIO, str, Dict[str, Any]], None]:
+    """Escribe el encabezado y retorna la función que escribe cada fila"""
+    writer = csv.writer(stream)
+    writer.writerow(CSV_FIELDS)
+
+    def write(_, user_id: str, progress: Dict[str, Any]):
+        writer.writerow([user_id, *(progress.get(name, '') for name in CSV_FIELDS[1:-1]),
+                         json.dumps(progress, ensure_ascii=False, separators=(',', ':'))])
+    return write
+
+
+# Operaciones
+
+def _releasing(persistence: AbstractProgressPersistence, operation: Callable) -> Callable:
+    """Envuelve una operación sobre un usuario para que la persistencia lo libere al terminar
+
+    La persistencia con bitácora guarda en memoria cada usuario cargado; sin liberarlos,
+    una transferencia masiva ocuparía memoria proporcional a la cantidad de usuarios.
+    """
+    release = getattr(persistence, 'release', None)
+    if release is None:
+        return operation
+
+    def run(user_id: str, *args):
+        try:
+            return operation(user_id, *args)
+        finally:
+            release(user_id)
+    return run
+
+
+def export_progress(persistence: AbstractProgressPersistence, user_ids: Iterable[str], stream: TextIO,
+                    file_format: str = 'jsonl', workers: int = 8, dry_run: bool = False) -> TransferReport:
+    """Exporta el progreso de los usuarios a un archivo JSONL o CSV
+
+    Args:
+        persistence (AbstractProgressPersistence): Persistencia de origen
+        user_ids (Iterable[str]): Usuarios a exportar (por ejemplo, persistence.list_users())
+        stream (TextIO): Archivo de destino
+        file_format (str): 'jsonl' o 'csv'
+        workers (int): Lecturas en paralelo
+        dry_run (bool): Solo valida, no escribe en stream
+    Returns:
+        TransferReport: Resultado de la exportación
+    """
+    report = TransferReport()
+    write = write_jsonl_record if file_format == 'jsonl' else None
+    if write is None and not dry_run:
+        write = csv_writer(stream)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        load = _releasing(persistence, persistence.load_progress)
+        for user_id, progress in bounded_map(executor, load, user_ids, workers * 4):
+            report.processed += 1
+            errors = validate_record(user_id, progress) if progress else [f"{user_id}: sin progreso"]
+            if errors:
+                report.invalid += 1
+                for error in errors:
+                    report.add_error(error)
+                continue
+            if not dry_run:
+                write(stream, user_id, progress)
+                report.written += 1
+    return report
+
+
+def import_progress(persistence: AbstractProgressPersistence, records: Iterable[Tuple[Any, Any]],
+                    workers: int = 8, dry_run: bool = False) -> TransferReport:
+    """Importa registros (user_id, progreso) a una persistencia
+
+    Los registros inválidos o con un usuario repetido se omiten y se informan.
+
+    Args:
+        persistence (AbstractProgressPersistence): Persistencia de destino (None en dry_run)
+        records (Iterable): Registros leídos con read_jsonl_records o read_csv_records
+        workers (int): Escrituras en paralelo
+        dry_run (bool): Solo valida, no guarda nada
+    Returns:
+        TransferReport: Resultado de la importación
+    """
+    report = TransferReport()
+    seen = set()
+
+    def valid_records():
+        for user_id, progress in records:
+            report.processed += 1
+            errors = [progress] if user_id is None else validate_record(user_id, progress)
+            if not errors and user_id in seen:
+                errors = [f"{user_id}: usuario repetido"]
+            if errors:
+                report.invalid += 1
+                for error in errors:
+                    report.add_error(error)
+                continue
+            seen.add(user_id)
+            yield user_id, progress
+
+    if dry_run:
+        for _ in valid_records():
+            pass
+        return report
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        save_progress = _releasing(persistence, persistence.save_progress)
+        save = lambda record: save_progress(*record)
+        for (user_id, _), saved in bounded_map(executor, save, valid_records(), workers * 4):
+            if saved:
+                report.written += 1
+            else:
+                report.failed += 1
+                report.add_error(f"{user_id}: no se pudo guardar")
+    return report
+
+
+def open_persistence(path: Path, backend: str = None, fsync: bool = True) -> AbstractProgressPersistence:
+    """Abre la persistencia de un directorio (JSON o journal) o de una base SQLite (.db)
+
+    Args:
+        path (Path): Directorio de progreso o base SQLite
+        backend (str): 'json', 'sqlite' o 'journal' (por defecto según la extensión)
+        fsync (bool): Forzar a disco cada archivo (False si se sincroniza al final)
+    """
+    if backend == 'sqlite' or (backend is None and path.suffix == '.db'):
+        from src.services.sqlite_progress import SqliteProgressPersistence
+        return SqliteProgressPersistence(path)
+    if backend == 'journal':
+        from src.services.progress_journal import JournaledProgressPersistence
+        return JournaledProgressPersistence(path, fsync=fsync)
+    return JsonProgressPersistence(path, fsync=fsync)
+
+
+def _detect_format(path: str, explicit: str = None) -> str:
+    if explicit:
+        return explicit
+    return 'csv' if path.endswith('.csv') else 'jsonl'
+
+
+def _print_report(action: str, report: TransferReport, dry_run: bool):
+    verb = "válidos" if dry_run else action
+    print(f"{report.processed} usuarios procesados, "
+          f"{report.processed - report.invalid if dry_run else report.written} {verb}, "
+          f"{report.invalid} inválidos, {report.failed} con error", file=sys.stderr)
+    for error in report.errors:
+        print(f"  {error}", file=sys.stderr)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Importa o exporta el progreso de todos los usuarios")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    export = subparsers.add_parser('export', help="Exporta el progreso a un archivo JSONL o CSV")
+    export.add_argument('source', type=Path, help="Directorio de progreso o base SQLite (.db)")
+    export.add_argument('archive', help="Archivo de destino, '-' para stdout")
+
+    import_ = subparsers.add_parser('import', help="Importa el progreso desde un archivo JSONL o CSV")
+    import_.add_argument('archive', help="Archivo de origen, '-' para stdin")
+    import_.add_argument('target', type=Path, help="Directorio de progreso o base SQLite (.db)")
+
+    for subparser in (export, import_):
+        subparser.add_argument('--format', choices=['jsonl', 'csv'])
+        subparser.add_argument('--backend', choices=['json', 'sqlite', 'journal'])
+        subparser.add_argument('-j', '--workers', type=int, default=8, help="Operaciones de archivo en paralelo")
+        subparser.add_argument('--dry-run', action='store_true', help="Solo valida, no escribe nada")
+    args = parser.parse_args(argv)
+
+    file_format = _detect_format(args.archive, args.format)
+    if args.command == 'export':
+        persistence = open_persistence(args.source, args.backend)
+        target = sys.stdout if args.archive == '-' or args.dry_run else \
+            open(args.archive, 'w', encoding='utf-8', newline='')
+        try:
+            report = export_progress(persistence, persistence.list_users(), target,
+                                     file_format, args.workers, args.dry_run)
+        finally:
+            if target is not sys.stdout:
+                target.close()
+        _print_report("exportados", report, args.dry_run)
+    else:
+        # Un fsync por archivo domina el tiempo de una importación masiva: si el sistema
+        # permite sincronizar todo de una vez (os.sync), se hace una sola vez al final
+        sync_at_end = hasattr(os, 'sync')
+        persistence = None if args.dry_run else \
+            open_persistence(args.target, args.backend, fsync=not sync_at_end)
+        source = sys.stdin if args.archive == '-' else open(args.archive, 'r', encoding='utf-8', newline='')
+        try:
+            read = read_csv_records if file_format == 'csv' else read_jsonl_records
+            report = import_progress(persistence, read(source), args.workers, args.dry_run)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+            if sync_at_end and not args.dry_run:
+                os.sync()
+        _print_report("importados", report, args.dry_run)
+
+    if persistence is not None and hasattr(persistence, 'close'):
+        persistence.close()
+    return 1 if report.invalid or report.failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,120 @@
+from typing import Any, Dict
+import atexit
+import copy
+import threading
+import time
+from src.services.level_system import AbstractProgressPersistence
+
+
+class WriteBehindProgressPersistence(AbstractProgressPersistence):
+    """Persistencia con escritura diferida (write-behind) sobre otra persistencia
+
+    - El progreso se mantiene en memoria; save_progress solo lo marca como sucio
+    - Los cambios se agrupan durante una ventana corta (flush_delay) y un hilo en
+      segundo plano escribe una sola vez el último estado de cada usuario
+    - flush() fuerza la escritura y close() se ejecuta también al salir del programa
+    """
+
+    def __init__(self, backend: AbstractProgressPersistence, flush_delay: float = 1.0):
+        """
+        Args:
+            backend (AbstractProgressPersistence): Persistencia real (por ejemplo, JSON)
+            flush_delay (float): Segundos que se agrupan los cambios antes de escribir
+        """
+        self.backend = backend
+        self.flush_delay = flush_delay
+
+        self._cache: Dict[str, Dict[str, Any]] = {}
+        self._dirty = set()
+        self._deadline = None
+        self._closed = False
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+
+        # Contadores: guardados solicitados vs escrituras reales a disco
+        self.save_requests = 0
+        self.disk_writes = 0
+
+        self._thread = threading.Thread(target=self._run, name='progress-write-behind', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def load_progress(self, user_id: str) -> Dict[str, Any]:
+        """
+        Args:
+            user_id (str): Identificador del usuario
+        Returns:
+            Dict: Copia del progreso en memoria (se lee del backend solo la primera vez)
+        """
+        with self._condition:
+            if user_id not in self._cache:
+                self._cache[user_id] = self.backend.load_progress(user_id)
+            return copy.deepcopy(self._cache[user_id])
+
+    def save_progress(self, user_id: str, progress_data: Dict[str, Any]) -> bool:
+        """
+        Args:
+            user_id (str): Identificador del usuario
+            progress_data (Dict): Datos de progreso a guardar
+        Returns:
+            bool: True si el cambio quedó registrado para escribirse
+        """
+        with self._condition:
+            if self._closed:
+                return self.backend.save_progress(user_id, progress_data)
+
+            self._cache[user_id] = copy.deepcopy(progress_data)
+            self._dirty.add(user_id)
+            self.save_requests += 1
+            if self._deadline is None:
+                self._deadline = time.monotonic() + self.flush_delay
+                self._condition.notify()
+        return True
+
+    def flush(self) -> bool:
+        """Escribe inmediatamente los usuarios con cambios pendientes
+
+        Returns:
+            bool: True si todas las escrituras fueron exitosas
+        """
+        with self._flush_lock:
+            with self._condition:
+                pending = {user_id: self._cache[user_id] for user_id in self._dirty}
+                self._dirty.clear()
+                self._deadline = None
+
+            success = True
+            for user_id, progress_data in pending.items():
+                if self.backend.save_progress(user_id, progress_data):
+                    self.disk_writes += 1
+                else:
+                    success = False
+                    # Reintentar en la próxima ventana si no hubo un cambio más nuevo
+                    with self._condition:
+                        self._dirty.add(user_id)
+                        if self._deadline is None:
+                            self._deadline = time.monotonic() + self.flush_delay
+            return success
+
+    def close(self):
+        """Fuerza la escritura de los cambios pendientes y detiene el hilo"""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+        self.flush()
+        atexit.unregister(self.close)
+
+    def _run(self):
+        """Hilo en segundo plano: espera a que venza la ventana y escribe"""
+        while True:
+            with self._condition:
+                while not self._closed and (
+                        self._deadline is None or self._deadline > time.monotonic()):
+                    timeout = None if self._deadline is None else self._deadline - time.monotonic()
+                    self._condition.wait(timeout)
+                if self._closed:
+                    return
+            self.flush()
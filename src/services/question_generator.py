@@ -0,0 +1,245 @@
+"""
+Generador de preguntas a partir de countries.json
+
+Produce preguntas ilimitadas de capital, moneda, idioma, animal típico y
+comparación de superficie, con el mismo formato que las de exams.json
+(question, image, options, correct, explanation).
+
+Los índices por atributo se calculan una sola vez: para cada país y respuesta
+se guardan el texto de la pregunta, la explicación y los distractores válidos
+(valores que no corresponden a ese país). Cada pregunta se arma al pedirla
+eligiendo las opciones incorrectas en O(opciones), por lo que generate() es un
+generador infinito que nunca materializa el conjunto.
+"""
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Tuple
+import json
+import random
+import re
+import unicodedata
+from src.services.exam_catalog import ExamSummary
+from src.utils.constants import COUNTRIES_DATA, COUNTRIES_PATH
+
+KINDS = ('capital', 'currency', 'language', 'animal', 'area')
+GENERATED_EXAM_ID = 'paises_generado'
+# Imagen para las preguntas que no son de un país (la bandera delataría la respuesta)
+GENERIC_IMAGE = 'america-preview.png'
+
+
+class _Stem(NamedTuple):
+    """Pregunta precalculada de un atributo: todo menos las opciones incorrectas"""
+    question: str
+    image: str
+    correct: str
+    explanation: str
+    distractors: Tuple[str, ...]  # Valores que no corresponden al país
+
+
+def _image_name(country_name: str) -> str:
+    """'Estados Unidos' -> 'estados_unidos.png' (como en resources/images/countries)"""
+    ascii_name = unicodedata.normalize('NFKD', country_name).encode('ascii', 'ignore').decode()
+    return re.sub(r'\W+', '_', ascii_name.lower()).strip('_') + '.png'
+
+
+def _parse_area(text: str) -> int:
+    """'756,096 km²' -> 756096 (None si no tiene número)"""
+    digits = re.sub(r'[^\d]', '', text.split('km')[0])
+    return int(digits) if digits else None
+
+
+class QuestionGenerator:
+    """Generador de preguntas sobre países con índices precalculados por atributo"""
+
+    def __init__(self, countries: List[dict] = None, option_count: int = 4, seed: int = None,
+                 images_path: Path = COUNTRIES_PATH):
+        """
+        Args:
+            countries (List[dict]): Países con el formato de countries.json
+                (por defecto se leen de COUNTRIES_DATA)
+            option_count (int): Opciones por pregunta (incluida la correcta)
+            seed (int): Semilla para obtener siempre la misma secuencia
+            images_path (Path): Carpeta con las imágenes de los países
+        """
+        if countries is None:
+            with open(COUNTRIES_DATA, 'r', encoding='utf-8') as f:
+                countries = json.load(f)['paises']
+        if option_count < 2:
+            raise ValueError("Se requieren al menos dos opciones por pregunta")
+        self.countries = countries
+        self.option_count = option_count
+        self._random = random.Random(seed).random
+
+        available_images = {path.name for path in images_path.glob('*.png')} if images_path.exists() else set()
+        self._names = tuple(country['nombre'] for country in countries)
+        self._images = tuple(
+            image if image in available_images else GENERIC_IMAGE
+            for image in map(_image_name, self._names)
+        )
+
+        self._stems: Dict[str, Tuple[_Stem, ...]] = {
+            'capital': self._build_stems(
+                lambda c: [c['capital']] if c.get('capital') else [],
+                lambda name, value, c: (f"¿Cuál es la capital de {name}?",
+                                        f"La capital de {name} es {value}.")),
+            'currency': self._build_stems(
+                lambda c: [c['moneda']] if c.get('moneda') else [],
+                lambda name, value, c: (f"¿Cuál es la moneda de {name}?",
+                                        f"La moneda oficial de {name} es {value}.")),
+            'language': self._build_stems(
+                lambda c: c.get('idiomas', []),
+                lambda name, value, c: (f"¿Qué idioma se habla en {name}?",
+                                        f"En {name} se habla {', '.join(c['idiomas']).lower()}.")),
+            'animal': self._build_stems(
+                lambda c: c.get('animales_tipicos', []),
+                lambda name, value, c: (f"¿Cuál de estos animales es típico de {name}?",
+                                        self._animal_explanation(name, value, c))),
+        }
+
+        # Superficies distintas, para que siempre haya un único país más grande
+        areas = {}
+        for i, country in enumerate(countries):
+            area = _parse_area(country.get('superficie', ''))
+            if area is not None and area not in areas.values():
+                areas[i] = area
+        self._areas = areas
+        self._area_countries = tuple(areas)
+
+        self.kinds = tuple(kind for kind in KINDS if self._has_questions(kind))
+
+    def _build_stems(self, values: Callable[[dict], List[str]],
+                     texts: Callable[[str, str, dict], Tuple[str, str]]) -> Tuple[_Stem, ...]:
+        """Precalcula una pregunta por cada (país, respuesta) y sus distractores válidos
+
+        Args:
+            values: Respuestas correctas de un país para el atributo
+            texts: (nombre, respuesta, país) -> (texto de la pregunta, explicación)
+        Returns:
+            Tuple[_Stem, ...]: Solo las preguntas con distractores suficientes
+        """
+        answers = [tuple(values(country)) for country in self.countries]
+        all_values = tuple(dict.fromkeys(value for country_values in answers for value in country_values))
+        stems = []
+        for i, country_values in enumerate(answers):
+            own = set(country_values)
+            distractors = tuple(value for value in all_values if value not in own)
+            if len(distractors) < self.option_count - 1:
+                continue
+            for value in country_values:
+                question, explanation = texts(self._names[i], value, self.countries[i])
+                stems.append(_Stem(question, self._images[i], value, explanation, distractors))
+        return tuple(stems)
+
+    @staticmethod
+    def _animal_explanation(name: str, animal: str, country: dict) -> str:
+        explanation = f"{animal} es un animal típico de {name}."
+        fact = country.get('dato_curioso', '')
+        if animal.lower() in fact.lower():
+            explanation += f" {fact}"
+        return explanation
+
+    def _has_questions(self, kind: str) -> bool:
+        if kind == 'area':
+            return len(self._area_countries) >= self.option_count
+        return bool(self._stems[kind])
+
+    def _sample(self, values: Tuple, count: int) -> List:
+        """`count` valores distintos al azar
+
+        count es pequeño frente a len(values), así que descartar repetidos es más
+        rápido que Random.sample; random() + índice evita el costo de randrange.
+        """
+        size = len(values)
+        picked = []
+        while len(picked) < count:
+            i = int(self._random() * size)
+            if i not in picked:
+                picked.append(i)
+        return [values[i] for i in picked]
+
+    def _area_question(self) -> dict:
+        countries = self._sample(self._area_countries, self.option_count)
+        largest = self._random() < 0.5
+        answer = (max if largest else min)(countries, key=self._areas.__getitem__)
+        name = self._names[answer]
+        comparison = 'mayor' if largest else 'menor'
+        return {
+            'question': f"¿Cuál de estos países tiene {comparison} superficie?",
+            'image': GENERIC_IMAGE,
+            'options': [self._names[i] for i in countries],
+            'correct': name,
+            'explanation': f"{name} tiene {self.countries[answer]['superficie']}, "
+                           f"la {comparison} superficie entre las opciones."
+        }
+
+    def generate(self, kinds: Iterable[str] = None) -> Iterator[dict]:
+        """Genera preguntas sin fin, eligiendo al azar entre los tipos pedidos
+
+        Args:
+            kinds (Iterable[str]): Tipos de pregunta (KINDS); por defecto todos los disponibles
+        Returns:
+            Iterator[dict]: Preguntas con el formato de exams.json
+        """
+        kinds = tuple(kinds) if kinds is not None else self.kinds
+        unknown = [kind for kind in kinds if kind not in self.kinds]
+        if unknown or not kinds:
+            raise ValueError(f"Tipos de pregunta no disponibles: {unknown or 'ninguno'}")
+        # None marca las preguntas de superficie, que combinan varios países
+        sources = tuple(self._stems.get(kind) for kind in kinds)
+        random_, sample = self._random, self._sample
+        option_count, distractor_count = self.option_count, self.option_count - 1
+        while True:
+            stems = sources[int(random_() * len(sources))]
+            if stems is None:
+                yield self._area_question()
+                continue
+            stem = stems[int(random_() * len(stems))]
+            options = sample(stem.distractors, distractor_count)
+            options.insert(int(random_() * option_count), stem.correct)
+            yield {
+                'question': stem.question,
+                'image': stem.image,
+                'options': options,
+                'correct': stem.correct,
+                'explanation': stem.explanation
+            }
+
+    def questions(self, count: int, kinds: Iterable[str] = None) -> Iterator[dict]:
+        """Las siguientes `count` preguntas (sin crearlas todas de antemano)"""
+        return islice(self.generate(kinds), count)
+
+    def exam_summary(self, question_count: int = 10) -> ExamSummary:
+        """Resumen del examen de práctica generado, para listarlo junto a los demás"""
+        return ExamSummary(
+            id=GENERATED_EXAM_ID,
+            category='paises',
+            title="Práctica: preguntas generadas",
+            difficulty='Media',
+            xp=100,
+            icon='paises-preview.png',
+            question_count=question_count
+        )
+
+    def build_exam(self, question_count: int = 10, kinds: Iterable[str] = None) -> dict:
+        """Examen de práctica con preguntas nuevas, en el formato que usa ExamWindow"""
+        summary = self.exam_summary(question_count)
+        return {
+            'id': summary.id,
+            'category': summary.category,
+            'title': summary.title,
+            'difficulty': summary.difficulty,
+            'xp': summary.xp,
+            'icon': summary.icon,
+            'questions': list(self.questions(question_count, kinds))
+        }
+
+
+_default_generator: QuestionGenerator = None
+
+
+def get_question_generator() -> QuestionGenerator:
+    """Generador compartido a partir de countries.json"""
+    global _default_generator
+    if _default_generator is None:
+        _default_generator = QuestionGenerator()
+    return _default_generator
@@ -0,0 +1,366 @@
+"""
+Repaso espaciado de preguntas (estilo SM-2 con cajas de Leitner)
+
+Cada pregunta respondida por el usuario es un ReviewItem con su intervalo, su
+factor de facilidad y la fecha en que vuelve a tocar repasarla:
+- Respuesta correcta: el intervalo crece (1 día, 6 días y luego intervalo x facilidad)
+  y la pregunta sube de caja
+- Respuesta incorrecta: vuelve a la primera caja, la facilidad baja y se repasa
+  de nuevo en LAPSE_DELAY segundos
+
+Las preguntas pendientes se mantienen en un montículo (heap) ordenado por fecha,
+por lo que tomar las N siguientes de un banco de n preguntas cuesta O(N log n).
+Las entradas viejas del montículo (de preguntas que se repasaron después) no se
+borran: se descartan al salir, comparando su fecha con la del ReviewItem.
+
+El estado de cada usuario se guarda de forma incremental, como el progreso:
+- review_<usuario>.journal: bitácora de solo anexado con un registro por pregunta
+  repasada (su estado completo); guardar al terminar un examen anexa solo las
+  preguntas respondidas en él, con una única escritura
+- review_<usuario>.json: instantánea que se reescribe al cargar cuando la
+  bitácora ya tiene más registros que preguntas (los registros son idempotentes:
+  un corte a mitad de la compactación no pierde nada)
+
+De las preguntas del catálogo se guarda solo el id del examen y se vuelven a
+leer del banco al armar el repaso; el texto completo se guarda únicamente si la
+pregunta no está en el catálogo (exámenes generados) o cambió desde entonces.
+"""
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import time
+from typing import Any, Callable, Dict, List, Optional, Set
+import hashlib
+import heapq
+import json
+import os
+from src.services.exam_catalog import get_exam_catalog
+from src.services.progress_journal import pack_record, read_records
+
+DAY = 86400.0
+LAPSE_DELAY = 600.0
+MIN_EASE = 1.3
+INITIAL_EASE = 2.5
+MAX_BOX = 5
+REVIEW_EXAM_ID = 'repaso'
+STATE_VERSION = 2
+# Registros de la bitácora a partir de los cuales se compacta (como mínimo)
+COMPACT_RECORDS = 1000
+QUESTION_FIELDS = ('question', 'image', 'options', 'correct', 'explanation')
+
+
+def question_key(question: Dict[str, Any]) -> str:
+    """Identificador estable de una pregunta (texto, imagen y respuesta correcta)"""
+    text = '\x1f'.join((question.get('question', ''), question.get('image', ''), question.get('correct', '')))
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+
+def _questions_by_key(resolve: Callable[[str], Optional[dict]], exam_id: str,
+                      cache: Dict[str, Dict[str, dict]]) -> Dict[str, dict]:
+    """Preguntas del examen `exam_id` por question_key (un acceso al banco por examen)"""
+    questions = cache.get(exam_id)
+    if questions is None:
+        exam = resolve(exam_id) if resolve is not None else None
+        questions = cache[exam_id] = {question_key(q): q for q in (exam or {}).get('questions', [])}
+    return questions
+
+
+@dataclass
+class ReviewItem:
+    """Estado de repaso de una pregunta"""
+    key: str
+    due: float  # Timestamp en que toca repasarla
+    interval: float = 0.0  # Días
+    ease: float = INITIAL_EASE
+    repetitions: int = 0  # Aciertos seguidos
+    lapses: int = 0
+    box: int = 1  # Caja de Leitner (1..MAX_BOX)
+    # Vacía si todavía no se leyó del banco (ver source)
+    question: Dict[str, Any] = field(default_factory=dict)
+    # Id del examen del catálogo que contiene la pregunta (None: se guarda su texto)
+    source: Optional[str] = None
+
+
+class SpacedRepetitionScheduler:
+    """Planificador de repasos de un usuario con montículo de preguntas pendientes
+
+    Args:
+        items (List[ReviewItem]): Estado inicial
+        resolve (Callable): Examen del catálogo por id (o None), para leer las
+            preguntas guardadas solo con su source
+    """
+
+    def __init__(self, items: List[ReviewItem] = None, resolve: Callable[[str], Optional[dict]] = None):
+        self.items: Dict[str, ReviewItem] = {item.key: item for item in items or []}
+        self.resolve = resolve
+        # Claves modificadas (o borradas) desde el último guardado
+        self.dirty: Set[str] = set()
+        # (fecha, clave): puede haber entradas viejas, ver _valid
+        self._heap = [(item.due, item.key) for item in self.items.values()]
+        heapq.heapify(self._heap)
+
+    def _valid(self, entry) -> bool:
+        item = self.items.get(entry[1])
+        return item is not None and item.due == entry[0]
+
+    def review(self, question: Dict[str, Any], correct: bool, now: float = None, key: str = None,
+               source: str = None) -> ReviewItem:
+        """Registra una respuesta y programa el próximo repaso de la pregunta
+
+        Args:
+            question (Dict): Pregunta con el formato de exams.json
+            correct (bool): Si la respuesta fue correcta
+            now (float): Timestamp de la respuesta (por defecto, ahora)
+            key (str): question_key(question), si ya se calculó
+            source (str): Id del examen del catálogo del que salió la pregunta
+                (None: se mantiene el que tenía)
+        Returns:
+            ReviewItem: Estado actualizado
+        """
+        now = time() if now is None else now
+        key = key or question_key(question)
+        item = self.items.get(key)
+        if item is None:
+            item = self.items[key] = ReviewItem(key=key, due=now)
+        item.question = {name: question[name] for name in QUESTION_FIELDS if name in question}
+        if source is not None:
+            item.source = source
+        self.dirty.add(key)
+
+        if correct:
+            item.repetitions += 1
+            if item.repetitions == 1:
+                item.interval = 1.0
+            elif item.repetitions == 2:
+                item.interval = 6.0
+            else:
+                item.interval = round(item.interval * item.ease, 2)
+            item.ease += 0.1
+            item.box = min(MAX_BOX, item.box + 1)
+            item.due = now + item.interval * DAY
+        else:
+            item.repetitions = 0
+            item.lapses += 1
+            item.interval = 0.0
+            item.ease = max(MIN_EASE, item.ease - 0.2)
+            item.box = 1
+            item.due = now + LAPSE_DELAY
+
+        heapq.heappush(self._heap, (item.due, key))
+        # Si las entradas viejas superan a las vigentes, se reconstruye el montículo
+        if len(self._heap) > 2 * len(self.items) + 64:
+            self._heap = [(i.due, i.key) for i in self.items.values()]
+            heapq.heapify(self._heap)
+        return item
+
+    def next_due(self, count: int, now: float = None) -> List[ReviewItem]:
+        """Las `count` preguntas pendientes más atrasadas, en O(count log n)
+
+        Las preguntas siguen pendientes hasta que se repasan (review).
+        """
+        now = time() if now is None else now
+        heap = self._heap
+        selected = []
+        while heap and len(selected) < count and heap[0][0] <= now:
+            entry = heapq.heappop(heap)
+            if self._valid(entry):
+                selected.append(entry)
+        for entry in selected:
+            heapq.heappush(heap, entry)
+        return [self.items[key] for _, key in selected]
+
+    def forget(self, key: str):
+        """Quita una pregunta del repaso (su entrada del montículo queda vieja)"""
+        if self.items.pop(key, None) is not None:
+            self.dirty.add(key)
+
+    def due_count(self, now: float = None, limit: int = None) -> int:
+        """Número de preguntas pendientes (a lo sumo `limit`, para no recorrer todas)"""
+        return len(self.next_due(limit if limit is not None else len(self.items), now))
+
+    def build_review_exam(self, count: int = 10, now: float = None) -> dict:
+        """Examen de repaso con las preguntas pendientes, en el formato que usa ExamWindow
+
+        Las preguntas guardadas solo con su source se leen del banco; las que ya no
+        están en él se quitan del repaso.
+
+        Returns:
+            dict: Examen, o None si no hay preguntas pendientes
+        """
+        exams = {}
+        while True:
+            items = self.next_due(count, now)
+            missing = [item for item in items if not item.question]
+            for item in missing:
+                question = _questions_by_key(self.resolve, item.source, exams).get(item.key) if item.source else None
+                if question is None:
+                    self.forget(item.key)
+                else:
+                    item.question = {name: question[name] for name in QUESTION_FIELDS if name in question}
+            if all(item.question for item in missing):
+                break
+        if not items:
+            return None
+        return {
+            'id': REVIEW_EXAM_ID,
+            'category': REVIEW_EXAM_ID,
+            'title': "Repaso de preguntas pendientes",
+            'difficulty': 'Media',
+            'xp': 50,
+            'icon': 'paises-preview.png',
+            'questions': [dict(item.question) for item in items]
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Instantánea: una fila por pregunta con los campos de ReviewItem en orden (sin el texto si tiene source)"""
+        return {'version': STATE_VERSION,
+                'items': [[item.key, item.due, item.interval, item.ease, item.repetitions, item.lapses, item.box,
+                           item.question if item.source is None else {}, item.source]
+                          for item in self.items.values()]}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], resolve: Callable[[str], Optional[dict]] = None
+                  ) -> 'SpacedRepetitionScheduler':
+        if data.get('version', 1) == 1:
+            return cls([ReviewItem(**item) for item in data.get('items', [])], resolve)
+        return cls([ReviewItem(*row) for row in data.get('items', [])], resolve)
+
+
+def _item_record(item: ReviewItem) -> Dict[str, Any]:
+    """Registro con el estado completo de una pregunta: su source o, si no tiene, su texto"""
+    record = {'k': item.key, 'd': item.due, 'i': item.interval, 'e': item.ease,
+              'r': item.repetitions, 'l': item.lapses, 'b': item.box}
+    if item.source is not None:
+        record['s'] = item.source
+    else:
+        record['q'] = item.question
+    return record
+
+
+def _apply_record(items: Dict[str, ReviewItem], record: Dict[str, Any]):
+    """Aplica un registro de la bitácora o de la instantánea (idempotente)"""
+    if record.get('x'):
+        items.pop(record['k'], None)
+        return
+    items[record['k']] = ReviewItem(key=record['k'], due=record['d'], interval=record['i'], ease=record['e'],
+                                    repetitions=record['r'], lapses=record['l'], box=record['b'],
+                                    question=record.get('q') or {}, source=record.get('s'))
+
+
+def _catalog_exam(exam_id: str) -> Optional[dict]:
+    return get_exam_catalog().get_exam(exam_id)
+
+
+class ReviewStateStore:
+    """Guarda el estado de repaso de cada usuario (instantánea + bitácora de solo anexado)
+
+    Args:
+        save_dir (Path): Directorio de los archivos
+        resolve (Callable): Examen del catálogo por id, o None si no existe
+            (por defecto, el catálogo de la aplicación)
+    """
+
+    def __init__(self, save_dir: Path, resolve: Callable[[str], Optional[dict]] = None):
+        self.save_dir = Path(save_dir)
+        self.resolve = resolve or _catalog_exam
+        self._schedulers: Dict[str, SpacedRepetitionScheduler] = {}
+
+    def get_path(self, user_id: str) -> Path:
+        return self.save_dir / f"review_{user_id}.json"
+
+    def get_journal_path(self, user_id: str) -> Path:
+        return self.save_dir / f"review_{user_id}.journal"
+
+    def get_scheduler(self, user_id: str) -> SpacedRepetitionScheduler:
+        """Planificador del usuario (se lee del disco una sola vez)"""
+        scheduler = self._schedulers.get(user_id)
+        if scheduler is None:
+            scheduler = self._schedulers[user_id] = self._load(user_id)
+        return scheduler
+
+    def _load(self, user_id: str) -> SpacedRepetitionScheduler:
+        """Instantánea + bitácora; descarta el registro final incompleto y compacta si hace falta"""
+        path = self.get_path(user_id)
+        try:
+            if path.exists():
+                with open(path, 'r', encoding='utf-8') as f:
+                    scheduler = SpacedRepetitionScheduler.from_dict(json.load(f), self.resolve)
+            else:
+                scheduler = SpacedRepetitionScheduler(resolve=self.resolve)
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            print(f"Error al cargar el estado de repaso: {e}")
+            scheduler = SpacedRepetitionScheduler(resolve=self.resolve)
+
+        journal_path = self.get_journal_path(user_id)
+        items = scheduler.items
+        records = end = 0
+        try:
+            for end, record in read_records(journal_path):
+                _apply_record(items, record)
+                records += 1
+            if journal_path.exists() and journal_path.stat().st_size > end:
+                with open(journal_path, 'r+b') as f:
+                    f.truncate(end)
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            print(f"Error al leer la bitácora del estado de repaso: {e}")
+        if records:
+            scheduler = SpacedRepetitionScheduler(list(items.values()), self.resolve)
+
+        if records > max(COMPACT_RECORDS, len(scheduler.items)):
+            self._compact(user_id, scheduler)
+        return scheduler
+
+    def _compact(self, user_id: str, scheduler: SpacedRepetitionScheduler) -> bool:
+        """Reescribe la instantánea (escritura atómica) y vacía la bitácora"""
+        path = self.get_path(user_id)
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            data = json.dumps(scheduler.to_dict(), ensure_ascii=False, separators=(',', ':'))
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+            with open(self.get_journal_path(user_id), 'wb'):
+                pass
+            return True
+        except OSError as e:
+            print(f"Error al compactar el estado de repaso: {e}")
+            return False
+
+    def save(self, user_id: str) -> bool:
+        """Anexa a la bitácora las preguntas modificadas desde el último guardado (una sola escritura)
+
+        El source de cada pregunta se comprueba contra el catálogo; si el examen ya no
+        la contiene se guarda su texto.
+        """
+        scheduler = self._schedulers.get(user_id)
+        if scheduler is None or not scheduler.dirty:
+            return True
+        exams = {}
+        records = []
+        for key in scheduler.dirty:
+            item = scheduler.items.get(key)
+            if item is None:
+                records.append(pack_record({'k': key, 'x': 1}))
+                continue
+            if item.source is not None and key not in _questions_by_key(self.resolve, item.source, exams):
+                item.source = None
+            records.append(pack_record(_item_record(item)))
+        try:
+            self.save_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.get_journal_path(user_id), 'ab') as f:
+                f.write(b''.join(records))
+            scheduler.dirty.clear()
+            return True
+        except OSError as e:
+            print(f"Error al guardar el estado de repaso: {e}")
+            return False
+
+
+_default_store: ReviewStateStore = None
+
+
+def get_review_store() -> ReviewStateStore:
+    """Estado de repaso compartido de la aplicación (~/.geograpy/review)"""
+    global _default_store
+    if _default_store is None:
+        _default_store = ReviewStateStore(Path.home() / '.geograpy' / 'review')
+    return _default_store
@@ -0,0 +1,298 @@
+"""
+Persistencia del progreso en SQLite
+
+Guarda el progreso de muchos usuarios en una sola base de datos en modo WAL,
+con tablas indexadas para usuarios, progreso y XP diaria, de modo que se
+pueden hacer consultas entre usuarios (ranking, XP de un día, etc.).
+
+Migración única desde los archivos JSON existentes:
+    python -m src.services.sqlite_progress migrate ~/.geograpy/progress
+"""
+from array import array
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+import argparse
+import json
+import sqlite3
+import sys
+import threading
+from src.services.daily_xp import DailyXpSeries, LEGACY_PREFIX as DAILY_XP_PREFIX, PROGRESS_KEY as DAILY_XP_KEY
+from src.services.level_system import AbstractProgressPersistence, JsonProgressPersistence
+
+# Campos del progreso con columna propia: (nombre, tipo de Python)
+PROGRESS_COLUMNS = (
+    ('difficulty', str),
+    ('total_xp', int),
+    ('level', int),
+    ('exams_completed', int),
+    ('average_accuracy', float),
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    user_id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS progress (
+    user_id TEXT PRIMARY KEY REFERENCES users(user_id) ON DELETE CASCADE,
+    difficulty TEXT,
+    total_xp INTEGER,
+    level INTEGER,
+    exams_completed INTEGER,
+    average_accuracy REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_progress_total_xp ON progress(total_xp DESC);
+CREATE INDEX IF NOT EXISTS idx_progress_difficulty ON progress(difficulty, total_xp DESC);
+
+CREATE TABLE IF NOT EXISTS daily_xp (
+    user_id TEXT NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
+    day TEXT NOT NULL,
+    xp INTEGER NOT NULL,
+    PRIMARY KEY (user_id, day)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_daily_xp_day ON daily_xp(day);
+"""
+
+
+class SqliteProgressPersistence(AbstractProgressPersistence):
+    """Implementación de persistencia usando SQLite (modo WAL)
+
+    - Los campos principales (dificultad, XP, nivel, ...) tienen columna propia e índices
+    - La XP diaria (serie compacta o claves daily_xp_YYYY-MM-DD antiguas) se guarda
+      como filas de la tabla daily_xp
+    - El resto del documento se guarda como JSON compacto en la columna data
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # Una sola conexión compartida (protegida con lock) para poder usarla desde
+        # el hilo de escritura diferida
+        self._connection = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.execute('PRAGMA foreign_keys=ON')
+        self._connection.executescript(SCHEMA)
+
+    def close(self):
+        """Cierra la conexión con la base de datos"""
+        with self._lock:
+            self._connection.close()
+
+    @staticmethod
+    def _split(progress_data: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Tuple[str, int]], Dict[str, Any]]:
+        """Separa el documento en columnas, XP diaria y resto (JSON)"""
+        columns = {}
+        daily = []
+        rest = {}
+        column_types = dict(PROGRESS_COLUMNS)
+        for key, value in progress_data.items():
+            expected = column_types.get(key)
+            if expected is not None and type(value) is expected:
+                columns[key] = value
+            elif key == DAILY_XP_KEY and isinstance(value, dict):
+                # Los días con XP van a la tabla; en el JSON quedan los totales, la retención
+                # y el rango de la serie (los días en cero no tienen fila)
+                series = DailyXpSeries.from_dict(value)
+                daily.extend((day.isoformat(), xp) for day, xp in series.days())
+                rest[key] = {k: v for k, v in value.items() if k != 'values'}
+                rest[key]['length'] = len(series.values)
+            elif key.startswith(DAILY_XP_PREFIX) and type(value) is int:
+                daily.append((key[len(DAILY_XP_PREFIX):], value))
+            else:
+                rest[key] = value
+        return columns, daily, rest
+
+    def save_progress(self, user_id: str, progress_data: Dict[str, Any]) -> bool:
+        """
+        Args:
+            user_id (str): Identificador del usuario
+            progress_data (Dict): Datos de progreso a guardar
+        Returns:
+            bool: True si el progreso se guardó correctamente, False en caso contrario
+        """
+        columns, daily, rest = self._split(progress_data)
+        now = str(datetime.now())
+        try:
+            with self._lock:
+                connection = self._connection
+                connection.execute('BEGIN IMMEDIATE')
+                try:
+                    connection.execute(
+                        'INSERT INTO users (user_id, created_at, updated_at) VALUES (?, ?, ?) '
+                        'ON CONFLICT(user_id) DO UPDATE SET updated_at = excluded.updated_at',
+                        (user_id, now, now)
+                    )
+                    connection.execute(
+                        'INSERT OR REPLACE INTO progress (user_id, difficulty, total_xp, level, '
+                        'exams_completed, average_accuracy, data) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                        (user_id, *(columns.get(name) for name, _ in PROGRESS_COLUMNS),
+                         json.dumps(rest, ensure_ascii=False, separators=(',', ':')))
+                    )
+                    # Solo se escriben los días que cambiaron (normalmente solo el de hoy)
+                    stored = dict(connection.execute(
+                        'SELECT day, xp FROM daily_xp WHERE user_id = ?', (user_id,)
+                    ).fetchall())
+                    daily = dict(daily)
+                    connection.executemany(
+                        'DELETE FROM daily_xp WHERE user_id = ? AND day = ?',
+                        [(user_id, day) for day in stored.keys() - daily.keys()]
+                    )
+                    connection.executemany(
+                        'INSERT INTO daily_xp (user_id, day, xp) VALUES (?, ?, ?) '
+                        'ON CONFLICT(user_id, day) DO UPDATE SET xp = excluded.xp',
+                        [(user_id, day, xp) for day, xp in daily.items() if stored.get(day) != xp]
+                    )
+                    connection.execute('COMMIT')
+                except BaseException:
+                    connection.execute('ROLLBACK')
+                    raise
+            return True
+        except Exception as e:
+            print(f"Error saving progress: {e}")
+            return False
+
+    def load_progress(self, user_id: str) -> Dict[str, Any]:
+        """
+        Args:
+            user_id (str): Identificador del usuario
+        Returns:
+            Dict: Datos de progreso del usuario o diccionario vacío si no existe
+        """
+        try:
+            with self._lock:
+                row = self._connection.execute(
+                    'SELECT difficulty, total_xp, level, exams_completed, average_accuracy, data '
+                    'FROM progress WHERE user_id = ?', (user_id,)
+                ).fetchone()
+                if row is None:
+                    return {}
+                daily = self._connection.execute(
+                    'SELECT day, xp FROM daily_xp WHERE user_id = ? ORDER BY day', (user_id,)
+                ).fetchall()
+
+            progress = json.loads(row[-1])
+            for (name, _), value in zip(PROGRESS_COLUMNS, row[:-1]):
+                if value is not None:
+                    progress[name] = value
+
+            if isinstance(progress.get(DAILY_XP_KEY), dict):
+                progress[DAILY_XP_KEY] = self._rebuild_series(progress[DAILY_XP_KEY], daily)
+            else:
+                for day, xp in daily:
+                    progress[f'{DAILY_XP_PREFIX}{day}'] = xp
+            return progress
+        except Exception as e:
+            print(f"Error loading progress: {e}")
+            return {}
+
+    @staticmethod
+    def _rebuild_series(meta: Dict[str, Any], daily: List[Tuple[str, int]]) -> Dict[str, Any]:
+        """Reconstruye la serie compacta a partir de las filas de daily_xp
+
+        El rango guardado (start, length) conserva los días en cero del principio y
+        del final; los documentos guardados sin él empiezan y terminan en un día con XP.
+        """
+        series = DailyXpSeries.from_dict({k: v for k, v in meta.items() if k != 'length'})
+        first = last = None
+        if series.start is not None:
+            first = series.start
+            last = first + timedelta(days=meta.get('length', 0) - 1)
+        if daily:
+            first = min(first or date.max, date.fromisoformat(daily[0][0]))
+            last = max(last or date.min, date.fromisoformat(daily[-1][0]))
+        if first is not None and last >= first:
+            series.start = first
+            series.values = array('q', [0] * ((last - first).days + 1))
+            for day, xp in daily:
+                series.values[(date.fromisoformat(day) - first).days] = xp
+        else:
+            series.start = None
+        return series.to_dict()
+
+    def list_users(self) -> List[str]:
+        """Retorna los identificadores de todos los usuarios"""
+        with self._lock:
+            return [row[0] for row in self._connection.execute('SELECT user_id FROM users ORDER BY user_id')]
+
+    def delete_user(self, user_id: str) -> bool:
+        """Elimina un usuario con todo su progreso"""
+        with self._lock:
+            cursor = self._connection.execute('DELETE FROM users WHERE user_id = ?', (user_id,))
+            return cursor.rowcount > 0
+
+    def get_leaderboard(self, limit: int = 10, difficulty: str = None) -> List[Tuple[str, int, int]]:
+        """Usuarios con más XP (usa el índice de total_xp)
+
+        Returns:
+            List: Tuplas (user_id, total_xp, level)
+        """
+        query = 'SELECT user_id, total_xp, level FROM progress'
+        params: tuple = ()
+        if difficulty:
+            query += ' WHERE difficulty = ?'
+            params = (difficulty,)
+        query += ' ORDER BY total_xp DESC LIMIT ?'
+        with self._lock:
+            return self._connection.execute(query, params + (limit,)).fetchall()
+
+    def get_daily_xp(self, user_id: str, start_day: str, end_day: str) -> Dict[str, int]:
+        """XP diaria de un usuario entre dos fechas (YYYY-MM-DD, inclusive)"""
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT day, xp FROM daily_xp WHERE user_id = ? AND day BETWEEN ? AND ? ORDER BY day',
+                (user_id, start_day, end_day)
+            ).fetchall()
+        return dict(rows)
+
+    def get_total_xp_for_day(self, day: str) -> int:
+        """XP ganada por todos los usuarios en un día (usa el índice por día)"""
+        with self._lock:
+            row = self._connection.execute('SELECT COALESCE(SUM(xp), 0) FROM daily_xp WHERE day = ?',
+                                           (day,)).fetchone()
+        return row[0]
+
+
+def migrate_json_progress(json_dir: Path, target: AbstractProgressPersistence) -> int:
+    """Copia todos los archivos de progreso (JSON o binarios) a otra persistencia
+
+    Args:
+        json_dir (Path): Directorio con los archivos JSON de progreso
+        target (AbstractProgressPersistence): Persistencia de destino
+    Returns:
+        int: Número de usuarios migrados
+    """
+    source = JsonProgressPersistence(Path(json_dir))
+    migrated = 0
+    for user_id in source.list_users():
+        progress = source.load_progress(user_id)
+        if progress and target.save_progress(user_id, progress):
+            migrated += 1
+    return migrated
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Herramientas de la persistencia SQLite de GeoGrapy")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    migrate = subparsers.add_parser('migrate', help="Migra los archivos JSON de progreso a SQLite")
+    migrate.add_argument('json_dir', type=Path)
+    migrate.add_argument('--db', type=Path, help="Base de datos de destino (por defecto json_dir/progress.db)")
+    args = parser.parse_args(argv)
+
+    db_path = args.db or args.json_dir / 'progress.db'
+    persistence = SqliteProgressPersistence(db_path)
+    try:
+        migrated = migrate_json_progress(args.json_dir, persistence)
+    finally:
+        persistence.close()
+    print(f"{migrated} usuarios migrados a {db_path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,8 +3,9 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTextEdit,
 from PyQt6.QtCore import Qt, pyqtSignal, QTimer
 from PyQt6.QtGui import QColor
 from PyQt6.QtWidgets import QGraphicsDropShadowEffect
-from src.utils.constants import ICON_PATH
 from src.services.chat_service import ChatService
+from src.services.asset_index import get_asset_index
+from src.services.pixmap_cache import get_pixmap_cache
 from PyQt6.QtGui import QPixmap, QPainter
 
 # Clase para añadir la funcionalidad de enviar un mensaje al presionar Enter
@@ -44,9 +45,8 @@ class MessageWidget(QFrame):
         if not self.is_user:
             # IMAGEN BOT UVA
             profile_pic = QLabel()
-            pixmap = QPixmap(str(ICON_PATH / "uva_fondo.png"))
-            scaled_pixmap = pixmap.scaled(40, 40, Qt.AspectRatioMode.KeepAspectRatio,
-                                        Qt.TransformationMode.SmoothTransformation)
+            scaled_pixmap = get_pixmap_cache().pixmap(get_asset_index().path("icon/uva_fondo.png"), 40, 40,
+                                                      self.devicePixelRatioF())
             profile_pic.setPixmap(scaled_pixmap)
             profile_pic.setFixedSize(40, 40)
             profile_pic.setStyleSheet("""
@@ -56,12 +56,13 @@ class MessageWidget(QFrame):
                 }
             """)
             # SE CREA CONTORNO CIRCULAR
-            mask = QPixmap(40, 40)
+            # (del tamaño en píxeles físicos del pixmap, que depende de la pantalla)
+            mask = QPixmap(scaled_pixmap.size())
             mask.fill(Qt.GlobalColor.transparent)
             painter = QPainter(mask)
             painter.setBrush(Qt.GlobalColor.white)
             painter.setPen(Qt.PenStyle.NoPen)
-            painter.drawEllipse(0, 0, 40, 40)
+            painter.drawEllipse(mask.rect())
             painter.end()
             scaled_pixmap.setMask(mask.mask())
             profile_pic.setPixmap(scaled_pixmap)
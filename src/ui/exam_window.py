@@ -1,33 +1,69 @@
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                           QPushButton, QLabel, QProgressBar, QScrollArea, QFrame)
-from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+from PyQt6.QtCore import Qt, QSize, QTimer, pyqtSignal
 from PyQt6.QtGui import QPixmap, QFont
-from src.utils.constants import IMAGE_PATH
-from src.services.exam_score import ExamScore
-from src.services.level_system import AbstractLevelSystem, ImprovedLevelSystem, JsonProgressPersistence
+from src.services.exam_checkpoint import ExamCheckpointStore, SavedSession, get_checkpoint_store
+from src.services.exam_session import COMPLETE, QUESTION, ExamSession
+from src.services.level_system import AbstractLevelSystem, DEFAULT_USER_ID, ImprovedLevelSystem, JsonProgressPersistence
+from src.services.spaced_repetition import ReviewStateStore, get_review_store
+from src.services.asset_index import get_asset_index
+from src.services.image_prefetch import ImagePrefetcher, PREFETCH_AHEAD
+from src.services.pixmap_cache import RESIZE_DEBOUNCE_MS, get_pixmap_cache
+from src.services.adaptive_selection import AdaptiveSelector, get_adaptive_selector
 from pathlib import Path
 import random
-from datetime import datetime
+
+# Carpetas de resources/ donde se buscan las imágenes de las preguntas, en orden
+QUESTION_IMAGE_FOLDERS = ('images/countries', 'images/capitals')
+
+# Estilo de los botones de opciones: se asigna una sola vez al contenedor y cada
+# botón cambia de aspecto con la propiedad dinámica 'feedback' ('', 'correct', 'wrong')
+OPTION_STYLE = """
+    QPushButton {
+        background-color: white;
+        border: 2px solid #3498db;
+        color: #3498db;
+        border-radius: 25px;
+        padding: 15px;
+        font-size: 16px;
+        font-weight: bold;
+        margin: 5px;
+    }
+    QPushButton:hover {
+        background-color: #3498db;
+        color: white;
+    }
+    QPushButton:disabled {
+        background-color: white;
+        border: 2px solid #bdc3c7;
+        color: #bdc3c7;
+    }
+    QPushButton[feedback="correct"], QPushButton[feedback="correct"]:disabled {
+        background-color: #2ecc71;
+        color: white;
+        border: 2px solid #2ecc71;
+    }
+    QPushButton[feedback="wrong"], QPushButton[feedback="wrong"]:disabled {
+        background-color: #e74c3c;
+        color: white;
+        border: 2px solid #e74c3c;
+    }
+"""
 
 
 class ExamWindow(QMainWindow):
     """Ventana principal para realizar un examen"""
     exam_completed = pyqtSignal(dict)
+    # Se cerró sin terminar (con respuestas guardadas en el checkpoint o no)
+    exam_abandoned = pyqtSignal()
 
     def __init__(self, exam_data, level_system: AbstractLevelSystem = None,
-                 progress_persistence=None):
+                 progress_persistence=None, review_store: ReviewStateStore = None,
+                 adaptive_selector: AdaptiveSelector = None,
+                 checkpoint_store: ExamCheckpointStore = None, saved_session: SavedSession = None,
+                 user_id: str = DEFAULT_USER_ID):
         super().__init__()
         self.exam_data = exam_data
-        self.current_question = 0
-        self.correct_answers = 0
-        self.questions = exam_data['questions']
-
-        # Score actual
-        self.current_score = ExamScore(
-            correct_answers=0,
-            total_questions=len(self.questions),
-            xp_earned=self.exam_data['xp']
-        )
 
         # Inicializar sistema de niveles y persistencia
         self.level_system = level_system or ImprovedLevelSystem()
@@ -37,18 +73,32 @@ class ExamWindow(QMainWindow):
         else:
             self.progress_persistence = progress_persistence
 
-        # Cargar último resultado del usuario para este examen
-        self.current_progress = self.progress_persistence.load_progress('current_user')
-        self.last_exam_score = None
-        if self.current_progress:
-            last_correct = self.current_progress.get('last_exam_score', 0)
-            last_total = self.current_progress.get('last_exam_total', 1)
-            last_xp = self.current_progress.get('last_exam_xp', 0)
-            self.last_exam_score = ExamScore(last_correct, last_total, last_xp)
-
-        random.shuffle(self.questions)
+        # El flujo del examen (orden de las preguntas, puntaje, repaso espaciado,
+        # selección adaptativa, recompensas y progreso) está en la sesión; la
+        # ventana solo la muestra
+        self.session = ExamSession(
+            exam_data, self.level_system, self.progress_persistence,
+            review_store=review_store or get_review_store(),
+            adaptive_selector=adaptive_selector or get_adaptive_selector(),
+            checkpoint_store=checkpoint_store or get_checkpoint_store(),
+            user_id=user_id
+        )
+        if saved_session is not None:
+            # Continuar un examen sin terminar (exam_data es el examen guardado en la sesión)
+            self.session.restore(saved_session)
         self.setWindowTitle(exam_data['title'])
 
+        # Imágenes de las preguntas siguientes decodificadas y escaladas en otro hilo
+        self.image_prefetcher = ImagePrefetcher()
+        # Imagen mostrada: (ruta, lado en píxeles lógicos, device pixel ratio)
+        self.shown_image = None
+        # Al cambiar el tamaño de la ventana la imagen se reescala desde el archivo,
+        # una sola vez cuando termina el cambio
+        self.image_resize_timer = QTimer(self)
+        self.image_resize_timer.setSingleShot(True)
+        self.image_resize_timer.setInterval(RESIZE_DEBOUNCE_MS)
+        self.image_resize_timer.timeout.connect(self._rescale_image)
+
         # Calcular el tamaño de la ventana basado en la pantalla
         screen = QApplication.primaryScreen().availableGeometry()
         window_width = min(600, int(screen.width() * 0.8))
@@ -63,6 +113,9 @@ class ExamWindow(QMainWindow):
 
         self.setup_ui()
         self.show_question()
+        if self.session.state == COMPLETE:
+            # Sesión continuada con todas las respuestas: solo faltaba guardar el resultado
+            QTimer.singleShot(0, self.show_results)
 
     def setup_ui(self):
         central_widget = QWidget()
@@ -106,7 +159,7 @@ class ExamWindow(QMainWindow):
         self.content_layout.setSpacing(15)
 
         self.progress = QProgressBar()
-        self.progress.setRange(0, len(self.questions))
+        self.progress.setRange(0, self.session.total)
         self.progress.setValue(0)
         self.progress.setMinimumHeight(20)
 
@@ -131,10 +184,14 @@ class ExamWindow(QMainWindow):
         self.content_layout.addWidget(self.image_label)
 
         self.options_widget = QWidget()
-        self.options_widget.setStyleSheet("background: transparent;")
+        self.options_widget.setObjectName('options')
+        self.options_widget.setStyleSheet("QWidget#options { background: transparent; }" + OPTION_STYLE)
         self.options_layout = QVBoxLayout(self.options_widget)
         self.options_layout.setSpacing(10)
         self.content_layout.addWidget(self.options_widget)
+        # Botones reutilizados entre preguntas (solo se crean si una pregunta tiene más opciones)
+        self.option_buttons = []
+        self.current_options = []
 
         scroll.setWidget(scroll_content)
         main_layout.addWidget(scroll)
@@ -170,171 +227,120 @@ class ExamWindow(QMainWindow):
         main_layout.addWidget(self.progress)
 
     def get_image_path(self, image_name: str) -> str:
-        possible_paths = [
-            IMAGE_PATH / 'countries' / image_name,
-            IMAGE_PATH / 'capitals' / image_name,
-        ]
+        """Ruta absoluta de la imagen de una pregunta ('' si no existe)"""
+        return get_asset_index().path(image_name, QUESTION_IMAGE_FOLDERS)
+
+    def _image_size(self) -> int:
+        """Lado máximo de la imagen de la pregunta (píxeles lógicos) para el ancho actual"""
+        return int(min(self.width() * 0.6, 300))
 
-        for path in possible_paths:
-            if path.exists():
-                return str(path)
+    def _image_box(self) -> QSize:
+        """Tamaño máximo de la imagen en píxeles físicos (al que se decodifica)"""
+        side = round(self._image_size() * self.devicePixelRatioF())
+        return QSize(side, side)
 
-        return image_name
+    def _prefetch_upcoming_images(self):
+        """Precarga las imágenes de las preguntas que probablemente sigan"""
+        box = self._image_box()
+        for question in self.session.upcoming(PREFETCH_AHEAD):
+            self.image_prefetcher.prefetch(self.get_image_path(question['image']), box)
 
     def show_question(self):
-        if self.current_question < len(self.questions):
-            question = self.questions[self.current_question]
-            self.progress.setValue(self.current_question)
+        if self.session.state == QUESTION:
+            question = self.session.question
+            self.progress.setValue(self.session.position)
             self.question_label.setText(question['question'])
 
+            # La imagen suele estar ya decodificada y escalada: solo se convierte a pixmap
             image_path = self.get_image_path(question['image'])
-            pixmap = QPixmap(image_path)
-            if not pixmap.isNull():
-                max_img_size = min(self.width() * 0.6, 300)
-                scaled_pixmap = pixmap.scaled(
-                    int(max_img_size),
-                    int(max_img_size),
-                    Qt.AspectRatioMode.KeepAspectRatio,
-                    Qt.TransformationMode.SmoothTransformation
-                )
-                self.image_label.setPixmap(scaled_pixmap)
-
-            while self.options_layout.count():
-                child = self.options_layout.takeAt(0)
-                if child.widget():
-                    child.widget().deleteLater()
+            image = self.image_prefetcher.take(image_path, self._image_box())
+            if image.isNull():
+                self.image_label.clear()
+                self.shown_image = None
+            else:
+                side, dpr = self._image_size(), self.devicePixelRatioF()
+                pixmap = QPixmap.fromImage(image)
+                pixmap.setDevicePixelRatio(dpr)
+                get_pixmap_cache().insert(image_path, side, side, dpr, pixmap)
+                self.image_label.setPixmap(pixmap)
+                self.shown_image = (image_path, side, dpr)
+            self._prefetch_upcoming_images()
 
             options = question['options'].copy()
             random.shuffle(options)
+            self._show_options(options)
+
+    def _show_options(self, options):
+        """Asigna las opciones a los botones reutilizados y oculta los que sobran"""
+        while len(self.option_buttons) < len(options):
+            index = len(self.option_buttons)
+            button = QPushButton()
+            button.setMinimumHeight(50)
+            button.setMinimumWidth(15)  # Ajusta el ancho minimo
+            button.setProperty('feedback', '')
+            button.clicked.connect(lambda checked, i=index: self.check_answer(self.current_options[i]))
+            self.options_layout.addWidget(button)
+            self.option_buttons.append(button)
+
+        self.current_options = options
+        for i, button in enumerate(self.option_buttons):
+            if i < len(options):
+                button.setText(options[i])
+                self._set_feedback(button, '')
+                button.setEnabled(True)
+                button.setVisible(True)
+            else:
+                button.setVisible(False)
 
-            for option in options:
-                button = QPushButton(option)
-                button.setMinimumHeight(50)
-                button.setMinimumWidth(15)  # Ajusta el ancho minimo
-                button.clicked.connect(lambda checked, opt=option: self.check_answer(opt))
-                button.setStyleSheet("""
-                                QPushButton {
-                                    background-color: white;
-                                    border: 2px solid #3498db;
-                                    color: #3498db;
-                                    border-radius: 25px;
-                                    padding: 15px;
-                                    font-size: 16px;
-                                    font-weight: bold;
-                                    margin: 5px;
-                                }
-                                QPushButton:hover {
-                                    background-color: #3498db;
-                                    color: white;
-                                }
-                                QPushButton:disabled {
-                                    background-color: white;
-                                    border: 2px solid #bdc3c7;
-                                    color: #bdc3c7;
-                                }
-                            """)
-                self.options_layout.addWidget(button)
+    @staticmethod
+    def _set_feedback(button: QPushButton, feedback: str):
+        """Cambia el aspecto del botón ('', 'correct' o 'wrong') sin volver a parsear estilos"""
+        if button.property('feedback') != feedback:
+            button.setProperty('feedback', feedback)
+            button.style().unpolish(button)
+            button.style().polish(button)
 
     def show_results(self):
-        """Muestra los resultados del examen y actualiza el progreso del usuario"""
-
-        # Aplicar multiplicador de dificultad a la puntuación
-        difficulty_multiplier = self.level_system.difficulty.reward_multiplier
-        adjusted_score = self.current_score * difficulty_multiplier
+        """Muestra los resultados del examen (la sesión calcula las recompensas y guarda el progreso)"""
+        result = self.session.finish()
 
         # Comparar con el último intento
         comparison_message = ""
-        if self.last_exam_score:
-            if self.current_score > self.last_exam_score:
-                comparison_message = "¡Has mejorado desde tu último intento! 🎉"
-            elif self.current_score == self.last_exam_score:
-                comparison_message = "Mantuviste el mismo nivel que tu último intento 🎯"
-            else:
-                comparison_message = "Sigue practicando para superar tu último intento 💪"
-
-        # Calcular recompensas usando el sistema de niveles
-        rewards = self.level_system.calculate_exam_rewards(
-            exam_base_xp=adjusted_score.xp_earned,
-            correct_answers=self.current_score.correct_answers,
-            total_questions=self.current_score.total_questions
-        )
-
-        # Actualizar progreso del usuario
-        old_total_xp = self.current_progress.get('total_xp', 0)
-        new_total_xp = old_total_xp + rewards.total_xp
-
-        # Obtener progreso de nivel anterior y nuevo
-        old_level_progress = self.level_system.get_level_progress(old_total_xp)
-        new_level_progress = self.level_system.get_level_progress(new_total_xp)
-
-        # Calcular nueva precisión media
-        total_exams = self.current_progress.get('exams_completed', 0)
-        if total_exams == 0:
-            new_accuracy = self.current_score.get_accuracy()
-        else:
-            old_total_accuracy = self.current_progress.get('average_accuracy', 0) * (total_exams - 1)
-            new_accuracy = (old_total_accuracy + self.current_score.get_accuracy()) / total_exams
-
-        # Verificar subida de nivel y obtener mensaje
-        level_up_message = ""
-        if new_level_progress.level > old_level_progress.level:
-            new_rewards = self.level_system.get_level_rewards(new_level_progress.level)
-            level_up_message = self._format_level_up_message(
-                old_level_progress.level,
-                new_level_progress.level,
-                new_rewards
-            )
-
-        progress_data = {
-            'total_xp': new_total_xp,
-            'level': new_level_progress.level,
-            'last_exam_date': str(datetime.now()),
-            'exams_completed': total_exams + 1,
-            'average_accuracy': new_accuracy,
-            'last_accuracy': self.current_score.get_accuracy(),
-            'last_exam_score': self.current_score.correct_answers,
-            'last_exam_total': self.current_score.total_questions,
-            'last_exam_xp': adjusted_score.xp_earned,
-            'difficulty': self.current_progress.get('difficulty', 'normal')
-        }
-
-        # Actualizar XP diaria
-        if self.current_progress:
-            today_date = datetime.now().strftime("%Y-%m-%d")
-            daily_xp_key = f'daily_xp_{today_date}'
-            self.current_progress[daily_xp_key] = (
-                    self.current_progress.get(daily_xp_key, 0) + rewards.total_xp
-            )
-            self.current_progress.update(progress_data)
-            progress_data = self.current_progress
-
-        # Guardar progreso
-        self.progress_persistence.save_progress('current_user', progress_data)
+        if result.comparison == 1:
+            comparison_message = "¡Has mejorado desde tu último intento! 🎉"
+        elif result.comparison == 0:
+            comparison_message = "Mantuviste el mismo nivel que tu último intento 🎯"
+        elif result.comparison == -1:
+            comparison_message = "Sigue practicando para superar tu último intento 💪"
 
         # Preparar datos para la ventana de resultados
         results_data = {
-            'correct_answers': self.current_score.correct_answers,
-            'total_questions': self.current_score.total_questions,
-            'accuracy': self.current_score.get_accuracy(),
-            'rewards': rewards,
-            'new_level': new_level_progress.level,
-            'progress': new_level_progress,
-            'performance_message': self._get_performance_message(self.current_score.get_accuracy()),
+            'correct_answers': result.correct_answers,
+            'total_questions': result.total_questions,
+            'accuracy': result.accuracy,
+            'rewards': result.rewards,
+            'new_level': result.new_level.level,
+            'progress': result.new_level,
+            'performance_message': self._get_performance_message(result.accuracy),
             'comparison_message': comparison_message
         }
 
-        if level_up_message:
-            results_data['level_up_message'] = level_up_message
+        if result.leveled_up:
+            results_data['level_up_message'] = self._format_level_up_message(
+                result.old_level.level,
+                result.new_level.level,
+                result.level_up_rewards
+            )
 
         exam_results = {
             'category': self.exam_data.get('category', ''),
             'title': self.exam_data['title'],
-            'xp_earned': rewards.total_xp,
-            'correct_answers': self.current_score.correct_answers,
-            'total_questions': self.current_score.total_questions,
-            'accuracy': self.current_score.get_accuracy(),
-            'new_level': new_level_progress.level,
-            'old_level': old_level_progress.level
+            'xp_earned': result.rewards.total_xp,
+            'correct_answers': result.correct_answers,
+            'total_questions': result.total_questions,
+            'accuracy': result.accuracy,
+            'new_level': result.new_level.level,
+            'old_level': result.old_level.level
         }
 
         # Ventana de resultadps
@@ -380,89 +386,68 @@ class ExamWindow(QMainWindow):
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
-        if self.image_label.pixmap():
-            max_img_size = min(self.width() * 0.6, 300)
-            current_pixmap = self.image_label.pixmap()
-            scaled_pixmap = current_pixmap.scaled(
-                int(max_img_size),
-                int(max_img_size),
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation
-            )
-            self.image_label.setPixmap(scaled_pixmap)
+        if self.shown_image is not None:
+            self.image_resize_timer.start()
+
+    def _rescale_image(self):
+        """Vuelve a escalar la imagen de la pregunta desde su archivo para el tamaño actual"""
+        if self.shown_image is None:
+            return
+        image_path = self.shown_image[0]
+        side, dpr = self._image_size(), self.devicePixelRatioF()
+        if self.shown_image == (image_path, side, dpr):
+            return
+        pixmap = get_pixmap_cache().pixmap(image_path, side, side, dpr)
+        if not pixmap.isNull():
+            self.image_label.setPixmap(pixmap)
+            self.shown_image = (image_path, side, dpr)
 
     def check_answer(self, selected_option):
-        current_question = self.questions[self.current_question]
-        correct_answer = current_question['correct']
+        for button in self.option_buttons:
+            button.setEnabled(False)
 
-        for i in range(self.options_layout.count()):
-            self.options_layout.itemAt(i).widget().setEnabled(False)
-
-        if selected_option == correct_answer:
-            self.current_score += 1
-            self.show_feedback(True, current_question['explanation'])
-        else:
-            self.show_feedback(False, current_question['explanation'])
+        result = self.session.answer(selected_option)
+        self.show_feedback(result.is_correct, result.explanation)
 
     def show_feedback(self, is_correct, explanation):
         """Muestra el feedback para la respuesta seleccionada"""
-        # Actualizar estilos de los botones
-        for i in range(self.options_layout.count()):
-            button = self.options_layout.itemAt(i).widget()
-            if button.text() == self.questions[self.current_question]['correct']:
-                button.setStyleSheet("""
-                    QPushButton {
-                        background-color: #2ecc71;
-                        color: white;
-                        border: 2px solid #2ecc71;
-                        border-radius: 25px;
-                        padding: 15px;
-                        font-size: 16px;
-                        font-weight: bold;
-                        margin: 5px;
-                    }
-                """)
-            elif not is_correct and button.isEnabled() == False:
-                button.setStyleSheet("""
-                    QPushButton {
-                        background-color: #e74c3c;
-                        color: white;
-                        border: 2px solid #e74c3c;
-                        border-radius: 25px;
-                        padding: 15px;
-                        font-size: 16px;
-                        font-weight: bold;
-                        margin: 5px;
-                    }
-                """)
+        self._mark_options(self.session.question['correct'], is_correct)
 
         # Avanzar a la siguiente pregunta después de un breve delay
         QTimer.singleShot(1000, self.next_question)
 
+    def _mark_options(self, correct_answer, is_correct):
+        """Marca en verde la opción correcta y, si se falló, en rojo las demás"""
+        for option, button in zip(self.current_options, self.option_buttons):
+            if option == correct_answer:
+                self._set_feedback(button, 'correct')
+            elif not is_correct:
+                self._set_feedback(button, 'wrong')
+
     def next_question(self):
         """Avanza a la siguiente pregunta o muestra resultados si es la última"""
-        self.current_question += 1
-        if self.current_question < len(self.questions):
+        if self.session.next() is not None:
             self.show_question()
         else:
             self.show_results()
 
     def reset_exam(self):
         """Reinicia el examen mezclando las preguntas"""
-        self.current_question = 0
-        self.correct_answers = 0
-        random.shuffle(self.questions)
+        self.session.reset()
         self.progress.setValue(0)
         self.show_question()
 
     def closeEvent(self, event):
         """Maneja el evento de cierre de la ventana"""
 
-        # Guardar progreso actual antes de cerrar
-        current_progress = self.progress_persistence.load_progress('current_user')
-        current_progress['last_session'] = str(datetime.now())
-        self.progress_persistence.save_progress('current_user', current_progress)
+        # Si el examen no terminó, las respuestas quedan en el checkpoint para continuarlo
+        # (finish ya guardó el resultado)
+        if not self.session.finished:
+            self.session.abandon()
+            self.exam_abandoned.emit()
 
+        self.image_resize_timer.stop()
+        self.image_prefetcher.shutdown()
         event.accept()
 
 
@@ -1,20 +1,26 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                              QLabel, QScrollArea, QProgressBar, QGridLayout,
-                             QSizePolicy, QFrame,  QRadioButton, QDialog, QButtonGroup)
+                             QSizePolicy, QFrame,  QRadioButton, QDialog, QButtonGroup,
+                             QMessageBox)
 from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QFont, QPixmap
-from src.services.exam_data import get_exams_by_category
+from PyQt6.QtGui import QFont
+from src.services.asset_index import get_asset_index
+from src.services.exam_bank_watcher import ExamBankWatcher
+from src.services.exam_catalog import ExamSummary, get_exam_catalog
+from src.services.exam_checkpoint import RESUME_EXAM_PREFIX, SavedSession, get_checkpoint_store
+from src.services.pixmap_cache import get_pixmap_cache
+from src.services.question_generator import GENERATED_EXAM_ID, get_question_generator
+from src.services.spaced_repetition import REVIEW_EXAM_ID, get_review_store
 from src.ui.exam_window import ExamWindow
-from src.utils.constants import ICON_PATH
-from src.services.level_system import AbstractLevelSystem, JsonProgressPersistence, ImprovedLevelSystem
+from src.services.level_system import AbstractLevelSystem, DEFAULT_USER_ID, JsonProgressPersistence, ImprovedLevelSystem
 from datetime import datetime
 from pathlib import Path
 
 class ExamButton(QPushButton):
-    """Botón personalizado para mostrar información de un examen"""
-    def __init__(self, exam_data):
+    """Botón personalizado para mostrar información de un examen (solo usa el resumen)"""
+    def __init__(self, exam: ExamSummary):
         super().__init__()
-        self.exam_data = exam_data
+        self.exam = exam
         self.setup_ui()
 
     def setup_ui(self):
@@ -30,24 +36,24 @@ class ExamButton(QPushButton):
         image_layout.setContentsMargins(0, 0, 0, 0)
 
         image_label = QLabel()
-        icon_path = str(ICON_PATH / self.exam_data['icon'].split('/')[-1])
-        pixmap = QPixmap(icon_path)
+        # El ícono puede venir como nombre de archivo o como ruta ('resources/icon/...')
+        icon_path = get_asset_index().path(self.exam.icon, ('icon',))
+        pixmap = get_pixmap_cache().pixmap(icon_path, 100, 100, self.devicePixelRatioF())
         if not pixmap.isNull():
-            pixmap = pixmap.scaled(100, 100, Qt.AspectRatioMode.KeepAspectRatio)
             image_label.setPixmap(pixmap)
         image_container.setStyleSheet("background: transparent;")
         image_label.setAlignment(Qt.AlignmentFlag.AlignCenter) # Centrar la imagen
         image_layout.addWidget(image_label) # Añadir la imagen al layout
 
-        title_label = QLabel(self.exam_data['title'])
+        title_label = QLabel(self.exam.title)
         title_label.setFont(QFont("Arial", 12, QFont.Weight.Bold))
         title_label.setStyleSheet("color: #2c3e50;  background: transparent;")
         title_label.setWordWrap(True)
 
-        difficulty_label = QLabel(f"Dificultad: {self.exam_data['difficulty']}")
+        difficulty_label = QLabel(f"Dificultad: {self.exam.difficulty}")
         difficulty_label.setStyleSheet("color: #7f8c8d;  background: transparent;")
 
-        xp_label = QLabel(f"XP: {self.exam_data['xp']}")
+        xp_label = QLabel(f"XP: {self.exam.xp}")
         xp_label.setStyleSheet("color: #27ae60; background: transparent;")
 
         layout.addWidget(image_container)
@@ -87,9 +93,11 @@ class DifficultySelector(QDialog):
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        # Intentar cargar la dificultad guardada
-        progress_persistence = JsonProgressPersistence(Path.home() / '.geograpy' / 'progress')
-        current_progress = progress_persistence.load_progress('current_user')
+        # Intentar cargar la dificultad guardada (con la persistencia compartida si el padre la tiene)
+        progress_persistence = getattr(parent, 'progress_persistence', None)
+        if progress_persistence is None:
+            progress_persistence = JsonProgressPersistence(Path.home() / '.geograpy' / 'progress')
+        current_progress = progress_persistence.load_progress(getattr(parent, 'user_id', DEFAULT_USER_ID))
         self.selected_difficulty = current_progress.get('difficulty', 'normal')
         self.setStyleSheet("""
             QDialog {
@@ -209,11 +217,16 @@ class DifficultySelector(QDialog):
 
 class ExamsPage(QWidget):
     """Clase para visualizar la página de examenes y mantener la logica de negocios"""
+
+    # Preguntas por examen de repaso
+    REVIEW_SIZE = 10
+
     def __init__(self, parent=None, level_system: AbstractLevelSystem = None,
-                 progress_persistence=None):
+                 progress_persistence=None, user_id: str = DEFAULT_USER_ID):
         super().__init__(parent)
         self.level_system = level_system
         self.progress_persistence = progress_persistence
+        self.user_id = user_id
         self.total_xp = 0  
 
         # Inicializar sistemas
@@ -224,22 +237,41 @@ class ExamsPage(QWidget):
             raise ValueError("Se requiere level_system y progress_persistence")
 
         # Configuración inicial de categorías
+        assets = get_asset_index()
         self.categories = [
-            ("PAÍSES", "paises", "#3498db", str(ICON_PATH / "paises-preview.png")),
-            ("CAPITALES", "capitales", "#e74c3c", str(ICON_PATH / "capitals-preview.png")),
-            ("FLORA", "flora", "#2ecc71", str(ICON_PATH / "flora-preview.png")),
-            ("FAUNA", "fauna", "#f1c40f", str(ICON_PATH / "fauna.png"))
+            ("PAÍSES", "paises", "#3498db", assets.path("icon/paises-preview.png")),
+            ("CAPITALES", "capitales", "#e74c3c", assets.path("icon/capitals-preview.png")),
+            ("FLORA", "flora", "#2ecc71", assets.path("icon/flora-preview.png")),
+            ("FAUNA", "fauna", "#f1c40f", assets.path("icon/fauna.png"))
         ]
 
         # Inicializar variables de nivel y progreso
         self.load_user_progress()
 
+        # Estado de repaso espaciado compartido con las ventanas de examen
+        self.review_store = get_review_store()
+        # Exámenes sin terminar que se pueden continuar
+        self.checkpoint_store = get_checkpoint_store()
+        # Los checkpoints sin respuestas se borran una sola vez, al iniciar
+        self.checkpoint_store.remove_empty(self.user_id)
+        self.exam_window = None
+        # Ventanas de examen abiertas (sus sesiones no se ofrecen para continuar)
+        self.exam_windows = []
+
         # Configurar la interfaz
+        self.current_category = None
         self._setup_ui()
+        # Al abrir se ofrecen los exámenes sin terminar (si no hay, la sección queda vacía)
+        self.load_exams(None)
+
+        # Recarga en caliente del banco de exámenes: solo se redibuja la categoría
+        # mostrada y solo si fue la que cambió
+        self.bank_watcher = ExamBankWatcher(get_exam_catalog(), self)
+        self.bank_watcher.category_changed.connect(self.on_exam_category_changed)
 
     def load_user_progress(self):
         """Carga el progreso del usuario desde el sistema de persistencia"""
-        progress_data = self.progress_persistence.load_progress('current_user')
+        progress_data = self.progress_persistence.load_progress(self.user_id)
 
         # Asegurarse de que todos los campos necesarios existan
         if not progress_data:
@@ -254,7 +286,7 @@ class ExamsPage(QWidget):
                 'difficulty': difficulty or 'normal',
                 'last_update': str(datetime.now())
             }
-            self.progress_persistence.save_progress('current_user', progress_data)
+            self.progress_persistence.save_progress(self.user_id, progress_data)
 
         self.total_xp = progress_data.get('total_xp', 0)  # Cargar XP total
 
@@ -266,7 +298,7 @@ class ExamsPage(QWidget):
 
     def save_user_progress(self):
         """Guarda el progreso actual del usuario"""
-        current_progress = self.progress_persistence.load_progress('current_user')
+        current_progress = self.progress_persistence.load_progress(self.user_id)
 
         # Obtener la dificultad del sistema de niveles
         difficulty = None
@@ -279,17 +311,80 @@ class ExamsPage(QWidget):
             'last_update': str(datetime.now()),
             'difficulty': difficulty or current_progress.get('difficulty', 'normal')
         })
-        self.progress_persistence.save_progress('current_user', current_progress)
-
-    def start_exam(self, exam_data):
-        """Inicia un nuevo examen con el sistema de niveles configurado"""
-        self.exam_window = ExamWindow(
-            exam_data=exam_data,
-            level_system=self.level_system,
-            progress_persistence=self.progress_persistence
-        )
-        self.exam_window.exam_completed.connect(self.on_exam_completed)
-        self.exam_window.show()
+        self.progress_persistence.save_progress(self.user_id, current_progress)
+
+    def start_exam(self, exam_data, saved_session: SavedSession = None):
+        """Inicia un nuevo examen (o continúa uno sin terminar) con el sistema de niveles configurado
+
+        Returns:
+            bool: False si el examen no se puede rendir (por ejemplo, si no tiene preguntas)
+        """
+        try:
+            exam_window = ExamWindow(
+                exam_data=exam_data,
+                level_system=self.level_system,
+                progress_persistence=self.progress_persistence,
+                review_store=self.review_store,
+                checkpoint_store=self.checkpoint_store,
+                saved_session=saved_session,
+                user_id=self.user_id
+            )
+        except ValueError as e:
+            # Se llama desde un slot de Qt: una excepción sin capturar cierra la aplicación
+            print(f"Error al iniciar el examen: {e}")
+            QMessageBox.warning(self, "Examen no disponible", f"No se pudo iniciar el examen: {e}")
+            return False
+        self.exam_window = exam_window
+        self.exam_windows.append(exam_window)
+        exam_window.exam_completed.connect(lambda _, window=exam_window: self._release_exam_window(window))
+        exam_window.exam_completed.connect(self.on_exam_completed)
+        # Un examen dejado a medias aparece para continuarlo
+        exam_window.exam_abandoned.connect(lambda window=exam_window: self.on_exam_abandoned(window))
+        exam_window.destroyed.connect(lambda _=None, window=exam_window: self._release_exam_window(window))
+        exam_window.show()
+        return True
+
+    def _release_exam_window(self, window: ExamWindow):
+        if window in self.exam_windows:
+            self.exam_windows.remove(window)
+
+    def on_exam_abandoned(self, window: ExamWindow):
+        """La sesión cerrada sin terminar vuelve a ofrecerse para continuarla"""
+        self._release_exam_window(window)
+        self.load_exams(self.current_category)
+
+    def _open_session_window(self, session_id: str) -> ExamWindow:
+        """Ventana abierta con la sesión `session_id`, o None"""
+        for window in self.exam_windows:
+            checkpoint = window.session.checkpoint
+            if checkpoint is not None and checkpoint.session_id == session_id:
+                return window
+        return None
+
+    def start_exam_by_id(self, exam_id: str):
+        """Inicia un examen del catálogo (o el de práctica generado) a partir de su identificador"""
+        if exam_id == GENERATED_EXAM_ID:
+            exam_data = get_question_generator().build_exam()
+        elif exam_id.startswith(RESUME_EXAM_PREFIX):
+            session_id = exam_id[len(RESUME_EXAM_PREFIX):]
+            # Una sesión ya abierta no se continúa dos veces: se muestra su ventana
+            window = self._open_session_window(session_id)
+            if window is not None:
+                window.raise_()
+                window.activateWindow()
+                return
+            saved = self.checkpoint_store.load(self.user_id, session_id)
+            if saved is not None:
+                self.start_exam(saved.exam_data, saved)
+                # La sesión abierta deja de ofrecerse
+                self.load_exams(self.current_category)
+            return
+        elif exam_id == REVIEW_EXAM_ID:
+            exam_data = self.review_store.get_scheduler(self.user_id).build_review_exam(self.REVIEW_SIZE)
+        else:
+            exam_data = get_exam_catalog().get_exam(exam_id)
+        if exam_data is not None:
+            self.start_exam(exam_data)
 
     def show_difficulty_selector(self) -> str:
         """Muestra el diálogo de selección de dificultad"""
@@ -402,9 +497,8 @@ class ExamsPage(QWidget):
             icon_layout.setContentsMargins(0, 0, 0, 0)
 
             icon_label = QLabel()
-            pixmap = QPixmap(icon_path)
+            pixmap = get_pixmap_cache().pixmap(icon_path, 100, 100, self.devicePixelRatioF())
             if not pixmap.isNull():
-                pixmap = pixmap.scaled(100, 100, Qt.AspectRatioMode.KeepAspectRatio)
                 icon_label.setPixmap(pixmap)
             icon_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
             icon_layout.addWidget(icon_label)
@@ -472,18 +566,69 @@ class ExamsPage(QWidget):
         return exams_widget
 
     def load_exams(self, category: str):
-        """Carga y muestra los exámenes de una categoría específica"""
+        """Carga y muestra los exámenes de una categoría específica (None: solo los sin terminar)"""
+        self.current_category = category
         while self.exams_layout.count():
             item = self.exams_layout.takeAt(0)
             if item.widget():
                 item.widget().deleteLater()
 
-        exams = get_exams_by_category(category)
-        for exam_data in exams:
-            exam_button = ExamButton(exam_data)
-            exam_button.clicked.connect(lambda c, data=exam_data: self.start_exam(data))
+        # Exámenes sin terminar primero, en todas las categorías
+        summaries = self.get_resume_summaries()
+        if category is not None:
+            review_summary = self.get_review_summary()
+            if review_summary is not None:
+                summaries.append(review_summary)
+            # Resúmenes del catálogo en memoria: las preguntas se obtienen al abrir el examen
+            summaries += get_exam_catalog().get_summaries(category)
+        if category == 'paises':
+            # Práctica con preguntas nuevas en cada intento, generadas desde countries.json
+            summaries.append(get_question_generator().exam_summary())
+        for summary in summaries:
+            exam_button = ExamButton(summary)
+            exam_button.clicked.connect(lambda c, exam_id=summary.id: self.start_exam_by_id(exam_id))
             self.exams_layout.addWidget(exam_button)
 
+    def get_resume_summaries(self) -> list:
+        """Resúmenes de los exámenes sin terminar (sin los que están abiertos)"""
+        open_sessions = {window.session.checkpoint.session_id for window in self.exam_windows
+                         if window.session.checkpoint is not None}
+        summaries = []
+        for saved in self.checkpoint_store.summaries(self.user_id):
+            if saved.session_id in open_sessions:
+                continue
+            summaries.append(ExamSummary(
+                id=f"{RESUME_EXAM_PREFIX}{saved.session_id}",
+                category=saved.category,
+                title=f"Continuar: {saved.title} ({saved.answered}/{saved.total})",
+                difficulty=saved.difficulty,
+                xp=saved.xp,
+                icon=saved.icon or 'paises-preview.png',
+                question_count=saved.total
+            ))
+        return summaries
+
+    def get_review_summary(self) -> ExamSummary:
+        """Resumen del examen de repaso, o None si no hay preguntas pendientes"""
+        scheduler = self.review_store.get_scheduler(self.user_id)
+        pending = scheduler.due_count(limit=self.REVIEW_SIZE)
+        if not pending:
+            return None
+        return ExamSummary(
+            id=REVIEW_EXAM_ID,
+            category=REVIEW_EXAM_ID,
+            title=f"Repaso: {pending} preguntas pendientes",
+            difficulty='Media',
+            xp=50,
+            icon='paises-preview.png',
+            question_count=pending
+        )
+
+    def on_exam_category_changed(self, category: str):
+        """Vuelve a mostrar la categoría actual si su banco de exámenes cambió"""
+        if category == self.current_category:
+            self.load_exams(category)
+
     def calculate_total_xp(self) -> int:
         """Retorna la XP total acumulada del usuario"""
         return self.total_xp
@@ -499,8 +644,10 @@ class ExamsPage(QWidget):
         self.exp = level_progress.current_xp
         self.exp_necesaria = level_progress.xp_for_next
 
+        # ExamWindow ya guardó el resultado del examen: solo se actualiza la vista
         self.update_level_display()
-        self.save_user_progress()
+        # Las preguntas pendientes de repaso cambiaron y el examen ya no está sin terminar
+        self.load_exams(self.current_category)
         self.check_unlocked_features()
 
     def check_unlocked_features(self):
@@ -625,9 +772,6 @@ class ExamsPage(QWidget):
         self.progress_bar.setValue(self.exp)
         self.progress_bar.setFormat(f"{progress_percent:.1f}%")
 
-        # Guardar progreso
-        self.save_user_progress()
-
     @staticmethod
     def get_category_button_style(color):
         # Convertir color a RGB
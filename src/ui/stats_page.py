@@ -1,31 +1,43 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                              QFrame, QScrollArea, QGridLayout, QSpacerItem, QSizePolicy, QPushButton)
 from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QFont, QColor, QPainter, QPen, QPixmap
+from PyQt6.QtGui import QFont, QColor, QPainter, QPen
 from PyQt6.QtCharts import QChart, QChartView, QLineSeries, QValueAxis
 from datetime import datetime, timedelta
 import json
 from pathlib import Path
-from src.services.level_system import ImprovedLevelSystem, JsonProgressPersistence, LevelProgress
-from src.utils.constants import ICON_PATH
+from src.services.level_system import DEFAULT_USER_ID, ImprovedLevelSystem, JsonProgressPersistence, LevelProgress
+from src.services.asset_index import get_asset_index
+from src.services.daily_xp import DailyXpSeries
+from src.services.pixmap_cache import get_pixmap_cache
 
 
 class StatsPage(QWidget):
     """Página de estadísticas del usuario"""
-    def __init__(self, parent=None):
+
+    # Grupos de tarjetas de recompensa, en el orden en que se muestran
+    REWARD_GROUPS = (('titles', 'title'), ('badges', 'badge'), ('features', 'feature'))
+
+    def __init__(self, parent=None, progress_persistence=None, user_id: str = DEFAULT_USER_ID):
         super().__init__(parent)
+        self.user_id = user_id
 
         # Inicializar sistema de niveles y persistencia
-        save_dir = Path.home() / '.geograpy' / 'progress'
-        self.progress_persistence = JsonProgressPersistence(save_dir)
+        if progress_persistence is None:
+            save_dir = Path.home() / '.geograpy' / 'progress'
+            progress_persistence = JsonProgressPersistence(save_dir)
+        self.progress_persistence = progress_persistence
 
         # Cargar progreso actual
-        self.current_progress = self.progress_persistence.load_progress('current_user')
+        self.current_progress = self.progress_persistence.load_progress(self.user_id)
 
         # Inicializar sistema de niveles con la dificultad guardada
         difficulty = self.current_progress.get('difficulty', 'normal')
         self.level_system = ImprovedLevelSystem(difficulty=difficulty)
 
+        # (dificultad, nivel) de las tarjetas de recompensa mostradas
+        self._shown_rewards = None
+
         self.setup_ui()
         self.load_user_stats()
 
@@ -239,7 +251,7 @@ class StatsPage(QWidget):
                     border-radius: 10px;
                 }
             """
-            icon_path = "resources/images/levels/corona.png"
+            icon_path = get_asset_index().path("images/levels/corona.png")
             category = "Título"
         elif reward_type == 'badge':
             style = """
@@ -249,7 +261,7 @@ class StatsPage(QWidget):
                     border-radius: 10px;
                 }
             """
-            icon_path = "resources/images/levels/medalla-de-oro.png"
+            icon_path = get_asset_index().path("images/levels/medalla-de-oro.png")
             category = "Insignia"
         else:  # features
             style = """
@@ -259,7 +271,7 @@ class StatsPage(QWidget):
                     border-radius: 10px;
                 }
             """
-            icon_path = "resources/images/levels/llave_inglesa.png"
+            icon_path = get_asset_index().path("images/levels/llave_inglesa.png")
             category = "Característica"
 
         card.setStyleSheet(style)
@@ -271,14 +283,9 @@ class StatsPage(QWidget):
 
         # Icono/Imagen
         icon_label = QLabel()
-        pixmap = QPixmap(icon_path)
+        pixmap = get_pixmap_cache().pixmap(icon_path, 40, 40, self.devicePixelRatioF())  # tamaño del icono
         if not pixmap.isNull():
-            scaled_pixmap = pixmap.scaled(
-                40, 40,  #  tamaño del icono
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation
-            )
-            icon_label.setPixmap(scaled_pixmap)
+            icon_label.setPixmap(pixmap)
         icon_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         icon_label.setFixedSize(40, 40)  # contenedor del icono
         icon_label.setStyleSheet("background: transparent; border: none;")
@@ -416,6 +423,16 @@ class StatsPage(QWidget):
                 value_label.setText(value)
 
     def update_rewards(self, level):
+        # Si el nivel subió con la misma dificultad, solo se agregan las tarjetas nuevas
+        shown = self._shown_rewards
+        difficulty = self.level_system.difficulty_name
+        if shown is not None and shown[0] == difficulty and level >= shown[1]:
+            rewards = self.level_system.get_rewards_unlocked_between(shown[1], level)
+            if rewards.titles or rewards.badges or rewards.features:
+                self.insert_reward_cards(rewards, self.level_system.get_level_rewards(level))
+            self._shown_rewards = (difficulty, level)
+            return
+
         # Ñimpiar recompensas actuales
         while self.rewards_layout.count():
             item = self.rewards_layout.takeAt(0)
@@ -424,27 +441,33 @@ class StatsPage(QWidget):
 
         # Obtener recompensas del nivel actual
         rewards = self.level_system.get_level_rewards(level)
-
-        # Mostrar títulos
-        if rewards.titles:
-            for title in rewards.titles:
-                card = self.create_reward_card(title, 'title')
-                self.rewards_layout.addWidget(card)
-
-        # Mostrar insignias
-        if rewards.badges:
-            for badge in rewards.badges:
-                card = self.create_reward_card(badge, 'badge')
-                self.rewards_layout.addWidget(card)
-
-        # Mostrar características
-        if rewards.features:
-            for feature in rewards.features:
-                card = self.create_reward_card(feature, 'feature')
-                self.rewards_layout.addWidget(card)
+        self.add_reward_cards(rewards)
 
         # Agregar un spacer al final
         self.rewards_layout.addStretch()
+        self._shown_rewards = (difficulty, level)
+
+    def add_reward_cards(self, rewards):
+        """Agrega al layout las tarjetas de las recompensas indicadas"""
+        # Títulos, luego insignias y luego características
+        for kind, reward_type in self.REWARD_GROUPS:
+            for text in getattr(rewards, kind):
+                card = self.create_reward_card(text, reward_type)
+                self.rewards_layout.addWidget(card)
+
+    def insert_reward_cards(self, new_rewards, all_rewards):
+        """Inserta las tarjetas nuevas dentro de su grupo, en la posición que tendrían
+        al reconstruir la sección con all_rewards (las recompensas acumuladas)
+        """
+        group_start = 0
+        for kind, reward_type in self.REWARD_GROUPS:
+            new_values = set(getattr(new_rewards, kind))
+            values = getattr(all_rewards, kind)
+            for index, text in enumerate(values):
+                if text in new_values:
+                    card = self.create_reward_card(text, reward_type)
+                    self.rewards_layout.insertWidget(group_start + index, card)
+            group_start += len(values)
 
     def update_progress_chart(self):
         series = QLineSeries()
@@ -452,12 +475,11 @@ class StatsPage(QWidget):
         data_points = []
         max_xp = 0
 
-        # Obtener datos de XP diaria
-        for i in range(7):
-            date = today - timedelta(days=i)
-            date_str = date.strftime("%Y-%m-%d")
-            xp = self.current_progress.get(f'daily_xp_{date_str}', 0)
-            data_points.append((6 - i, xp))
+        # Obtener datos de XP diaria (una consulta por rango sobre la serie)
+        daily_xp = DailyXpSeries.from_progress(dict(self.current_progress))
+        week = daily_xp.range((today - timedelta(days=6)).date(), today.date())
+        for x, xp in enumerate(week):
+            data_points.append((x, xp))
             max_xp = max(max_xp, xp)
 
         for x, y in data_points:
@@ -496,7 +518,7 @@ class StatsPage(QWidget):
     def refresh_stats(self):
         """Refresca todas las estadísticas"""
         # Recargar el progreso actual
-        self.current_progress = self.progress_persistence.load_progress('current_user')
+        self.current_progress = self.progress_persistence.load_progress(self.user_id)
 
         # Recargar dificultad por si cambió
         difficulty = self.current_progress.get('difficulty', 'normal')
@@ -0,0 +1,74 @@
+"""
+Resúmenes de las sesiones sin terminar de ExamCheckpointStore
+"""
+from datetime import datetime
+from src.services.exam_checkpoint import ExamCheckpointStore
+from src.services.progress_journal import pack_record
+
+USER = 'current_user'
+
+
+def build_exam(questions: int = 5) -> dict:
+    return {'id': 'paises_america', 'title': 'Países de América', 'category': 'paises', 'difficulty': 'Fácil',
+            'xp': 100, 'icon': 'paises.png',
+            'questions': [{'question': f'Pregunta {i}', 'options': ['A', 'B'], 'correct': 'A'}
+                          for i in range(questions)]}
+
+
+def test_summary_matches_full_load(tmp_path):
+    store = ExamCheckpointStore(tmp_path)
+    checkpoint = store.create(USER, build_exam(), datetime(2026, 1, 1))
+    for index in (3, 0, 4):
+        checkpoint.append_answer(index, 'A')
+    checkpoint.mark_learned()
+    checkpoint.close()
+
+    [summary] = store.summaries(USER)
+    saved = store.load(USER, summary.session_id)
+    assert (summary.title, summary.category, summary.difficulty, summary.xp, summary.icon) == \
+        ('Países de América', 'paises', 'Fácil', 100, 'paises.png')
+    assert summary.answered == len(saved.answers) == 3
+    assert summary.total == saved.total == 5
+    assert summary.started == saved.started == str(datetime(2026, 1, 1))
+
+
+def test_summaries_only_reread_changed_files(tmp_path, monkeypatch):
+    store = ExamCheckpointStore(tmp_path)
+    checkpoints = [store.create(USER, build_exam(), datetime(2026, 1, 1 + day)) for day in range(3)]
+    for checkpoint in checkpoints:
+        checkpoint.append_answer(0, 'A')
+    assert len(store.summaries(USER)) == 3
+
+    reads = []
+    summarize = store._summarize
+    monkeypatch.setattr(store, '_summarize', lambda *args: reads.append(args[0]) or summarize(*args))
+    assert [s.answered for s in store.summaries(USER)] == [1, 1, 1]
+    assert reads == []
+
+    checkpoints[1].append_answer(1, 'B')
+    checkpoints[2].discard()
+    assert [s.answered for s in store.summaries(USER)] == [2, 1]
+    assert reads == [checkpoints[1].session_id]
+
+
+def test_old_checkpoint_without_summary_header(tmp_path):
+    store = ExamCheckpointStore(tmp_path)
+    path = store.get_checkpoint_path(USER, '20250101000000000000')
+    path.write_bytes(pack_record({'exam': build_exam(), 'started': '2025-01-01'}) + pack_record({'i': 2, 'a': 'A'}))
+
+    [summary] = store.summaries(USER)
+    assert (summary.title, summary.answered, summary.total) == ('Países de América', 1, 5)
+    assert store.load(USER, summary.session_id).answers == [(2, 'A')]
+
+
+def test_listing_keeps_empty_checkpoints_until_cleanup(tmp_path):
+    store = ExamCheckpointStore(tmp_path)
+    empty = store.create(USER, build_exam())
+    empty.close()
+    answered = store.create(USER, build_exam())
+    answered.append_answer(0, 'A')
+
+    assert [s.session_id for s in store.summaries(USER)] == [answered.session_id]
+    assert empty.path.exists()
+    assert store.remove_empty(USER) == 1
+    assert not empty.path.exists() and answered.path.exists()
@@ -0,0 +1,38 @@
+"""
+Recompensas y curva de niveles de ImprovedLevelSystem
+"""
+from dataclasses import replace
+from src.services.level_system import ImprovedLevelSystem
+
+
+def test_custom_config_rewards():
+    config = replace(ImprovedLevelSystem.DIFFICULTIES['normal'], name='Custom', exclusive_rewards=True)
+    level_system = ImprovedLevelSystem('normal', config=config)
+
+    rewards = level_system.get_level_rewards(50)
+    assert 'Custom Experto' in rewards.titles
+    assert not any(title.startswith('Geógrafo') for title in rewards.titles)
+    assert 'Maestro Intrépido' in rewards.titles
+    assert 'custom_theme' in level_system.get_rewards_unlocked_between(10, 50).features
+
+    # La tabla de la dificultad registrada no cambia
+    default = ImprovedLevelSystem('normal').get_level_rewards(50)
+    assert 'Geógrafo Experto' in default.titles
+    assert 'Maestro Intrépido' not in default.titles
+
+
+def test_curve_follows_parameter_changes():
+    level_system = ImprovedLevelSystem('normal')
+    shared = ImprovedLevelSystem.DIFFICULTIES['normal']
+    assert level_system.get_level_progress(150).level == 2
+
+    level_system.base_xp = 200
+    level_system.max_level = 3
+    assert level_system.difficulty.base_xp == 200
+    assert level_system.calculate_xp_for_level(2) == 300
+    assert level_system.get_level_progress(150).level == 1
+    assert level_system.get_level_progress(10 ** 9).level == 3
+
+    # La dificultad compartida y las demás instancias no cambian
+    assert shared.base_xp == 100 and shared.max_level == 100
+    assert ImprovedLevelSystem('normal').get_level_progress(150).level == 2
@@ -0,0 +1,35 @@
+"""
+Cambio de formato de los archivos de progreso de JsonProgressPersistence
+"""
+import json
+from src.services.level_system import JsonProgressPersistence
+
+USER = 'current_user'
+
+
+def test_legacy_json_is_replaced_by_binary(tmp_path):
+    legacy = JsonProgressPersistence(tmp_path)
+    legacy.get_save_path(USER).write_text(json.dumps({'total_xp': 300, 'exams_completed': 2}))
+
+    persistence = JsonProgressPersistence(tmp_path, file_format='binary', compression='zlib')
+    progress = persistence.load_progress(USER)
+    assert progress == {'total_xp': 300, 'exams_completed': 2}
+    progress['total_xp'] += 50
+    assert persistence.save_progress(USER, progress)
+
+    assert not legacy.get_save_path(USER).exists()
+    assert persistence.get_save_path(USER).exists()
+    assert persistence.list_users() == [USER]
+    assert JsonProgressPersistence(tmp_path, file_format='binary').load_progress(USER)['total_xp'] == 350
+
+
+def test_switching_back_to_json_removes_binary(tmp_path):
+    binary = JsonProgressPersistence(tmp_path, file_format='binary')
+    assert binary.save_progress(USER, {'total_xp': 10})
+
+    persistence = JsonProgressPersistence(tmp_path)
+    progress = persistence.load_progress(USER)
+    assert persistence.save_progress(USER, {**progress, 'total_xp': 20})
+
+    assert not binary.get_save_path(USER).exists()
+    assert json.loads(persistence.get_save_path(USER).read_text())['total_xp'] == 20
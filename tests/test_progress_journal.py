@@ -0,0 +1,102 @@
+"""
+Consistencia ante cortes de JournaledProgressPersistence
+
+Un registro final truncado o con CRC inválido se descarta al iniciar y el estado
+vuelve al último registro completo; tras un snapshot solo se reproduce la cola
+de la bitácora. La XP diaria se anexa como la XP del día, no la serie completa.
+"""
+import json
+from src.services.daily_xp import DailyXpSeries
+from src.services.progress_journal import JournaledProgressPersistence
+
+USER = 'alumno'
+
+
+def attempt_for(i: int) -> dict:
+    return {'exam_id': 'paises_america', 'title': 'Países de América', 'date': f'2024-01-01 {i}',
+            'correct_answers': i % 3, 'total_questions': 2, 'xp_earned': 120, 'difficulty': 'normal'}
+
+
+def progress_for(i: int) -> dict:
+    return {'difficulty': 'normal', 'total_xp': i * 120, 'level': 1 + i // 100,
+            'exams_completed': i, 'last_exam_date': f'2024-01-01 {i}'}
+
+
+def record(journal: JournaledProgressPersistence, first: int, last: int):
+    for i in range(first, last + 1):
+        assert journal.record_attempt(USER, attempt_for(i), progress_for(i))
+
+
+def test_torn_last_record_is_dropped(tmp_path):
+    journal = JournaledProgressPersistence(tmp_path, snapshot_interval=1000, fsync=False)
+    record(journal, 1, 10)
+    journal_path = journal.get_journal_path(USER)
+    size = journal_path.stat().st_size
+    # Registro final cortado a la mitad
+    with open(journal_path, 'ab') as f:
+        f.write(b'\x40\x00\x00\x00\x00\x00\x00\x00{"set":{"tot')
+
+    recovered = JournaledProgressPersistence(tmp_path, fsync=False)
+    assert recovered.load_progress(USER) == progress_for(10)
+    assert journal_path.stat().st_size == size
+
+
+def test_crc_mismatch_stops_replay(tmp_path):
+    journal = JournaledProgressPersistence(tmp_path, snapshot_interval=1000, fsync=False)
+    record(journal, 1, 11)
+    # Registro completo pero con el contenido alterado
+    with open(journal.get_journal_path(USER), 'r+b') as f:
+        f.seek(-3, 2)
+        f.write(b'XXX')
+
+    recovered = JournaledProgressPersistence(tmp_path, fsync=False)
+    assert recovered.load_progress(USER) == progress_for(10)
+    # Tras recuperar se puede seguir anexando
+    record(recovered, 11, 11)
+    assert JournaledProgressPersistence(tmp_path).load_progress(USER) == progress_for(11)
+    assert len(list(recovered.load_attempts(USER))) == 11
+
+
+def test_replay_after_snapshot(tmp_path):
+    journal = JournaledProgressPersistence(tmp_path, snapshot_interval=5, fsync=False)
+    record(journal, 1, 13)
+    snapshot = json.loads(journal.get_snapshot_path(USER).read_text(encoding='utf-8'))
+    assert snapshot['progress'] == progress_for(10)
+    assert snapshot['journal_offset'] < journal.get_journal_path(USER).stat().st_size
+
+    # Se carga el snapshot y se reproducen solo los registros 11 a 13: un registro
+    # dañado antes de journal_offset no afecta al estado
+    with open(journal.get_journal_path(USER), 'r+b') as f:
+        f.seek(10)
+        f.write(b'X')
+    reopened = JournaledProgressPersistence(tmp_path, snapshot_interval=5, fsync=False)
+    assert reopened.load_progress(USER) == progress_for(13)
+
+    # Un registro truncado después del snapshot también se descarta
+    with open(journal.get_journal_path(USER), 'ab') as f:
+        f.write(b'\x40\x00\x00')
+    assert JournaledProgressPersistence(tmp_path, fsync=False).load_progress(USER) == progress_for(13)
+
+
+def test_snapshot_without_journal_tail(tmp_path):
+    """Corte justo después del snapshot: no hay cola que reproducir"""
+    journal = JournaledProgressPersistence(tmp_path, snapshot_interval=5, fsync=False)
+    record(journal, 1, 10)
+    assert JournaledProgressPersistence(tmp_path, fsync=False).load_progress(USER) == progress_for(10)
+
+
+def test_daily_xp_is_journaled_as_day_delta(tmp_path):
+    journal = JournaledProgressPersistence(tmp_path, fsync=False)
+    journal_path = journal.get_journal_path(USER)
+    series = DailyXpSeries()
+    sizes = []
+    for i in range(1, 301):
+        day = f"2024-{1 + i // 60 % 12:02d}-{1 + i % 28:02d}"
+        series.add(day, 120)
+        progress = dict(progress_for(i), last_exam_date=f"{day} 12:00:00", daily_xp=series.to_dict())
+        before = journal_path.stat().st_size if i > 1 else 0
+        journal.record_attempt(USER, attempt_for(i), progress)
+        sizes.append(journal_path.stat().st_size - before)
+
+    assert JournaledProgressPersistence(tmp_path).load_progress(USER) == progress
+    assert max(sizes[1:]) < 400
@@ -0,0 +1,83 @@
+"""
+Guardados concurrentes de JsonProgressPersistence entre procesos
+
+Varios procesos cargan, suman XP y exámenes y guardan el mismo usuario a la vez:
+con bloqueo y fusión los contadores finales deben sumar exactamente. También
+cubre el archivo de progreso corrupto, que no debe impedir volver a guardar.
+"""
+from datetime import date
+from multiprocessing import Pool
+from pathlib import Path
+import pytest
+from src.services.daily_xp import DailyXpSeries, PROGRESS_KEY as DAILY_XP_KEY
+from src.services.level_system import ImprovedLevelSystem, JsonProgressPersistence
+
+PROCESSES = 4
+EXAMS_PER_PROCESS = 25
+XP_PER_EXAM = 120
+USER = 'current_user'
+
+
+def save_exams(args) -> int:
+    """Proceso: rinde EXAMS_PER_PROCESS exámenes; los impares conservan su copia en memoria"""
+    save_dir, worker, file_format = args
+    persistence = JsonProgressPersistence(Path(save_dir), file_format=file_format, fsync=False)
+    level_system = ImprovedLevelSystem('normal')
+    progress = persistence.load_progress(USER)
+    for _ in range(EXAMS_PER_PROCESS):
+        if worker % 2 == 0:
+            progress = persistence.load_progress(USER)
+        progress['total_xp'] = progress.get('total_xp', 0) + XP_PER_EXAM
+        progress['exams_completed'] = progress.get('exams_completed', 0) + 1
+        progress['level'] = level_system.get_level_progress(progress['total_xp']).level
+        progress['difficulty'] = 'normal'
+        series = DailyXpSeries.from_progress(progress)
+        series.add(date(2024, 1, 1 + worker), XP_PER_EXAM)
+        progress[DAILY_XP_KEY] = series.to_dict()
+        assert persistence.save_progress(USER, progress)
+    return persistence.get_lock_stats()['merges']
+
+
+def run_processes(save_dir: Path, file_format: str) -> dict:
+    with Pool(PROCESSES) as pool:
+        pool.map(save_exams, [(str(save_dir), worker, file_format) for worker in range(PROCESSES)])
+    return JsonProgressPersistence(save_dir, file_format=file_format).load_progress(USER)
+
+
+def assert_counters_add_up(final: dict):
+    exams = PROCESSES * EXAMS_PER_PROCESS
+    assert final['total_xp'] == exams * XP_PER_EXAM
+    assert final['exams_completed'] == exams
+    assert final['level'] == ImprovedLevelSystem('normal').get_level_progress(final['total_xp']).level
+    series = DailyXpSeries.from_progress(final)
+    assert [series.get(date(2024, 1, 1 + worker)) for worker in range(PROCESSES)] == \
+        [EXAMS_PER_PROCESS * XP_PER_EXAM] * PROCESSES
+
+
+@pytest.mark.parametrize('file_format', ['json', 'binary'])
+def test_concurrent_saves_add_up(tmp_path, file_format):
+    JsonProgressPersistence(tmp_path, file_format=file_format).save_progress(
+        USER, {'difficulty': 'normal', 'total_xp': 0, 'level': 1, 'exams_completed': 0})
+    assert_counters_add_up(run_processes(tmp_path, file_format))
+    # No queda un .lock por usuario
+    assert not list(tmp_path.glob('*.lock'))
+
+
+@pytest.mark.parametrize('content', [b'{"total_xp": 12', b'GGPY\x01\x00\x05', b'[]', b''])
+def test_corrupt_file_does_not_block_saving(tmp_path, content):
+    persistence = JsonProgressPersistence(tmp_path)
+    save_path = persistence.get_save_path(USER)
+    save_path.write_bytes(content)
+
+    assert persistence.load_progress(USER) == {}
+    assert persistence.save_progress(USER, {'total_xp': 50, 'exams_completed': 1})
+    assert JsonProgressPersistence(tmp_path).load_progress(USER) == {'total_xp': 50, 'exams_completed': 1}
+    # El archivo dañado se conserva aparte y no se confunde con un usuario
+    assert save_path.with_name(f"{save_path.name}.corrupt").read_bytes() == content
+    assert persistence.list_users() == [USER]
+    assert persistence.save_progress(USER, {'total_xp': 80, 'exams_completed': 2})
+
+
+def test_concurrent_saves_over_corrupt_file(tmp_path):
+    JsonProgressPersistence(tmp_path).get_save_path(USER).write_bytes(b'{"total_xp": 1')
+    assert_counters_add_up(run_processes(tmp_path, 'json'))
@@ -0,0 +1,56 @@
+"""
+Ida y vuelta del progreso entre JsonProgressPersistence y SqliteProgressPersistence
+"""
+from datetime import date
+import json
+from src.services.daily_xp import DailyXpSeries, PROGRESS_KEY as DAILY_XP_KEY
+from src.services.level_system import JsonProgressPersistence
+from src.services.sqlite_progress import SqliteProgressPersistence, migrate_json_progress
+
+USER = 'alumno'
+
+
+def build_progress() -> dict:
+    series = DailyXpSeries()
+    # Días en cero al principio, en medio y al final de la serie
+    series.add(date(2024, 3, 1), 0)
+    series.add(date(2024, 3, 3), 120)
+    series.add(date(2024, 3, 6), 80)
+    series.add(date(2024, 3, 9), 0)
+    return {'difficulty': 'normal', 'total_xp': 200, 'level': 2, DAILY_XP_KEY: series.to_dict()}
+
+
+def test_daily_xp_survives_json_sqlite_json(tmp_path):
+    progress = build_progress()
+    JsonProgressPersistence(tmp_path / 'json').save_progress(USER, progress)
+
+    database = SqliteProgressPersistence(tmp_path / 'progress.db')
+    try:
+        assert migrate_json_progress(tmp_path / 'json', database) == 1
+        loaded = database.load_progress(USER)
+        assert loaded[DAILY_XP_KEY] == progress[DAILY_XP_KEY]
+        assert database.get_daily_xp(USER, '2024-03-01', '2024-03-31') == {'2024-03-03': 120, '2024-03-06': 80}
+
+        JsonProgressPersistence(tmp_path / 'back').save_progress(USER, loaded)
+        back = JsonProgressPersistence(tmp_path / 'back').load_progress(USER)
+        assert back[DAILY_XP_KEY] == progress[DAILY_XP_KEY]
+    finally:
+        database.close()
+
+
+def test_rows_saved_without_range_still_load(tmp_path):
+    database = SqliteProgressPersistence(tmp_path / 'progress.db')
+    try:
+        database.save_progress(USER, build_progress())
+        # Documento guardado antes de conservar el rango de la serie
+        with database._lock:
+            data = json.loads(database._connection.execute('SELECT data FROM progress').fetchone()[0])
+            for key in ('start', 'length'):
+                del data[DAILY_XP_KEY][key]
+            database._connection.execute('UPDATE progress SET data = ?', (json.dumps(data),))
+
+        series = DailyXpSeries.from_dict(database.load_progress(USER)[DAILY_XP_KEY])
+        assert series.start == date(2024, 3, 3)
+        assert series.range('2024-03-01', '2024-03-09') == [0, 0, 120, 0, 0, 80, 0, 0, 0]
+    finally:
+        database.close()
@@ -0,0 +1,41 @@
+"""
+Tarjetas de recompensa de StatsPage al subir de nivel
+"""
+import os
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+QtWidgets = pytest.importorskip('PyQt6.QtWidgets')
+
+from src.services.level_system import ImprovedLevelSystem, JsonProgressPersistence  # noqa: E402
+from src.ui.stats_page import StatsPage  # noqa: E402
+
+
+@pytest.fixture(scope='module')
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def reward_cards(page) -> list:
+    cards = []
+    for index in range(page.rewards_layout.count()):
+        widget = page.rewards_layout.itemAt(index).widget()
+        if widget is not None:
+            cards.append(tuple(label.text() for label in widget.findChildren(QtWidgets.QLabel) if label.text()))
+    return cards
+
+
+@pytest.mark.parametrize('levels', [(1, 80), (5, 12, 30), (3, 4, 26, 60, 80)])
+def test_new_reward_cards_join_their_group(app, tmp_path, levels):
+    page = StatsPage(progress_persistence=JsonProgressPersistence(tmp_path))
+    page.level_system = ImprovedLevelSystem('hard')
+    page._shown_rewards = None
+    page.update_rewards(levels[0])
+    for level in levels[1:]:
+        page.update_rewards(level)
+        incremental = reward_cards(page)
+
+        # Misma sección que al reconstruirla desde cero
+        page._shown_rewards = None
+        page.update_rewards(level)
+        assert reward_cards(page) == incremental